@@ -1,8 +1,8 @@
 # app.py - Smart Intent Analysis - Fixed Nestlé Chatbot
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 import os
 import uvicorn
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import re
+import asyncio
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -17,46 +19,139 @@ load_dotenv()
 app = FastAPI(title="Nestlé AI Chatbot", version="2.0.0")
 
 # Global variables
-neo4j_available = False
+graph_available = False
 system_ready = False
+warming = False
+warmup_stats = None
 
 class Query(BaseModel):
     question: str
 
+class NodeRequest(BaseModel):
+    node_type: str
+    name: str
+    properties: Dict[str, Any] = {}
+
+class RelationshipRequest(BaseModel):
+    from_node: str
+    to_node: str
+    relationship_type: str
+    properties: Dict[str, Any] = {}
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
-    global neo4j_available, system_ready
+    global graph_available, system_ready, warming
     
     print("🚀 Starting Smart Nestlé AI Chatbot...")
     print("="*60)
     
     try:
-        from backend.neo4j_connection import neo4j_conn
-        if neo4j_conn.connect():
-            neo4j_available = True
-            print("✅ Neo4j connection successful")
+        from backend.graph_backend import graph_backend
+        if graph_backend.connect():
+            graph_available = True
+            print(f"✅ Graph backend ready ({graph_backend.name})")
+            
+            count = graph_backend.count_nodes()
+            print(f"📊 Found {count} nodes in {graph_backend.name}")
+            
+            # Materialize per-entity fact cards for single-lookup answers
+            if graph_backend.name == 'neo4j':
+                # Lookups seek on Entity.name_key, so the schema must be current first
+                from backend.schema_migrations import schema_migrator
+                schema_migrator.migrate()
+                
+                # Follow the shared graph version, so other workers' writes invalidate our caches
+                from backend.graph_change_tracker import graph_changes
+                graph_changes.watch()
+                
+                from backend.fact_card_store import fact_card_store
+                fact_card_store.build_all()
+                
+                # EXPLAIN every registered query in the background and report plan regressions
+                if os.getenv("VALIDATE_QUERY_PLANS", "true").lower() == "true":
+                    threading.Thread(target=validate_query_plans, daemon=True).start()
             
-            with neo4j_conn.get_session() as session:
-                result = session.run("MATCH (n) RETURN count(n) as count")
-                count = result.single()['count']
-                print(f"📊 Found {count} nodes in Neo4j")
+            # Index node names so entity lookups that cannot match skip the graph
+            from backend.lookup_filter import lookup_filter
+            lookup_filter.build()
         else:
-            print("❌ Neo4j connection failed")
+            print(f"❌ Graph backend connection failed ({graph_backend.name})")
     except Exception as e:
-        print(f"❌ Neo4j error: {e}")
+        print(f"❌ Graph backend error: {e}")
     
     system_ready = True
     print("✅ Smart intent system ready!")
     print("="*60)
+    
+    # Replay recorded top questions so the instance enters rotation with hot caches
+    if graph_available:
+        warming = True
+        threading.Thread(target=warm_up_caches, daemon=True).start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Release graph backend connections"""
+    from backend.graph_backend import graph_backend
+    graph_backend.close()
+
+def validate_query_plans():
+    """Flag registered queries whose plans scan every node or build cartesian products"""
+    from backend.cypher_registry import cypher_registry
+    
+    try:
+        report = cypher_registry.validate()
+        for name, operators in report['flagged'].items():
+            print(f"⚠️ Query plan for '{name}' uses {', '.join(operators)}")
+        for name, error in report['failed'].items():
+            print(f"❌ Query '{name}' failed EXPLAIN: {error}")
+        print(f"📋 Validated {report['queries']} query plans ({len(report['flagged'])} flagged, {len(report['failed'])} failed)")
+    except Exception as e:
+        print(f"⚠️ Query plan validation failed: {e}")
+
+def warm_up_caches():
+    """Replay the most frequent recent questions from the query log through the chat pipeline"""
+    global warming, warmup_stats
+    
+    from backend.query_log import query_log
+    from backend.cache_warmup import run_warmup
+    
+    try:
+        questions = query_log.top_questions(int(os.getenv("WARMUP_QUERIES", 50)), max_age=7 * 24 * 3600)
+        if questions:
+            print(f"🔥 Warming caches with {len(questions)} recorded questions...")
+            warmup_stats = run_warmup(
+                questions,
+                lambda question: asyncio.run(answer_question(question, replay=True)),
+                concurrency=int(os.getenv("WARMUP_CONCURRENCY", 4)),
+                budget_seconds=float(os.getenv("WARMUP_BUDGET_SECONDS", 20))
+            )
+            print(f"✅ Warm-up finished: {warmup_stats}")
+    except Exception as e:
+        print(f"⚠️ Warm-up failed: {e}")
+    finally:
+        warming = False
 
 @app.get("/health")
 def health_check():
-    return {
-        "status": "healthy" if system_ready else "starting",
-        "neo4j_available": neo4j_available,
+    from backend.graph_backend import graph_backend
+    from backend.lookup_filter import lookup_filter
+    from backend.circuit_breaker import neo4j_breaker
+    health = {
+        "status": "warming" if warming else "healthy" if system_ready else "starting",
+        "graph_backend": graph_backend.name,
+        "graph_available": graph_available,
+        "neo4j_breaker": neo4j_breaker.state,
+        "neo4j_available": graph_available and graph_backend.name == 'neo4j',
+        "lookup_filter": lookup_filter.stats(),
+        "warmup": warmup_stats,
         "timestamp": datetime.now().isoformat()
     }
+    
+    # Keep the instance out of rotation until its caches are warm
+    if warming:
+        return JSONResponse(status_code=503, content=health)
+    return health
 
 @app.post("/chat")
 async def chat(query: Query):
@@ -67,20 +162,176 @@ async def chat(query: Query):
     if not system_ready:
         return create_response("System is starting up. Please wait a moment.", [])
     
+    return await answer_question(query.question)
+
+async def answer_question(question: str, replay: bool = False) -> Dict[str, Any]:
+    """Answer a question through the cache and smart-intent pipeline.
+
+    Replays (cache warm-up) are neither logged nor counted as asked questions.
+    """
+    
+    from backend.heavy_hitters import normalize_question, question_hitters, intent_hitters
+    from backend.answer_cache import answer_cache
+    from backend.query_log import query_log
+    
+    if not replay:
+        query_log.record(question)
+    
     try:
+        question_key = normalize_question(question)
+        if not replay:
+            question_hitters.record(question_key)
+        
+        # Repeated questions are answered from the cache until the graph changes
+        cached = answer_cache.get(question_key) if graph_available else None
+        if cached:
+            if not replay:
+                intent_hitters.record(f"{cached['metadata'].get('intent')}|{cached['metadata'].get('entity') or ''}")
+            return create_response(cached['answer'], get_sources(), {**cached['metadata'], "cached": True})
+        
         # Analyze the query with improved intent detection
-        intent_analysis = analyze_smart_intent(query.question)
+        intent_analysis = analyze_smart_intent(question)
+        if not replay:
+            intent_hitters.record(f"{intent_analysis['intent']}|{intent_analysis['entity'] or ''}")
         print(f"[Intent] {intent_analysis['intent']} | Entity: {intent_analysis['entity']} | Specific: {intent_analysis['specific_request']}")
         
-        if neo4j_available:
-            return await process_smart_query(query.question, intent_analysis)
+        if graph_available:
+            from backend.neo4j_connection import neo4j_conn
+            from backend.circuit_breaker import neo4j_breaker
+            
+            # Don't wait on Neo4j timeouts while it is known to be down
+            if neo4j_breaker.is_open:
+                return await answer_degraded(question, question_key, intent_analysis)
+            
+            with neo4j_conn.measure_payload():
+                response = await process_smart_query(question, intent_analysis)
+            if response['metadata'].get('fallback') and neo4j_breaker.is_open:
+                # This request's failure tripped the breaker
+                return await answer_degraded(question, question_key, intent_analysis)
+            if not response['metadata'].get('fallback'):
+                answer_cache.put(question_key, {
+                    'answer': response['answer'],
+                    'metadata': {
+                        key: value for key, value in response['metadata'].items()
+                        if key not in ('timestamp', 'processing_method')
+                    }
+                })
+            return response
         else:
-            return create_fallback_response(query.question, intent_analysis)
+            return create_fallback_response(question, intent_analysis)
             
     except Exception as e:
         print(f"[Error] {e}")
         return create_response("I encountered an error. Let me provide some general information about Nestlé Canada.", get_sources())
 
+async def answer_degraded(question: str, question_key: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer without Neo4j: the last cached answer, else the local SQLite snapshot"""
+    
+    from backend.answer_cache import answer_cache
+    from backend.graph_backend import snapshot_backend
+    
+    cached = answer_cache.get_stale(question_key)
+    if cached:
+        return create_response(cached['answer'], get_sources(), {**cached['metadata'], "cached": True, "degraded": True})
+    
+    snapshot = snapshot_backend()
+    if snapshot:
+        # Snapshot answers are not cached, so they never outlive the outage
+        response = await process_smart_query(question, intent_analysis, graph=snapshot)
+        response['metadata']['degraded'] = True
+        return response
+    
+    return create_fallback_response(question, intent_analysis)
+
+@app.get("/metrics")
+def metrics():
+    """Connection pool and cache metrics"""
+    from backend.graph_backend import graph_backend
+    from backend.neo4j_connection import neo4j_conn
+    from backend.answer_cache import answer_cache
+    from backend.lookup_filter import lookup_filter
+    from backend.cypher_registry import cypher_registry
+    from backend.path_finder import path_finder
+    from backend.result_cache import result_cache
+    from backend.circuit_breaker import neo4j_breaker
+    from backend.query_latency import query_latency
+    from backend.graph_change_tracker import graph_changes
+    from backend.csr_graph_engine import graph_engine
+    from backend.ingestion_pipeline import read_stats as ingestion_stats
+    
+    return {
+        "graph_backend": graph_backend.name,
+        "graph_version": graph_changes.stats(),
+        "neo4j_breaker": neo4j_breaker.stats(),
+        "neo4j_pool": neo4j_conn.pool_metrics(),
+        "neo4j_latency": query_latency.stats(),
+        "neo4j_payload": neo4j_conn.payload_metrics(),
+        "answer_cache": answer_cache.stats(),
+        "lookup_filter": lookup_filter.stats(),
+        "path_finder": path_finder.stats(),
+        "graph_engine": graph_engine.stats(),
+        "result_cache": result_cache.stats(),
+        "query_plans": cypher_registry.report,
+        "ingestion": ingestion_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/admin/heavy-hitters")
+def heavy_hitters(limit: int = 20):
+    """Most frequent recent questions and (intent, entity) pairs"""
+    from backend.heavy_hitters import question_hitters, intent_hitters
+    from backend.answer_cache import answer_cache
+    
+    return {
+        "questions": question_hitters.top(limit),
+        "intents": intent_hitters.top(limit),
+        "question_sketch": question_hitters.stats(),
+        "intent_sketch": intent_hitters.stats(),
+        "answer_cache": answer_cache.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/admin/slow-queries")
+def slow_queries(limit: int = 50):
+    """Sampled and slow Cypher executions, with per-query db hit totals"""
+    from backend.query_profiler import query_profiler
+    
+    return {
+        "queries": query_profiler.summary(),
+        "recent": query_profiler.recent(limit),
+        "settings": query_profiler.settings(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/graph/stats")
+def graph_stats_endpoint(request: Request):
+    """Node and relationship counts; pollers get 304 Not Modified until our writes change them"""
+    from backend.user_graph_manager import user_graph_manager
+    from backend.graph_stats import graph_stats
+    
+    stats = user_graph_manager.get_graph_stats()
+    if 'error' in stats or not graph_stats.etag:
+        return stats
+    
+    headers = {"ETag": graph_stats.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == graph_stats.etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=stats, headers=headers)
+
+@app.post("/graph/add-node")
+def add_node(node: NodeRequest):
+    """Add a custom node (node_type must be a whitelisted label)"""
+    from backend.user_graph_manager import user_graph_manager
+    return user_graph_manager.add_custom_node(node.node_type, node.name, node.properties)
+
+@app.post("/graph/add-relationship")
+def add_relationship(relationship: RelationshipRequest):
+    """Add a custom relationship (relationship_type must be whitelisted)"""
+    from backend.user_graph_manager import user_graph_manager
+    return user_graph_manager.add_custom_relationship(
+        relationship.from_node, relationship.to_node, relationship.relationship_type, relationship.properties
+    )
+
 def analyze_smart_intent(query: str) -> Dict[str, Any]:
     """Advanced intent analysis that understands natural language"""
     
@@ -250,77 +501,75 @@ def extract_main_entity(query_lower: str) -> Optional[str]:
     
     return None
 
-async def process_smart_query(query: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
-    """Process query with smart routing based on intent"""
+async def process_smart_query(query: str, intent_analysis: Dict[str, Any], graph=None) -> Dict[str, Any]:
+    """Process query with smart routing based on intent, against graph_backend unless another graph is given"""
     
-    from backend.neo4j_connection import neo4j_conn
+    from backend.graph_backend import graph_backend
+    graph = graph or graph_backend
     
     intent = intent_analysis['intent']
     entity = intent_analysis['entity']
     specific_request = intent_analysis['specific_request']
     
     try:
-        with neo4j_conn.get_session() as session:
-            
-            # Route to specific handlers based on intent
-            if intent == 'nutrition' and entity:
-                answer = handle_nutrition_query(session, entity, specific_request)
-            
-            elif intent == 'availability':
-                answer = handle_availability_query(session, entity or "Nestlé products")
-            
-            elif intent == 'ceo':
-                answer = handle_ceo_query(session)
-            
-            elif intent == 'ingredients' and entity:
-                answer = handle_ingredients_query(session, entity)
-            
-            elif intent == 'product_info' and entity:
-                answer = handle_product_info_query(session, entity)
-            
-            elif intent == 'company':
-                answer = handle_company_query(session)
-            
-            elif intent == 'sustainability':
-                answer = handle_sustainability_query(session)
-            
-            elif intent == 'recipe':
-                answer = handle_recipe_query(session, query, entity)
-            
-            elif intent == 'seasonal':
-                answer = handle_seasonal_query(session, query)
-            
-            else:
-                # General query or fallback
-                answer = handle_general_query(session, entity, query)
-            
-            if answer:
-                return create_response(answer, get_sources(), {
-                    "intent": intent,
-                    "entity": entity,
-                    "specific_request": specific_request,
-                    "confidence": intent_analysis['confidence']
-                })
-            else:
-                return create_fallback_response(query, intent_analysis)
-    
+        # Route to specific handlers based on intent
+        if intent == 'nutrition' and entity:
+            answer = handle_nutrition_query(graph, entity, specific_request)
+        
+        elif intent == 'availability':
+            answer = handle_availability_query(graph, entity or "Nestlé products")
+        
+        elif intent == 'ceo':
+            answer = handle_ceo_query(graph)
+        
+        elif intent == 'ingredients' and entity:
+            answer = handle_ingredients_query(graph, entity)
+        
+        elif intent == 'product_info' and entity:
+            answer = handle_product_info_query(graph, entity)
+        
+        elif intent == 'company':
+            answer = handle_company_query(graph)
+        
+        elif intent == 'sustainability':
+            answer = handle_sustainability_query(graph)
+        
+        elif intent == 'recipe':
+            answer = handle_recipe_query(graph, query, entity)
+        
+        elif intent == 'seasonal':
+            answer = handle_seasonal_query(graph, query)
+        
+        else:
+            # General query or fallback
+            answer = handle_general_query(graph, entity, query)
+        
+        if answer:
+            return create_response(answer, get_sources(), {
+                "intent": intent,
+                "entity": entity,
+                "specific_request": specific_request,
+                "confidence": intent_analysis['confidence']
+            })
+        else:
+            return create_fallback_response(query, intent_analysis)
+
     except Exception as e:
         print(f"[Query Error] {e}")
         return create_fallback_response(query, intent_analysis)
 
-def handle_nutrition_query(session, product: str, specific_request: str) -> str:
+def handle_nutrition_query(graph, product: str, specific_request: str) -> str:
     """Handle specific nutrition questions"""
     
-    query = f"""
-    MATCH (p:Product {{name: $product}})-[:HAS_NUTRITION]->(n:Nutrition)
-    RETURN n
-    """
+    from backend.fact_card_store import fact_card_store
     
-    result = session.run(query, {'product': product})
-    record = result.single()
+    card = fact_card_store.get(product)
+    if card and card['nutrition']:
+        nutrition = card['nutrition']
+    else:
+        nutrition = graph.get_nutrition(product)
     
-    if record and record['n']:
-        nutrition = record['n']
+    if nutrition:
         
         # Specific nutrition requests
         if specific_request and 'calories' in specific_request:
@@ -356,19 +605,10 @@ def handle_nutrition_query(session, product: str, specific_request: str) -> str:
     
     return f"I don't have specific nutrition information for {product} in my database. You can find detailed nutrition facts on the product packaging or at madewithnestle.ca."
 
-def handle_availability_query(session, product: str) -> str:
+def handle_availability_query(graph, product: str) -> str:
     """Handle where to buy questions"""
     
-    query = """
-    MATCH (s:Store)
-    OPTIONAL MATCH (p:Product)-[:AVAILABLE_AT]->(s) 
-    WHERE $product = 'Nestlé products' OR p.name = $product
-    RETURN DISTINCT s.name as store, s.type as type, s.locations as locations, s.website as website
-    ORDER BY s.name
-    """
-    
-    results = session.run(query, {'product': product})
-    stores = list(results)
+    stores = graph.get_stores(product)
     
     answer = f"**🛒 Where to buy {product}:**\n\n"
     
@@ -391,35 +631,27 @@ def handle_availability_query(session, product: str) -> str:
     
     return answer
 
-def handle_ceo_query(session) -> str:
+def handle_ceo_query(graph) -> str:
     """Handle CEO questions"""
     
-    queries = [
-        "MATCH (p:Person)-[:CEO_OF]->(c:Company) WHERE toLower(c.name) CONTAINS 'nestlé' RETURN p.name as name, p.role as role, c.name as company",
-        "MATCH (p:Person) WHERE toLower(p.name) CONTAINS 'schneider' RETURN p.name as name, p.role as role",
-        "MATCH (p:Person) WHERE toLower(p.role) CONTAINS 'ceo' RETURN p.name as name, p.role as role"
-    ]
-    
-    for query in queries:
-        result = session.run(query)
-        record = result.single()
-        if record and record['name']:
-            name = record['name']
-            role = record.get('role', 'CEO')
-            return f"**👨‍💼 {name}** is the {role} of Nestlé globally.\n\nHe leads the world's largest food and beverage company with operations in over 180 countries, committed to our mission of \"Good Food, Good Life.\" Under his leadership, Nestlé continues to focus on nutrition, health, and wellness while driving sustainable business practices."
+    record = graph.get_ceo()
+    if record:
+        name = record['name']
+        role = record.get('role', 'CEO')
+        return f"**👨‍💼 {name}** is the {role} of Nestlé globally.\n\nHe leads the world's largest food and beverage company with operations in over 180 countries, committed to our mission of \"Good Food, Good Life.\" Under his leadership, Nestlé continues to focus on nutrition, health, and wellness while driving sustainable business practices."
     
     return "**👨‍💼 Mark Schneider** is the CEO of Nestlé globally, leading the world's largest food and beverage company with operations in over 180 countries."
 
-def handle_ingredients_query(session, product: str) -> str:
+def handle_ingredients_query(graph, product: str) -> str:
     """Handle ingredients questions"""
     
-    query = f"""
-    MATCH (p:Product {{name: $product}})-[:CONTAINS]->(i:Ingredient)
-    RETURN i.name as ingredient
-    """
+    from backend.fact_card_store import fact_card_store
     
-    result = session.run(query, {'product': product})
-    ingredients = [record['ingredient'] for record in result]
+    card = fact_card_store.get(product)
+    if card:
+        ingredients = card['ingredients']
+    else:
+        ingredients = graph.get_ingredients(product)
     
     if ingredients:
         answer = f"**🧪 {product} Contains:**\n\n"
@@ -429,21 +661,18 @@ def handle_ingredients_query(session, product: str) -> str:
     
     return f"I don't have specific ingredient information for {product} in my database. Please check the product packaging for complete ingredient list."
 
-def handle_product_info_query(session, product: str) -> str:
+def handle_product_info_query(graph, product: str) -> str:
     """Handle general product information"""
     
-    query = """
-    MATCH (p:Product {name: $product})
-    OPTIONAL MATCH (p)-[:BELONGS_TO]->(c:Category)
-    RETURN p, c.name as category
-    """
+    from backend.fact_card_store import fact_card_store
     
-    result = session.run(query, {'product': product})
-    record = result.single()
+    card = fact_card_store.get(product)
+    if card and card['type'] == 'Product':
+        product_data = card['properties']
+    else:
+        product_data = graph.get_product(product)
     
-    if record and record['p']:
-        product_data = record['p']
-        category = record.get('category', 'Product')
+    if product_data:
         
         answer = f"**🍫 {product}**\n\n"
         
@@ -472,17 +701,14 @@ def handle_product_info_query(session, product: str) -> str:
     
     return f"I don't have detailed information about {product} in my database."
 
-def handle_company_query(session) -> str:
+def handle_company_query(graph) -> str:
     """Handle company information questions"""
     
-    query = "MATCH (c:Company) WHERE c.name CONTAINS 'Nestlé' RETURN c ORDER BY c.name"
-    result = session.run(query)
-    companies = list(result)
+    companies = graph.get_companies()
     
     if companies:
         answer = "**🏢 About Nestlé:**\n\n"
-        for record in companies:
-            company = record['c']
+        for company in companies:
             name = company.get('name', 'Nestlé')
             
             answer += f"**{name}**\n"
@@ -502,24 +728,14 @@ def handle_company_query(session) -> str:
     
     return "**🏢 Nestlé Canada** is a leading food and beverage company with over 100 years of history in Canada, committed to \"Good Food, Good Life.\""
 
-def handle_sustainability_query(session) -> str:
+def handle_sustainability_query(graph) -> str:
     """Handle sustainability questions"""
     
-    query = """
-    MATCH (t:Topic)
-    WHERE toLower(t.name) CONTAINS 'sustainability' 
-       OR toLower(t.name) CONTAINS 'cocoa'
-       OR toLower(t.name) CONTAINS 'environment'
-    RETURN t
-    """
-    
-    result = session.run(query)
-    topics = list(result)
+    topics = graph.get_sustainability_topics()
     
     if topics:
         answer = "**🌱 Nestlé Sustainability Commitments:**\n\n"
-        for record in topics:
-            topic = record['t']
+        for topic in topics:
             name = topic.get('name', 'Sustainability')
             
             answer += f"**{name}**\n"
@@ -536,23 +752,13 @@ def handle_sustainability_query(session) -> str:
     
     return "**🌱 Nestlé is committed to sustainability** through responsible sourcing, environmental stewardship, and supporting farming communities worldwide."
 
-def handle_recipe_query(session, query: str, entity: str) -> str:
+def handle_recipe_query(graph, query: str, entity: str) -> str:
     """Handle recipe questions"""
     
     query_lower = query.lower()
     
-    # Query recipe documents from Neo4j
-    recipe_query = """
-    MATCH (d:Document)
-    WHERE d.type = 'Recipe' OR toLower(d.title) CONTAINS 'recipe'
-    OPTIONAL MATCH (d)-[:USES_INGREDIENT]->(i:Ingredient)
-    RETURN d.title as title, d.url as url, collect(i.name) as ingredients
-    ORDER BY d.title
-    LIMIT 5
-    """
-    
-    results = session.run(recipe_query)
-    recipes = list(results)
+    # Query recipe documents from the graph
+    recipes = graph.get_recipes(limit=5)
     
     if recipes:
         answer = "**🍰 Nestlé Recipe Suggestions:**\n\n"
@@ -650,21 +856,13 @@ def handle_recipe_query(session, query: str, entity: str) -> str:
 
 💡 **Visit madewithnestle.ca/recipes for complete instructions and video tutorials!**"""
 
-def handle_seasonal_query(session, query: str) -> str:
+def handle_seasonal_query(graph, query: str) -> str:
     """Handle seasonal and gift questions"""
     
     query_lower = query.lower()
     
     # Query seasonal campaigns and products
-    seasonal_query = """
-    MATCH (c:Campaign)
-    OPTIONAL MATCH (p:Product)-[:FEATURED_IN]->(c)
-    RETURN c.name as campaign, c.theme as theme, c.start_date as start_date, c.end_date as end_date, collect(p.name) as products
-    ORDER BY c.start_date DESC
-    """
-    
-    results = session.run(seasonal_query)
-    campaigns = list(results)
+    campaigns = graph.get_campaigns()
     
     if campaigns:
         answer = ""
@@ -778,23 +976,18 @@ Available at Walmart, Loblaws, Metro, Sobeys, and specialty gift shops across Ca
 
 💡 **Each season brings special promotions and limited-edition products!**"""
 
-def handle_general_query(session, entity: str, query: str) -> str:
+def handle_general_query(graph, entity: str, query: str) -> str:
     """Handle general queries"""
     
-    if entity:
+    from backend.lookup_filter import lookup_filter
+    
+    if entity and lookup_filter.might_have_name(entity):
         # Try to find any information about the entity
-        cypher_query = """
-        MATCH (n)
-        WHERE n.name = $entity
-        RETURN n, labels(n) as labels
-        """
-        
-        result = session.run(cypher_query, {'entity': entity})
-        record = result.single()
+        record = graph.find_node_exact(entity)
         
         if record:
-            node = record['n']
-            node_type = record['labels'][0] if record['labels'] else 'Item'
+            node, labels = record
+            node_type = labels[0] if labels else 'Item'
             
             answer = f"**{entity}** ({node_type})\n\n"
             if 'description' in node:
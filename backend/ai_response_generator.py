@@ -4,6 +4,18 @@ import os
 from typing import Dict, List, Any, Optional
 from openai import OpenAI
 
+from .context_model import ContextNode, ContextEdge
+
+RELATIONSHIP_TEMPLATES = {
+    'BELONGS_TO': "{0} belongs to {1}",
+    'PRODUCED_BY': "{0} is produced by {1}",
+    'SUPPORTS': "{0} supports {1}",
+    'USED_FOR': "{0} is used for {1}",
+    'CEO_OF': "{0} is CEO of {1}",
+    'COMMITTED_TO': "{0} is committed to {1}",
+    'SUBSIDIARY_OF': "{0} is a subsidiary of {1}"
+}
+
 class AIResponseGenerator:
     """Generates AI responses using graph context with modern OpenAI API"""
     
@@ -52,23 +64,31 @@ class AIResponseGenerator:
         if not nodes:
             return ""
         
-        context_parts = []
+        # Split nodes by relevance in one pass, keeping only what fits in the prompt
+        direct_matches = []
+        related_nodes = []
+        for node in nodes:
+            if node.relevance == 'direct_match':
+                if len(direct_matches) < 3:
+                    direct_matches.append(node)
+            elif len(related_nodes) < 3:
+                related_nodes.append(node)
+            if len(direct_matches) == 3 and len(related_nodes) == 3:
+                break
         
-        # Sort nodes by relevance
-        direct_matches = [n for n in nodes if n.get('relevance') == 'direct_match']
-        related_nodes = [n for n in nodes if n.get('relevance') != 'direct_match']
+        context_parts = []
         
         # Add direct matches first
-        for node in direct_matches[:3]:  # Limit to prevent token overflow
+        for node in direct_matches:
             node_info = self._format_node_info(node)
             if node_info:
-                context_parts.append(f"**{node['name']}**: {node_info}")
+                context_parts.append(f"**{node.name}**: {node_info}")
         
         # Add related information
-        for node in related_nodes[:3]:  # Limit related nodes
+        for node in related_nodes:
             node_info = self._format_node_info(node)
             if node_info:
-                context_parts.append(f"Related - **{node['name']}**: {node_info}")
+                context_parts.append(f"Related - **{node.name}**: {node_info}")
         
         # Add relationship information if available
         if relationships:
@@ -78,11 +98,15 @@ class AIResponseGenerator:
         
         return "\n".join(context_parts)
     
-    def _format_node_info(self, node: Dict[str, Any]) -> str:
+    def _format_node_info(self, node: ContextNode) -> str:
         """Format individual node information"""
         
-        properties = node.get('properties', {})
-        node_type = node.get('type', 'Unknown')
+        # Fact cards carry a pre-rendered summary
+        if node.fact_card:
+            return node.fact_card['summary']
+        
+        properties = node.properties
+        node_type = node.type
         
         info_parts = []
         
@@ -121,29 +145,15 @@ class AIResponseGenerator:
         
         return result
     
-    def _format_relationship_info(self, relationships: List[Dict[str, Any]]) -> str:
+    def _format_relationship_info(self, relationships: List[ContextEdge]) -> str:
         """Format relationship information"""
         
         rel_descriptions = []
         
         for rel in relationships:
-            from_node = rel.get('from', 'Unknown')
-            to_node = rel.get('to', 'Unknown')
-            rel_type = rel.get('type', 'RELATED_TO')
-            
             # Format relationship in readable way
-            rel_map = {
-                'BELONGS_TO': f"{from_node} belongs to {to_node}",
-                'PRODUCED_BY': f"{from_node} is produced by {to_node}",
-                'SUPPORTS': f"{from_node} supports {to_node}",
-                'USED_FOR': f"{from_node} is used for {to_node}",
-                'CEO_OF': f"{from_node} is CEO of {to_node}",
-                'COMMITTED_TO': f"{from_node} is committed to {to_node}",
-                'SUBSIDIARY_OF': f"{from_node} is a subsidiary of {to_node}"
-            }
-            
-            description = rel_map.get(rel_type, f"{from_node} is related to {to_node}")
-            rel_descriptions.append(description)
+            template = RELATIONSHIP_TEMPLATES.get(rel.type, "{0} is related to {1}")
+            rel_descriptions.append(template.format(rel.source, rel.target))
         
         return "; ".join(rel_descriptions)
     
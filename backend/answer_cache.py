@@ -0,0 +1,73 @@
+# backend/answer_cache.py - Graph-versioned answer cache with frequency-based admission
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .graph_change_tracker import graph_changes
+from .heavy_hitters import HeavyHitters, question_hitters
+
+class AnswerCache:
+    """LRU cache of answers per normalized question.
+
+    When full, a new question only displaces the least recently used entry if the
+    heavy-hitter sketch has seen it at least as often, so one-off questions cannot push
+    out hot answers. Entries are tied to the graph version they were computed at, which
+    also moves when another worker writes (graph_changes follows the shared version).
+    """
+
+    def __init__(self, capacity: int = 512, tracker: HeavyHitters = question_hitters):
+        self.capacity = capacity
+        self.tracker = tracker
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['version'] != graph_changes.version:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached answer even if the graph has changed since, for serving while the graph is unreachable"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['value'] if entry is not None else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> bool:
+        """Store value unless admission rejects it; returns whether it was stored"""
+        version = graph_changes.version
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.capacity:
+                victim = next(iter(self._entries))
+                stale = self._entries[victim]['version'] != version
+                if not stale and self.tracker.estimate(key) < self.tracker.estimate(victim):
+                    self.rejected += 1
+                    return False
+                del self._entries[victim]
+            self._entries[key] = {'value': value, 'version': version}
+            self._entries.move_to_end(key)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'rejected': self.rejected
+        }
+
+# Global answer cache for the smart-intent chat path
+answer_cache = AnswerCache()
@@ -0,0 +1,45 @@
+# backend/cache_warmup.py - Replay recorded top questions before taking traffic
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, List
+
+def run_warmup(questions: List[str], replay: Callable[[str], Any],
+               concurrency: int = 4, budget_seconds: float = 20.0) -> Dict[str, Any]:
+    """Replay questions through the full pipeline with bounded concurrency and a time budget.
+
+    Questions not started when the budget runs out are skipped; replays already in flight
+    are left to finish in the background.
+    """
+    started = time.monotonic()
+    deadline = started + budget_seconds
+    replayed = failed = 0
+    pending = set()
+    remaining = list(questions)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='warmup')
+    try:
+        while remaining or pending:
+            while remaining and len(pending) < concurrency and time.monotonic() < deadline:
+                pending.add(executor.submit(replay, remaining.pop(0)))
+
+            timeout = deadline - time.monotonic()
+            if not pending or timeout <= 0:
+                break
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception():
+                    failed += 1
+                else:
+                    replayed += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {
+        'questions': len(questions),
+        'replayed': replayed,
+        'failed': failed,
+        'skipped': len(remaining) + len(pending),
+        'seconds': round(time.monotonic() - started, 2)
+    }
@@ -0,0 +1,106 @@
+# backend/circuit_breaker.py - Fail fast while a dependency is down or too slow to be useful
+
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Consecutive failed (or slow) calls that open the breaker
+NEO4J_BREAKER_FAILURES = int(os.getenv("NEO4J_BREAKER_FAILURES", 5))
+# A request-path read taking at least this long counts as a failure. Registered reads
+# with an adaptive timeout below this (see query_latency.plan) time out first, and the
+# timeout counts as the failure instead
+NEO4J_BREAKER_SLOW_MS = float(os.getenv("NEO4J_BREAKER_SLOW_MS", 5000))
+# Seconds the breaker stays open before letting one probe call through
+NEO4J_BREAKER_RESET_SECONDS = float(os.getenv("NEO4J_BREAKER_RESET_SECONDS", 30))
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open"""
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker.
+
+    Closed: calls go through, and consecutive failures or slow calls are counted. Only
+    calls whose latency matters (request-path reads) are timed; maintenance work such as
+    migrations, snapshot loads and batch writes is legitimately slow.
+    Open: calls are refused until reset_seconds have passed. Half-open: one probe
+    call goes through; success closes the breaker, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int, slow_ms: float, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_ms = slow_ms
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be refused (open and not yet due a probe, or probe in flight)"""
+        if self.state == self.CLOSED:
+            return False
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at < self.reset_seconds
+        return self._probing
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; a True in half-open state makes it the probe"""
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            if self.state == self.CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, seconds: Optional[float] = None):
+        """Record a completed call; a timed one (seconds given) slower than slow_ms counts as a failure"""
+        if seconds is not None and self.slow_ms and seconds * 1000 >= self.slow_ms:
+            self.record_failure()
+            return
+        if self.state == self.CLOSED and not self._failures:
+            return
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"✅ {self.name} circuit breaker closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                if self.state == self.CLOSED:
+                    self.trips += 1
+                    print(f"⚠️ {self.name} circuit breaker opened after {self._failures} failed or slow calls")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'failure_threshold': self.failure_threshold,
+            'slow_ms': self.slow_ms,
+            'reset_seconds': self.reset_seconds,
+            'trips': self.trips,
+            'rejected': self.rejected
+        }
+
+# Breaker around every Neo4j session and transaction
+neo4j_breaker = CircuitBreaker('Neo4j', NEO4J_BREAKER_FAILURES, NEO4J_BREAKER_SLOW_MS, NEO4J_BREAKER_RESET_SECONDS)
@@ -1,11 +1,21 @@
+import os
 import re
-from sentence_transformers import SentenceTransformer
+import time
 from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
+from .circuit_breaker import CircuitOpenError
+from .graph_change_tracker import graph_changes
+from .embeddings import embedder
+
+# Documents per write transaction: tuned between these bounds so each takes about
+# DOCUMENT_BATCH_TARGET_SECONDS
+MIN_DOCUMENT_BATCH = 1
+MAX_DOCUMENT_BATCH = 500
+INITIAL_DOCUMENT_BATCH = 50
+DOCUMENT_BATCH_TARGET_SECONDS = float(os.getenv("DOCUMENT_BATCH_TARGET_SECONDS", 1.0))
 
 class ContentToGraphProcessor:
     def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-        
         # Nestlé-specific entities for extraction
         self.nestle_products = [
             "KitKat", "Smarties", "Aero", "Quality Street", "Butterfinger",
@@ -21,6 +31,10 @@ class ContentToGraphProcessor:
             "Sustainability", "Cocoa Plan", "Water Stewardship", 
             "Carbon Footprint", "Responsible Sourcing"
         ]
+        
+        self.batch_size = INITIAL_DOCUMENT_BATCH
+        # Lowered when a batch fails, so tuning does not grow back into the failing size
+        self.batch_limit = MAX_DOCUMENT_BATCH
     
     def extract_entities(self, text):
         """Extract entities from text content"""
@@ -57,83 +71,88 @@ class ContentToGraphProcessor:
     
     def create_document_node(self, url, title, content, metadata=None):
         """Create a document node in Neo4j"""
+        self.create_document_nodes([{'url': url, 'title': title, 'content': content}])
+    
+    def create_document_nodes(self, documents):
+        """Write {'url', 'title', 'content'} documents and their entity links, many per transaction.
         
-        # Generate embedding for content
-        content_embedding = self.model.encode(content[:500]).tolist()
-        
-        with neo4j_conn.get_session() as session:
-            # Create document node
-            doc_query = """
-            MERGE (d:Document {url: $url})
-            SET d.title = $title,
-                d.content = $content,
-                d.embedding = $embedding,
-                d.created_at = datetime(),
-                d.word_count = $word_count
-            RETURN d
-            """
-            
-            session.run(doc_query, {
-                'url': url,
-                'title': title,
-                'content': content,
-                'embedding': content_embedding,
-                'word_count': len(content.split())
-            })
-            
-            # Extract and link entities
-            entities = self.extract_entities(content)
-            
-            # Create product nodes and relationships
-            for product in entities['products']:
-                self._create_product_relationship(session, url, product)
-            
-            # Create category nodes and relationships
-            for category in entities['categories']:
-                self._create_category_relationship(session, url, category)
+        Returns the number of documents written.
+        """
+        documents = list(documents)
+        written = 0
+        
+        while written < len(documents):
+            batch = documents[written:written + self.batch_size]
+            rows = [self.document_row(document) for document in batch]
             
-            # Create topic nodes and relationships
-            for topic in entities['topics']:
-                self._create_topic_relationship(session, url, topic)
+            # Embed the batch in one model call (None when no embedding model is installed)
+            embeddings = embedder.encode_many([document['content'][:500] for document in batch])
+            if embeddings:
+                for row, embedding in zip(rows, embeddings):
+                    row['embedding'] = embedding
             
-            # Create keyword nodes and relationships
-            for keyword in entities['keywords']:
-                self._create_keyword_relationship(session, url, keyword)
+            written += self.write_document_rows(rows)
+        
+        return written
     
-    def _create_product_relationship(self, session, doc_url, product_name):
-        """Create product node and link to document"""
-        query = """
-        MATCH (d:Document {url: $doc_url})
-        MERGE (p:Product {name: $product_name})
-        MERGE (d)-[:MENTIONS]->(p)
-        """
-        session.run(query, {'doc_url': doc_url, 'product_name': product_name})
+    def document_row(self, document):
+        """Parameters of one document for upsert_documents, without its embedding"""
+        entities = self.extract_entities(document['content'])
+        return {
+            'url': document['url'],
+            'title': document['title'],
+            'content': document['content'],
+            'embedding': None,
+            'word_count': len(document['content'].split()),
+            **entities
+        }
     
-    def _create_category_relationship(self, session, doc_url, category_name):
-        """Create category node and link to document"""
-        query = """
-        MATCH (d:Document {url: $doc_url})
-        MERGE (c:Category {name: $category_name})
-        MERGE (d)-[:MENTIONS]->(c)
+    def write_document_rows(self, rows):
+        """Write document_row() rows in as few transactions as the tuned batch size allows.
+        
+        The batch size adapts so each transaction takes about DOCUMENT_BATCH_TARGET_SECONDS;
+        a batch that fails is retried at half the size, which also caps later batches.
+        Returns the number of documents written.
         """
-        session.run(query, {'doc_url': doc_url, 'category_name': category_name})
+        written = 0
+        
+        while written < len(rows):
+            batch = rows[written:written + self.batch_size]
+            try:
+                seconds = self._write_batch(batch)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if len(batch) == 1:
+                    raise
+                # Too much for one transaction (memory, timeout): split it
+                self.batch_size = self.batch_limit = max(MIN_DOCUMENT_BATCH, len(batch) // 2)
+                print(f"⚠️ Document batch of {len(batch)} failed, retrying with {self.batch_size}: {e}")
+                continue
+            
+            written += len(batch)
+            self._tune_batch_size(len(batch), seconds)
+        
+        return written
     
-    def _create_topic_relationship(self, session, doc_url, topic_name):
-        """Create topic node and link to document"""
-        query = """
-        MATCH (d:Document {url: $doc_url})
-        MERGE (t:Topic {name: $topic_name})
-        MERGE (d)-[:MENTIONS]->(t)
-        """
-        session.run(query, {'doc_url': doc_url, 'topic_name': topic_name})
+    def _write_batch(self, rows):
+        """Write one batch in a single UNWIND statement; returns the seconds the write took"""
+        started = time.perf_counter()
+        # Every clause is a MERGE, so the managed transaction's retries are safe
+        neo4j_conn.write(cypher_registry['upsert_documents'], {'documents': rows})
+        seconds = time.perf_counter() - started
+        
+        graph_changes.record_change(
+            labels=['Document', 'Product', 'Category', 'Topic', 'Keyword'],
+            names=list({name for row in rows for name in row['products'] + row['categories'] + row['topics']}),
+            relationship_types=['MENTIONS', 'CONTAINS']
+        )
+        return seconds
     
-    def _create_keyword_relationship(self, session, doc_url, keyword):
-        """Create keyword node and link to document"""
-        query = """
-        MATCH (d:Document {url: $doc_url})
-        MERGE (k:Keyword {text: $keyword})
-        MERGE (d)-[:CONTAINS]->(k)
-        """
-        session.run(query, {'doc_url': doc_url, 'keyword': keyword})
+    def _tune_batch_size(self, size, seconds):
+        """Move the batch size halfway towards the size that would take the target time"""
+        per_document = seconds / size
+        target = int(DOCUMENT_BATCH_TARGET_SECONDS / per_document) if per_document else MAX_DOCUMENT_BATCH
+        self.batch_size = max(MIN_DOCUMENT_BATCH, min(self.batch_limit, (self.batch_size + target) // 2))
 
 processor = ContentToGraphProcessor()
\ No newline at end of file
@@ -0,0 +1,187 @@
+# backend/context_model.py - Compact typed context records for retrieval and formatting
+
+import sys
+from typing import Dict, List, Any, Optional, Mapping
+
+_EMPTY: Mapping[str, Any] = {}
+
+def intern_label(value: Optional[str]) -> str:
+    """Intern labels, relationship types and relevance tags so repeats share one string"""
+    return sys.intern(value) if value else 'Unknown'
+
+class ContextNode:
+    """A graph node in the retrieval context; properties are only copied when asked for"""
+
+    __slots__ = ('node_id', 'name', 'type', 'relevance', 'score', 'fact_card', '_source', '_properties')
+
+    def __init__(self, node_id: Optional[str], name: str, node_type: str, relevance: str,
+                 source: Optional[Mapping[str, Any]] = None, fact_card: Optional[Dict[str, Any]] = None,
+                 score: Optional[float] = None):
+        self.node_id = node_id
+        self.name = name
+        self.type = intern_label(node_type)
+        self.relevance = intern_label(relevance)
+        self.score = score
+        self.fact_card = fact_card
+        self._source = source if source is not None else _EMPTY
+        self._properties = None
+
+    @classmethod
+    def from_record(cls, node, labels: List[str], relevance: str, default_name: str = 'Unknown',
+                    score: Optional[float] = None) -> 'ContextNode':
+        """Wrap a neo4j Node without copying its property map"""
+        # Hot path: fill the slots directly instead of going through __init__
+        context_node = cls.__new__(cls)
+        context_node.node_id = node.element_id
+        context_node.name = node.get('name', default_name)
+        context_node.type = sys.intern(labels[0]) if labels else 'Unknown'
+        context_node.relevance = sys.intern(relevance)
+        context_node.score = score
+        context_node.fact_card = None
+        context_node._source = node
+        context_node._properties = None
+        return context_node
+
+    @property
+    def properties(self) -> Mapping[str, Any]:
+        """Read-only view of the node's properties (the underlying record, not a copy)"""
+        return self._properties if self._properties is not None else self._source
+
+    def materialize(self) -> Dict[str, Any]:
+        """Copy properties into a plain dict, once"""
+        if self._properties is None:
+            self._properties = dict(self._source)
+        return self._properties
+
+    @property
+    def key(self):
+        return self.node_id or (self.name, self.type)
+
+    def get(self, key: str, default=None):
+        """Dict-style access for callers that still treat context nodes as dicts"""
+        return getattr(self, key, default) if key in _NODE_FIELDS else default
+
+    def __getitem__(self, key: str):
+        if key not in _NODE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'name': self.name,
+            'type': self.type,
+            'properties': self.materialize(),
+            'relevance': self.relevance
+        }
+        if self.score is not None:
+            data['score'] = round(self.score, 3)
+        return data
+
+    def __repr__(self):
+        return f"ContextNode({self.name!r}, {self.type}, {self.relevance})"
+
+_NODE_FIELDS = frozenset(['name', 'type', 'relevance', 'score', 'properties', 'fact_card', 'node_id'])
+
+class ContextEdge:
+    """A relationship between two context nodes, identified by endpoint names and type"""
+
+    __slots__ = ('source', 'target', 'type', '_properties')
+
+    def __init__(self, source: str, target: str, rel_type: str, properties: Optional[Mapping[str, Any]] = None):
+        self.source = source
+        self.target = target
+        self.type = intern_label(rel_type)
+        self._properties = properties if properties is not None else _EMPTY
+
+    @property
+    def key(self):
+        return (self.source, self.target, self.type)
+
+    @property
+    def properties(self) -> Mapping[str, Any]:
+        return self._properties
+
+    def get(self, key: str, default=None):
+        return _EDGE_FIELDS[key](self) if key in _EDGE_FIELDS else default
+
+    def __getitem__(self, key: str):
+        return _EDGE_FIELDS[key](self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'from': self.source, 'to': self.target, 'type': self.type, 'properties': dict(self._properties)}
+
+    def __repr__(self):
+        return f"ContextEdge({self.source!r} -{self.type}-> {self.target!r})"
+
+_EDGE_FIELDS = {
+    'from': lambda edge: edge.source,
+    'to': lambda edge: edge.target,
+    'type': lambda edge: edge.type,
+    'properties': lambda edge: edge.properties
+}
+
+class GraphContext:
+    """Retrieved graph context with O(1) dedup of nodes and relationships"""
+
+    __slots__ = ('_nodes', '_node_aliases', '_edges', 'paths', 'summary')
+
+    def __init__(self):
+        self._nodes: Dict[Any, ContextNode] = {}
+        # (name, type) -> node, so a fact-card node and a Neo4j node for the same entity dedup
+        self._node_aliases: Dict[Any, ContextNode] = {}
+        self._edges: Dict[Any, ContextEdge] = {}
+        self.paths: List[Dict[str, Any]] = []
+        self.summary = ''
+
+    def add_node(self, node: ContextNode) -> bool:
+        """Add a node unless it is already present; the first occurrence wins"""
+        key = node.node_id
+        alias = (node.name, node.type)
+        if alias in self._node_aliases or (key is not None and key in self._nodes):
+            return False
+        self._nodes[key if key is not None else alias] = node
+        self._node_aliases[alias] = node
+        return True
+
+    def add_edge(self, edge: ContextEdge) -> bool:
+        if edge.key in self._edges:
+            return False
+        self._edges[edge.key] = edge
+        return True
+
+    def extend(self, other: 'GraphContext'):
+        for node in other._nodes.values():
+            self.add_node(node)
+        for edge in other._edges.values():
+            self.add_edge(edge)
+
+    @property
+    def nodes(self) -> List[ContextNode]:
+        return list(self._nodes.values())
+
+    @property
+    def relationships(self) -> List[ContextEdge]:
+        return list(self._edges.values())
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def get(self, key: str, default=None):
+        """Dict-style access matching the old {'nodes', 'relationships', 'paths', 'summary'} shape"""
+        if key in ('nodes', 'relationships', 'paths', 'summary'):
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str):
+        if key not in ('nodes', 'relationships', 'paths', 'summary'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'nodes': [node.to_dict() for node in self._nodes.values()],
+            'relationships': [edge.to_dict() for edge in self._edges.values()],
+            'paths': self.paths,
+            'summary': self.summary
+        }
@@ -1,227 +1,178 @@
-# backend/context_retriever.py - Neo4j Graph Context Retrieval
+# backend/context_retriever.py - Graph Context Retrieval
 
+import asyncio
 from typing import Dict, List, Any, Optional
-from .neo4j_connection import neo4j_conn
+from .graph_backend import graph_backend
+from .path_finder import path_finder
+from .fact_card_store import fact_card_store
+from .lookup_filter import lookup_filter
+from .embeddings import embedder
+from .context_model import ContextNode, ContextEdge, GraphContext
+
+# Relevance tag for the nodes each broad intent pulls in
+INTENT_RELEVANCE = {
+    'company_info': 'intent_company',
+    'sustainability': 'intent_sustainability',
+    'product_info': 'intent_product'
+}
+
+# Ranked keyword hits added per request
+SEMANTIC_RESULT_LIMIT = 9
+
+# Relationships fetched per matched entity
+ENTITY_NEIGHBOUR_LIMIT = 10
+
+# Nearest documents per request, and entities taken from each
+VECTOR_TOP_K = 5
+VECTOR_MENTIONS_PER_DOCUMENT = 3
 
 class ContextRetriever:
-    """Retrieves relevant context from Neo4j graph based on query analysis"""
+    """Retrieves relevant context from the knowledge graph based on query analysis"""
     
     def __init__(self):
         pass
     
-    async def get_relevant_context(self, query: str, intent: str, entities: List[str]) -> Dict[str, Any]:
-        """Get relevant context from Neo4j graph"""
+    async def get_relevant_context(self, query: str, intent: str, entities: List[str]) -> GraphContext:
+        """Get relevant context from the graph backend"""
+        
+        context = GraphContext()
         
         try:
-            with neo4j_conn.get_session() as session:
-                context = {
-                    'nodes': [],
-                    'relationships': [],
-                    'paths': [],
-                    'summary': ''
-                }
-                
-                # Strategy 1: Direct entity lookup
-                if entities:
-                    entity_context = self._get_entity_context(session, entities)
-                    context['nodes'].extend(entity_context['nodes'])
-                    context['relationships'].extend(entity_context['relationships'])
-                
-                # Strategy 2: Intent-based context retrieval
-                intent_context = self._get_intent_based_context(session, intent, query)
-                context['nodes'].extend(intent_context['nodes'])
-                context['relationships'].extend(intent_context['relationships'])
-                
-                # Strategy 3: Semantic similarity search
-                semantic_context = self._get_semantic_context(session, query)
-                context['nodes'].extend(semantic_context['nodes'])
-                
-                # Strategy 4: Get relationship paths between found entities
-                if len([n for n in context['nodes'] if n]) >= 2:
-                    paths = self._get_relationship_paths(session, context['nodes'])
-                    context['paths'] = paths
-                
-                # Remove duplicates and create summary
-                context = self._deduplicate_context(context)
-                context['summary'] = self._create_context_summary(context)
-                
-                return context
+            # Independent strategies run concurrently, each in a worker thread with its own
+            # pooled session and its own partial context:
+            #   1. direct entity lookup  2. intent-based nodes
+            #   3. full-text search      4. vector search over document embeddings
+            strategies = [
+                (self._get_entity_context, entities),
+                (self._get_intent_based_context, intent, query),
+                (self._get_semantic_context, query),
+                (self._get_vector_context, query)
+            ]
+            if not entities:
+                strategies.pop(0)
+            tasks = [asyncio.create_task(self._run_strategy(*strategy)) for strategy in strategies]
+            
+            # Strategy 5: relationship paths between the first two nodes. Partial contexts
+            # are merged in strategy order, so those two are fixed as soon as two nodes are
+            # in; the path search starts then rather than after the slowest strategy.
+            paths_task = None
+            for task in tasks:
+                context.extend(await task)
+                if paths_task is None and context.node_count >= 2:
+                    paths_task = asyncio.create_task(
+                        asyncio.to_thread(self._get_relationship_paths, context.nodes[:2])
+                    )
+            
+            if paths_task is not None:
+                context.paths = await paths_task
+            
+            context.summary = self._create_context_summary(context)
+            
+            return context
                 
         except Exception as e:
             print(f"Error retrieving context: {e}")
-            return {'nodes': [], 'relationships': [], 'paths': [], 'summary': ''}
+            return GraphContext()
     
-    def _get_entity_context(self, session, entities: List[str]) -> Dict[str, Any]:
+    async def _run_strategy(self, strategy, *args) -> GraphContext:
+        """Run one retrieval strategy off the event loop; a failing strategy contributes nothing"""
+        
+        partial = GraphContext()
+        try:
+            await asyncio.to_thread(strategy, *args, partial)
+        except Exception as e:
+            print(f"Error in {strategy.__name__}: {e}")
+        return partial
+    
+    def _get_entity_context(self, entities: List[str], context: GraphContext):
         """Get context for specific entities"""
         
-        nodes = []
-        relationships = []
+        # Known entities are served from their materialized fact card; names no node
+        # has are skipped. Everything else is looked up in a single query.
+        cards = {entity: fact_card_store.get(entity) for entity in entities}
+        lookups = [entity for entity in entities
+                   if not cards[entity] and lookup_filter.might_have_name(entity)]
+        neighbourhoods = graph_backend.entity_neighbourhoods(lookups, limit=ENTITY_NEIGHBOUR_LIMIT) if lookups else {}
         
         for entity in entities:
-            # Find the entity node
-            entity_query = """
-            MATCH (n)
-            WHERE toLower(n.name) = toLower($entity_name)
-            RETURN n, labels(n) as labels
-            LIMIT 1
-            """
-            
-            result = session.run(entity_query, {'entity_name': entity})
-            record = result.single()
-            
-            if record:
-                node_data = dict(record['n'])
-                node_labels = record['labels']
-                
-                nodes.append({
-                    'name': node_data.get('name', entity),
-                    'type': node_labels[0] if node_labels else 'Unknown',
-                    'properties': node_data,
-                    'relevance': 'direct_match'
-                })
+            if cards[entity]:
+                self._add_fact_card_context(cards[entity], context)
+            elif entity in neighbourhoods:
+                (node, labels), neighbours = neighbourhoods[entity]
+                entity_node = ContextNode.from_record(node, labels, 'direct_match', entity)
+                context.add_node(entity_node)
                 
                 # Get relationships for this entity
-                rel_query = """
-                MATCH (n)-[r]-(m)
-                WHERE toLower(n.name) = toLower($entity_name)
-                RETURN n, r, m, labels(m) as target_labels
-                LIMIT 10
-                """
-                
-                rel_results = session.run(rel_query, {'entity_name': entity})
-                
-                for rel_record in rel_results:
-                    rel_data = dict(rel_record['r'])
-                    target_data = dict(rel_record['m'])
-                    target_labels = rel_record['target_labels']
+                for rel_type, rel_properties, target, target_labels in neighbours:
+                    target_node = ContextNode.from_record(target, target_labels, 'connected_to_entity')
                     
-                    relationships.append({
-                        'from': node_data.get('name', entity),
-                        'to': target_data.get('name', 'Unknown'),
-                        'type': rel_record['r'].type,
-                        'properties': rel_data
-                    })
+                    context.add_edge(ContextEdge(
+                        entity_node.name, target_node.name, rel_type, rel_properties
+                    ))
                     
                     # Add target node if not already included
-                    target_node = {
-                        'name': target_data.get('name', 'Unknown'),
-                        'type': target_labels[0] if target_labels else 'Unknown',
-                        'properties': target_data,
-                        'relevance': 'connected_to_entity'
-                    }
-                    
-                    if target_node not in nodes:
-                        nodes.append(target_node)
-        
-        return {'nodes': nodes, 'relationships': relationships}
+                    context.add_node(target_node)
     
-    def _get_intent_based_context(self, session, intent: str, query: str) -> Dict[str, Any]:
-        """Get context based on query intent"""
-        
-        nodes = []
-        relationships = []
-        
-        if intent == 'company_info':
-            # Get company-related information
-            company_query = """
-            MATCH (n)
-            WHERE n.name CONTAINS 'Nestlé' OR n.name CONTAINS 'Nestle' 
-               OR 'Company' IN labels(n) OR 'Brand' IN labels(n)
-            RETURN n, labels(n) as labels
-            LIMIT 5
-            """
+    def _add_fact_card_context(self, card: Dict[str, Any], context: GraphContext):
+        """Add an entity and its neighbours from fact cards instead of querying the graph"""
+        
+        context.add_node(ContextNode(
+            None, card['name'], card['type'], 'direct_match', card['properties'], fact_card=card
+        ))
+        
+        for rel in card['relationships']:
+            context.add_edge(ContextEdge(
+                card['name'] if rel['outgoing'] else rel['name'],
+                rel['name'] if rel['outgoing'] else card['name'],
+                rel['type']
+            ))
             
-            results = session.run(company_query)
-            for record in results:
-                node_data = dict(record['n'])
-                node_labels = record['labels']
-                
-                nodes.append({
-                    'name': node_data.get('name', 'Unknown'),
-                    'type': node_labels[0] if node_labels else 'Unknown',
-                    'properties': node_data,
-                    'relevance': 'intent_company'
-                })
-        
-        elif intent == 'sustainability':
-            # Get sustainability-related information
-            sustainability_query = """
-            MATCH (n)
-            WHERE toLower(n.name) CONTAINS 'sustainability' 
-               OR toLower(n.name) CONTAINS 'cocoa'
-               OR toLower(n.name) CONTAINS 'environment'
-               OR 'Topic' IN labels(n)
-            RETURN n, labels(n) as labels
-            LIMIT 5
-            """
-            
-            results = session.run(sustainability_query)
-            for record in results:
-                node_data = dict(record['n'])
-                node_labels = record['labels']
-                
-                nodes.append({
-                    'name': node_data.get('name', 'Unknown'),
-                    'type': node_labels[0] if node_labels else 'Unknown',
-                    'properties': node_data,
-                    'relevance': 'intent_sustainability'
-                })
-        
-        elif intent == 'product_info':
-            # Get product-related information
-            product_query = """
-            MATCH (n)
-            WHERE 'Product' IN labels(n) OR 'Category' IN labels(n)
-            RETURN n, labels(n) as labels
-            LIMIT 8
-            """
-            
-            results = session.run(product_query)
-            for record in results:
-                node_data = dict(record['n'])
-                node_labels = record['labels']
-                
-                nodes.append({
-                    'name': node_data.get('name', 'Unknown'),
-                    'type': node_labels[0] if node_labels else 'Unknown',
-                    'properties': node_data,
-                    'relevance': 'intent_product'
-                })
-        
-        return {'nodes': nodes, 'relationships': relationships}
+            target_card = fact_card_store.get(rel['name'])
+            if target_card:
+                context.add_node(ContextNode(
+                    None, target_card['name'], target_card['type'], 'connected_to_entity',
+                    target_card['properties'], fact_card=target_card
+                ))
     
-    def _get_semantic_context(self, session, query: str) -> Dict[str, Any]:
-        """Get context using semantic/keyword matching"""
+    def _get_intent_based_context(self, intent: str, query: str, context: GraphContext):
+        """Get context based on query intent"""
         
-        nodes = []
+        relevance = INTENT_RELEVANCE.get(intent)
+        if relevance:
+            for node, labels in graph_backend.intent_nodes(intent):
+                context.add_node(ContextNode.from_record(node, labels, relevance))
+    
+    def _get_semantic_context(self, query: str, context: GraphContext):
+        """Get context from one ranked full-text search over all query keywords"""
         
         # Extract keywords from query
         keywords = self._extract_keywords(query)
+        if not keywords:
+            return
+        
+        for node, labels, score in graph_backend.text_search(keywords, limit=SEMANTIC_RESULT_LIMIT):
+            # Documents have a title rather than a name
+            context.add_node(ContextNode.from_record(
+                node, labels, 'keyword_match', node.get('title', 'Unknown'), score
+            ))
+    
+    def _get_vector_context(self, query: str, context: GraphContext):
+        """Add the entities mentioned by the documents nearest to the query embedding"""
         
-        for keyword in keywords[:3]:  # Limit to top 3 keywords
-            keyword_query = """
-            MATCH (n)
-            WHERE toLower(n.name) CONTAINS toLower($keyword)
-               OR toLower(n.description) CONTAINS toLower($keyword)
-            RETURN n, labels(n) as labels
-            LIMIT 3
-            """
-            
-            results = session.run(keyword_query, {'keyword': keyword})
-            for record in results:
-                node_data = dict(record['n'])
-                node_labels = record['labels']
-                
-                nodes.append({
-                    'name': node_data.get('name', 'Unknown'),
-                    'type': node_labels[0] if node_labels else 'Unknown',
-                    'properties': node_data,
-                    'relevance': f'keyword_{keyword}'
-                })
+        if not graph_backend.supports_vector_search:
+            return
+        
+        embedding = embedder.encode(query)
+        if embedding is None:
+            return
         
-        return {'nodes': nodes}
+        # Documents come back best first, so each entity keeps its best document's score
+        for title, url, score, mentions in graph_backend.similar_documents(
+                embedding, k=VECTOR_TOP_K, mentions=VECTOR_MENTIONS_PER_DOCUMENT):
+            for node, labels in mentions:
+                context.add_node(ContextNode.from_record(node, labels, 'semantic_match', score=score))
     
-    def _get_relationship_paths(self, session, nodes: List[Dict]) -> List[Dict]:
+    def _get_relationship_paths(self, nodes: List[ContextNode]) -> List[Dict]:
         """Find relationship paths between entities"""
         
         paths = []
@@ -231,31 +182,12 @@ class ContextRetriever:
         
         try:
             # Find paths between first two relevant nodes
-            node1_name = nodes[0].get('name')
-            node2_name = nodes[1].get('name') if len(nodes) > 1 else None
+            node1_name = nodes[0].name
+            node2_name = nodes[1].name if len(nodes) > 1 else None
             
+            # Bounded search, cached per entity pair until the graph changes
             if node1_name and node2_name:
-                path_query = """
-                MATCH path = (a)-[*1..3]-(b)
-                WHERE toLower(a.name) = toLower($node1) 
-                  AND toLower(b.name) = toLower($node2)
-                RETURN path
-                LIMIT 3
-                """
-                
-                results = session.run(path_query, {
-                    'node1': node1_name, 
-                    'node2': node2_name
-                })
-                
-                for record in results:
-                    path_data = record['path']
-                    paths.append({
-                        'start': node1_name,
-                        'end': node2_name,
-                        'length': len(path_data.relationships),
-                        'relationships': [rel.type for rel in path_data.relationships]
-                    })
+                paths = path_finder.find_paths(node1_name, node2_name, max_depth=3, limit=3)
         
         except Exception as e:
             print(f"Error finding paths: {e}")
@@ -281,41 +213,11 @@ class ContextRetriever:
         
         return keywords[:5]  # Return top 5 keywords
     
-    def _deduplicate_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Remove duplicate nodes and relationships"""
-        
-        # Deduplicate nodes by name
-        seen_nodes = set()
-        unique_nodes = []
-        
-        for node in context['nodes']:
-            node_key = (node.get('name', ''), node.get('type', ''))
-            if node_key not in seen_nodes:
-                seen_nodes.add(node_key)
-                unique_nodes.append(node)
-        
-        # Deduplicate relationships
-        seen_rels = set()
-        unique_rels = []
-        
-        for rel in context['relationships']:
-            rel_key = (rel.get('from', ''), rel.get('to', ''), rel.get('type', ''))
-            if rel_key not in seen_rels:
-                seen_rels.add(rel_key)
-                unique_rels.append(rel)
-        
-        return {
-            'nodes': unique_nodes,
-            'relationships': unique_rels,
-            'paths': context['paths'],
-            'summary': context['summary']
-        }
-    
-    def _create_context_summary(self, context: Dict[str, Any]) -> str:
+    def _create_context_summary(self, context: GraphContext) -> str:
         """Create a summary of retrieved context"""
         
-        nodes = context['nodes']
-        relationships = context['relationships']
+        nodes = context.nodes
+        relationships = context.relationships
         
         if not nodes:
             return "No relevant information found in knowledge graph."
@@ -325,10 +227,7 @@ class ContextRetriever:
         # Summarize nodes by type
         node_types = {}
         for node in nodes:
-            node_type = node.get('type', 'Unknown')
-            if node_type not in node_types:
-                node_types[node_type] = []
-            node_types[node_type].append(node.get('name', 'Unknown'))
+            node_types.setdefault(node.type, []).append(node.name)
         
         for node_type, names in node_types.items():
             if len(names) == 1:
@@ -338,7 +237,7 @@ class ContextRetriever:
         
         # Add relationship info
         if relationships:
-            rel_types = list(set([rel.get('type', 'Unknown') for rel in relationships]))
+            rel_types = list(dict.fromkeys(rel.type for rel in relationships))
             summary_parts.append(f"Related through: {', '.join(rel_types[:3])}")
         
         return "; ".join(summary_parts)
\ No newline at end of file
@@ -0,0 +1,318 @@
+# backend/csr_graph_engine.py - In-process CSR adjacency engine for graph traversal
+
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
+from .graph_change_tracker import graph_changes
+from .schema_migrations import name_key
+
+# Minimum seconds between snapshot reloads after writes; in between, the snapshot is
+# stale and path searches go to the graph backend instead
+CSR_RELOAD_INTERVAL_SECONDS = float(os.getenv("CSR_RELOAD_INTERVAL_SECONDS", 60))
+
+def _read_snapshot(tx):
+    node_records = list(tx.run(cypher_registry['graph_nodes']))
+    edge_records = list(tx.run(cypher_registry['graph_edges']))
+    return node_records, edge_records
+
+class CSRGraphEngine:
+    """Stores the knowledge graph as CSR arrays and answers traversal queries in-process.
+
+    A snapshot loaded from Neo4j remembers the graph version it was read at and is only
+    current until the next write (ours or, through the shared version, another worker's).
+    Writes schedule a reload in the background, at most once per CSR_RELOAD_INTERVAL_SECONDS.
+    """
+
+    def __init__(self):
+        # offsets[i]:offsets[i+1] is the slice of targets/rel_types adjacent to node i
+        self.offsets = np.zeros(1, dtype=np.int32)
+        self.targets = np.zeros(0, dtype=np.int32)
+        self.rel_types = np.zeros(0, dtype=np.int16)
+        self.rel_type_names: List[str] = []
+        self.node_names: List[str] = []
+        self.node_labels: List[str] = []
+        self.name_index: Dict[str, int] = {}
+        self._label_masks: Dict[Tuple[str, ...], np.ndarray] = {}
+        self.is_loaded = False
+        # graph_changes.version the Neo4j snapshot was read at (None for synthetic builds)
+        self.version: Optional[int] = None
+        self.reloads = 0
+        self._loaded_at = 0.0
+        # Held while searching and while swapping in new arrays, so no search mixes two snapshots
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self._pending = False
+        graph_changes.subscribe(self._on_graph_change)
+
+    @property
+    def is_current(self) -> bool:
+        """Whether the snapshot was read from Neo4j and the graph has not changed since"""
+        return (self.is_loaded and self.version is not None and self.version == graph_changes.version
+                and graph_changes.is_synced)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        # Every relationship is stored in both directions
+        return len(self.targets) // 2
+
+    def build(self, node_names: List[str], node_labels: List[str], sources, targets, rel_types, rel_type_names: List[str]):
+        """Build CSR arrays from an edge list (node indices are positions in node_names)"""
+
+        node_count = len(node_names)
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        rel_types = np.asarray(rel_types, dtype=np.int16)
+
+        # Relationships are traversed undirected, like the (a)-[*]-(b) patterns in Cypher
+        all_sources = np.concatenate([sources, targets])
+        all_targets = np.concatenate([targets, sources])
+        all_types = np.concatenate([rel_types, rel_types])
+
+        order = np.argsort(all_sources, kind='stable')
+        counts = np.bincount(all_sources, minlength=node_count)
+
+        offsets = np.zeros(node_count + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+
+        node_names = list(node_names)
+        name_index = {}
+        for index, name in enumerate(node_names):
+            if name:
+                name_index.setdefault(name_key(name), index)
+
+        with self._lock:
+            self.offsets = offsets
+            self.targets = all_targets[order].astype(np.int32, copy=False)
+            self.rel_types = all_types[order].astype(np.int16, copy=False)
+            self.rel_type_names = list(rel_type_names)
+            self.node_names = node_names
+            self.node_labels = list(node_labels)
+            self.name_index = name_index
+            self._label_masks = {}
+            self.is_loaded = True
+            self.version = None
+
+    def load_from_neo4j(self) -> bool:
+        """Snapshot the Neo4j graph into CSR arrays"""
+        # Taken before the read, so a write racing with it leaves the snapshot stale
+        version = graph_changes.version
+        try:
+            # One read transaction, so nodes and edges come from the same snapshot
+            node_records, edge_records = neo4j_conn.execute_read(_read_snapshot)
+
+            id_to_index = {}
+            node_names = []
+            node_labels = []
+            for index, record in enumerate(node_records):
+                id_to_index[record['id']] = index
+                node_names.append(record['name'] or '')
+                node_labels.append(record['labels'][0] if record['labels'] else 'Unknown')
+
+            type_index = {}
+            sources, targets, rel_types = [], [], []
+            for record in edge_records:
+                sources.append(id_to_index[record['source']])
+                targets.append(id_to_index[record['target']])
+                rel_types.append(type_index.setdefault(record['type'], len(type_index)))
+
+            with self._lock:
+                self.build(node_names, node_labels, sources, targets, rel_types, list(type_index))
+                self.version = version
+            self._loaded_at = time.monotonic()
+            print(f"✅ CSR graph engine loaded: {self.node_count} nodes, {self.edge_count} relationships")
+            return True
+
+        except Exception as e:
+            print(f"⚠️ CSR graph engine load failed: {e}")
+            with self._lock:
+                self.is_loaded = False
+            return False
+
+    def node_id(self, name: str) -> Optional[int]:
+        """Resolve a node name (compared by name_key, like the graph lookups) to its CSR index"""
+        if not name:
+            return None
+        return self.name_index.get(name_key(name))
+
+    def label_mask(self, labels: Tuple[str, ...]) -> np.ndarray:
+        """Boolean mask of the nodes whose label is one of labels"""
+        mask = self._label_masks.get(labels)
+        if mask is None:
+            wanted = set(labels)
+            mask = np.fromiter((label in wanted for label in self.node_labels), dtype=bool, count=self.node_count)
+            self._label_masks[labels] = mask
+        return mask
+
+    def degree(self, nodes=None) -> np.ndarray:
+        """Degree of every node, or of the given node indices"""
+        degrees = np.diff(self.offsets)
+        if nodes is None:
+            return degrees
+        return degrees[np.asarray(nodes, dtype=np.int32)]
+
+    def neighbors(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbour indices and relationship type ids of a single node"""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return self.targets[start:end], self.rel_types[start:end]
+
+    def _expand(self, frontier: np.ndarray) -> np.ndarray:
+        """Gather all neighbours of a frontier in one vectorized pass"""
+        starts = self.offsets[frontier]
+        lengths = self.offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        # Positions into targets: each frontier node contributes starts[i] .. starts[i]+lengths[i]
+        run_starts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = run_starts + np.arange(total, dtype=np.int64)
+        return self.targets[positions]
+
+    def _distances(self, source: int, max_depth: int, blocked: Optional[np.ndarray] = None) -> np.ndarray:
+        """Hop distance from source to every node, capped at max_depth (unreached = max_depth + 1).
+
+        Blocked nodes get a distance but are never expanded, so no path passes through them.
+        """
+        unreached = max_depth + 1
+        distances = np.full(self.node_count, unreached, dtype=np.int32)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+
+        for depth in range(1, max_depth + 1):
+            reached = self._expand(frontier)
+            reached = reached[distances[reached] == unreached]
+            if reached.size == 0:
+                break
+            frontier = np.unique(reached)
+            distances[frontier] = depth
+            if blocked is not None:
+                frontier = frontier[~blocked[frontier]]
+
+        return distances
+
+    def k_hop(self, node: int, k: int, include_self: bool = False) -> np.ndarray:
+        """All nodes within k hops of node"""
+        distances = self._distances(node, k)
+        mask = distances <= k
+        if not include_self:
+            mask[node] = False
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def bounded_paths(self, source: int, target: int, max_depth: int = 3, limit: int = 3,
+                      blocked: Optional[np.ndarray] = None,
+                      max_expansions: Optional[int] = None) -> List[List[Tuple[int, int]]]:
+        """All shortest paths from source to target, if they are at most max_depth long.
+
+        Each path is a list of (relationship type id, node index) hops. Like Cypher's
+        allShortestPaths, only paths of the shortest length are returned. The search
+        follows only edges that step exactly one hop closer to the target, so each path
+        visits a node at most once. Blocked nodes never appear in a path, not even as
+        endpoints. After max_expansions node expansions, the paths found so far are returned.
+        """
+        if source == target or (blocked is not None and (blocked[source] or blocked[target])):
+            return []
+
+        to_target = self._distances(target, max_depth, blocked)
+        length = int(to_target[source])
+        if length > max_depth:
+            return []
+
+        paths = []
+        expansions = 0
+        stack = [(source, [])]
+        while stack and len(paths) < limit:
+            if max_expansions is not None and expansions >= max_expansions:
+                break
+            expansions += 1
+            node, hops = stack.pop()
+            if node == target:
+                paths.append(hops)
+                continue
+
+            remaining = length - len(hops)
+            neighbours, types = self.neighbors(node)
+            candidates = np.flatnonzero(to_target[neighbours] == remaining - 1)
+            for position in candidates[::-1]:
+                neighbour = int(neighbours[position])
+                if blocked is not None and blocked[neighbour] and neighbour != target:
+                    continue
+                stack.append((neighbour, hops + [(int(types[position]), neighbour)]))
+
+        return paths
+
+    def find_paths(self, start_name: str, end_name: str, max_depth: int = 3, limit: int = 3,
+                   blocked_labels: Tuple[str, ...] = (), max_expansions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Relationship paths between two named nodes, in the ContextRetriever path format"""
+        with self._lock:
+            source = self.node_id(start_name)
+            target = self.node_id(end_name)
+            if source is None or target is None:
+                return []
+
+            blocked = self.label_mask(tuple(blocked_labels)) if blocked_labels else None
+
+            return [
+                {
+                    'start': start_name,
+                    'end': end_name,
+                    'length': len(hops),
+                    'relationships': [self.rel_type_names[rel_type] for rel_type, _ in hops]
+                }
+                for hops in self.bounded_paths(source, target, max_depth, limit, blocked, max_expansions)
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'loaded': self.is_loaded,
+            'current': self.is_current,
+            'version': self.version,
+            'nodes': self.node_count,
+            'relationships': self.edge_count,
+            'reloads': self.reloads
+        }
+
+    def _on_graph_change(self, change: Dict[str, Any]):
+        """Reload in the background; until then path searches bypass the snapshot"""
+        if self.version is None:
+            return
+
+        with self._reload_lock:
+            if self._reloading:
+                # Coalesce bursts of writes (an ingestion run) into one more reload
+                self._pending = True
+                return
+            self._reloading = True
+
+        threading.Thread(target=self._reload_loop, daemon=True, name='csr-reload').start()
+
+    def _reload_loop(self):
+        while True:
+            wait = CSR_RELOAD_INTERVAL_SECONDS - (time.monotonic() - self._loaded_at)
+            if wait > 0:
+                time.sleep(wait)
+            with self._reload_lock:
+                self._pending = False
+            if self.load_from_neo4j():
+                self.reloads += 1
+            else:
+                # Try again after another interval rather than hammering an unreachable graph
+                self._loaded_at = time.monotonic()
+                with self._reload_lock:
+                    self._pending = True
+            with self._reload_lock:
+                if not self._pending:
+                    self._reloading = False
+                    return
+
+# Global engine instance
+graph_engine = CSRGraphEngine()
@@ -0,0 +1,562 @@
+# backend/cypher_registry.py - Named, parameterized Cypher queries with startup plan checks
+
+import sys
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from .neo4j_connection import neo4j_conn
+
+# Labels and relationship types that may appear in query text. Anything label- or
+# type-specific is registered once per whitelisted value, so the text the server sees
+# is always one of a fixed set and its plan stays cached.
+NODE_LABELS = (
+    'Company', 'Brand', 'Product', 'Category', 'Topic', 'Person', 'Store', 'Nutrition',
+    'Ingredient', 'Document', 'Keyword', 'Campaign', 'FAQ'
+)
+RELATIONSHIP_TYPES = (
+    'ANSWERS_ABOUT', 'AVAILABLE_AT', 'BELONGS_TO', 'CEO_OF', 'COMMITTED_TO', 'CONTAINS',
+    'FEATURED_IN', 'HAS_NUTRITION', 'MENTIONS', 'PRACTICES', 'PRODUCED_BY', 'RELATED_TO',
+    'SUBSIDIARY_OF', 'SUPPORTS', 'USES', 'USES_INGREDIENT'
+)
+
+# Variable-length path queries are registered for each depth up to this bound
+MAX_PATH_DEPTH = 5
+
+# Hub labels that link nearly everything; relationship paths never pass through them
+PATH_EXCLUDED_LABELS = ('Keyword', 'Document')
+
+# Plan operators that mean a query touches the whole graph or multiplies row counts
+FLAGGED_OPERATORS = {'AllNodesScan', 'CartesianProduct'}
+
+# Properties context formatting reads, per label. Retrieval queries return only these
+# (plus the element id), never embeddings or document bodies.
+CONTEXT_PROPERTIES = ['name', 'title', 'description', 'url']
+CONTEXT_PROPERTIES_BY_LABEL = {
+    'Product': ['tagline', 'launched', 'varieties'],
+    'Company': ['founded', 'headquarters', 'mission', 'ceo'],
+    'Topic': ['goals', 'focus_areas', 'commitment']
+}
+
+_LABELS_BY_KEY = {label.lower(): label for label in NODE_LABELS}
+
+def node_label(label: str) -> str:
+    """Whitelisted spelling of a node label (case-insensitive); ValueError otherwise"""
+    canonical = _LABELS_BY_KEY.get(str(label).strip().lower())
+    if canonical is None:
+        raise ValueError(f"Unknown node type '{label}'. Allowed: {', '.join(NODE_LABELS)}")
+    return canonical
+
+def relationship_type(rel_type: str) -> str:
+    """Whitelisted relationship type (case-insensitive); ValueError otherwise"""
+    canonical = str(rel_type).strip().upper()
+    if canonical not in RELATIONSHIP_TYPES:
+        raise ValueError(f"Unknown relationship type '{rel_type}'. Allowed: {', '.join(RELATIONSHIP_TYPES)}")
+    return canonical
+
+def context_projection(var: str) -> str:
+    """Cypher map projection of var's context properties, chosen by its label"""
+    def projection(keys):
+        fields = ', '.join(f'.{key}' for key in CONTEXT_PROPERTIES + keys)
+        return f"{var} {{element_id: elementId({var}), {fields}}}"
+
+    cases = ' '.join(
+        f"WHEN {var}:{label} THEN {projection(keys)}" for label, keys in CONTEXT_PROPERTIES_BY_LABEL.items()
+    )
+    return f"CASE {cases} ELSE {projection([])} END"
+
+class CypherRegistry:
+    """Every query the application runs, by name.
+
+    allow lists flagged plan operators a query is expected to use, such as the full
+    scans behind graph snapshots and statistics. Reads registered with cached=True are
+    served from the result cache; depends_on names the labels and relationship types
+    they read (empty: any write invalidates them).
+    """
+
+    def __init__(self):
+        self._queries: Dict[str, Dict[str, Any]] = {}
+        self._names_by_text: Dict[str, str] = {}
+        self.report: Dict[str, Any] = {}
+
+    def register(self, name: str, text: str, write: bool = False, allow: Iterable[str] = (),
+                 cached: bool = False, depends_on: Iterable[str] = ()):
+        if name in self._queries:
+            raise ValueError(f"Query '{name}' is already registered")
+        if cached and write:
+            raise ValueError(f"Write query '{name}' cannot be cached")
+        self._queries[name] = {
+            'text': text, 'write': write, 'allow': set(allow),
+            'depends_on': tuple(sorted(depends_on)) if cached else None
+        }
+        self._names_by_text.setdefault(text, name)
+
+    def __getitem__(self, name: str) -> str:
+        return self._queries[name]['text']
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._queries
+
+    def names(self) -> List[str]:
+        return list(self._queries)
+
+    def name_of(self, text: str) -> Optional[str]:
+        """Name a query text is registered under, or None for ad-hoc statements"""
+        return self._names_by_text.get(text)
+
+    def cache_dependencies(self, name: str) -> Optional[Tuple[str, ...]]:
+        """Labels/relationship types a cached query reads, or None if it is not cached"""
+        return self._queries[name]['depends_on']
+
+    def validate(self) -> Dict[str, Any]:
+        """EXPLAIN every query and flag plans with unexpected full scans or cartesian products"""
+        started = time.monotonic()
+        flagged: Dict[str, List[str]] = {}
+        failed: Dict[str, str] = {}
+
+        for name, entry in self._queries.items():
+            # EXPLAIN plans without executing; writes still need a write transaction
+            execute = neo4j_conn.execute_write if entry['write'] else neo4j_conn.execute_read
+            try:
+                plan = execute(_explain, entry['text'])
+            except Exception as e:
+                failed[name] = str(e)
+                continue
+            operators = FLAGGED_OPERATORS.intersection(_plan_operators(plan)) - entry['allow']
+            if operators:
+                flagged[name] = sorted(operators)
+
+        self.report = {
+            'queries': len(self._queries),
+            'flagged': flagged,
+            'failed': failed,
+            'seconds': round(time.monotonic() - started, 2),
+            'checked_at': time.time()
+        }
+        return self.report
+
+def _explain(tx, text):
+    return tx.run("EXPLAIN " + text).consume().plan or {}
+
+def _plan_operators(plan) -> List[str]:
+    operators = []
+    stack = [plan]
+    while stack:
+        step = stack.pop()
+        # Operator names carry a runtime suffix, e.g. AllNodesScan@neo4j
+        operators.append(step.get('operatorType', '').split('@')[0])
+        stack.extend(step.get('children', []))
+    return operators
+
+# Global registry
+cypher_registry = CypherRegistry()
+register = cypher_registry.register
+
+# --- Graph-wide reads: snapshots, statistics, index builds ------------------
+
+register('count_nodes', "MATCH (n) RETURN count(n) as count")
+
+register('node_names', "MATCH (n:Entity) RETURN n.name as name")
+
+# Counts per whitelisted label / relationship type. Each branch is a constant-time
+# count-store read, so these cost O(#labels) however large the graph grows.
+for label in NODE_LABELS:
+    register(f'label_count:{label}', f"MATCH (n:{label}) RETURN '{label}' as label, count(n) as count")
+
+for rel_type in RELATIONSHIP_TYPES:
+    register(f'relationship_type_count:{rel_type}',
+             f"MATCH ()-[r:{rel_type}]->() RETURN '{rel_type}' as relationship_type, count(r) as count")
+
+register('label_counts', '\nUNION ALL\n'.join(cypher_registry[f'label_count:{label}'] for label in NODE_LABELS))
+
+register('relationship_type_counts', '\nUNION ALL\n'.join(
+    cypher_registry[f'relationship_type_count:{rel_type}'] for rel_type in RELATIONSHIP_TYPES
+))
+
+register('graph_nodes', "MATCH (n) RETURN elementId(n) as id, n.name as name, [label IN labels(n) WHERE label <> 'Entity'] as labels",
+         allow={'AllNodesScan'})
+
+register('graph_edges', "MATCH (a)-[r]->(b) RETURN elementId(a) as source, elementId(b) as target, type(r) as type",
+         allow={'AllNodesScan'})
+
+register('snapshot_nodes', "MATCH (n) RETURN elementId(n) as id, [label IN labels(n) WHERE label <> 'Entity'] as labels, properties(n) as properties",
+         allow={'AllNodesScan'})
+
+register('snapshot_relationships', """
+    MATCH (a)-[r]->(b)
+    RETURN elementId(a) as source, elementId(b) as target, type(r) as type, properties(r) as properties
+    """, allow={'AllNodesScan'})
+
+FACT_CARD_RETURN = """
+    RETURN n.name as name,
+           [label IN labels(n) WHERE label <> 'Entity'] as labels,
+           properties(n) as properties,
+           [(n)-[:HAS_NUTRITION]->(nu:Nutrition) | properties(nu)][0] as nutrition,
+           [(n)-[:CONTAINS]->(i:Ingredient) | i.name] as ingredients,
+           [(n)-[:BELONGS_TO]->(c:Category) | c.name] as categories,
+           [(n)-[:AVAILABLE_AT]->(s:Store) | s.name] as stores,
+           [(n)-[r]-(m) WHERE m.name IS NOT NULL AND NOT m:Keyword
+               | {type: type(r), name: m.name, outgoing: startNode(r) = n}][..10] as relationships,
+           [(d:Document)-[:MENTIONS]->(n) WHERE d.url IS NOT NULL | d.url][..5] as sources
+    """
+
+register('fact_cards', """
+    MATCH (n:Entity)
+    WHERE none(label IN labels(n) WHERE label IN $excluded_labels)
+    """ + FACT_CARD_RETURN)
+
+register('fact_cards_by_key', """
+    MATCH (n:Entity)
+    WHERE n.name_key IN $name_keys
+      AND none(label IN labels(n) WHERE label IN $excluded_labels)
+    """ + FACT_CARD_RETURN)
+
+# Named nodes whose Entity label / name_key is missing or stale, found in one pass; the
+# updates then seek each batch by element id instead of scanning again
+register('stale_name_key_ids', """
+    MATCH (n)
+    WHERE n.name IS NOT NULL
+      AND (NOT n:Entity OR n.name_key IS NULL OR n.name_key <> toLower(trim(n.name)))
+    RETURN elementId(n) as id
+    """, allow={'AllNodesScan'})
+
+register('refresh_name_keys', """
+    MATCH (n)
+    WHERE elementId(n) IN $ids AND n.name IS NOT NULL
+    SET n:Entity, n.name_key = toLower(trim(n.name))
+    RETURN count(n) as updated
+    """, write=True)
+
+register('await_indexes', "CALL db.awaitIndexes($timeout_seconds)")
+
+register('applied_migrations', "MATCH (m:SchemaMigration) RETURN m.id as id")
+
+register('record_migration', """
+    MERGE (m:SchemaMigration {id: $id})
+    SET m.description = $description, m.applied_at = datetime()
+    """, write=True)
+
+# Shared graph version: bumped after every write we make and polled by every process
+# (see graph_change_tracker), so one worker's writes invalidate the others' caches
+register('graph_version', "MATCH (v:GraphVersion {scope: 'graph'}) RETURN v.version as version")
+
+# Locking the node before reading the counter keeps concurrent bumps from reading the same value
+register('bump_graph_version', """
+    MERGE (v:GraphVersion {scope: 'graph'})
+    SET v._lock = true
+    SET v.version = coalesce(v.version, 0) + 1
+    REMOVE v._lock
+    RETURN v.version as version
+    """, write=True)
+
+# --- Context retrieval -------------------------------------------------------
+
+register('find_node', """
+    MATCH (n:Entity {name_key: $name_key})
+    RETURN """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 1
+    """)
+
+register('neighbours', """
+    MATCH (n:Entity {name_key: $name_key})-[r]-(m)
+    RETURN r, """ + context_projection('m') + """ as m, [label IN labels(m) WHERE label <> 'Entity'] as target_labels
+    LIMIT $limit
+    """)
+
+# One round trip for every entity in a question: each name is an index seek and each
+# neighbourhood is capped inside its own subquery
+register('entity_neighbourhoods', """
+    UNWIND $name_keys as name_key
+    CALL {
+        WITH name_key
+        MATCH (n:Entity {name_key: name_key})
+        RETURN n LIMIT 1
+    }
+    CALL {
+        WITH n
+        OPTIONAL MATCH (n)-[r]-(m)
+        WITH r, m LIMIT $limit
+        RETURN collect([type(r), properties(r), """ + context_projection('m') + """,
+                        [label IN labels(m) WHERE label <> 'Entity']]) as neighbours
+    }
+    RETURN name_key, """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels, neighbours
+    """)
+
+register('intent_nodes:company_info', """
+    MATCH (n)
+    WHERE n.name CONTAINS 'Nestlé' OR n.name CONTAINS 'Nestle'
+       OR 'Company' IN labels(n) OR 'Brand' IN labels(n)
+    RETURN """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 5
+    """, allow={'AllNodesScan'}, cached=True)
+
+register('intent_nodes:sustainability', """
+    MATCH (n)
+    WHERE toLower(n.name) CONTAINS 'sustainability'
+       OR toLower(n.name) CONTAINS 'cocoa'
+       OR toLower(n.name) CONTAINS 'environment'
+       OR 'Topic' IN labels(n)
+    RETURN """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 5
+    """, allow={'AllNodesScan'}, cached=True)
+
+register('intent_nodes:product_info', """
+    MATCH (n:Product|Category)
+    RETURN """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 8
+    """, cached=True, depends_on={'Product', 'Category'})
+
+# $query is a Lucene query over name/description/title/content; hits come back best first
+register('text_search', """
+    CALL db.index.fulltext.queryNodes('entity_text', $query, {limit: $limit})
+    YIELD node, score
+    RETURN """ + context_projection('node') + """ as n, [label IN labels(node) WHERE label <> 'Entity'] as labels, score
+    """)
+
+# Nearest documents by embedding, each with the Products/Topics it mentions
+register('similar_documents', """
+    CALL db.index.vector.queryNodes('document_embedding', $k, $embedding)
+    YIELD node as d, score
+    RETURN d.title as title, d.url as url, score,
+           [(d)-[:MENTIONS]->(m) WHERE m:Product OR m:Topic
+               | [""" + context_projection('m') + """, [label IN labels(m) WHERE label <> 'Entity']]][..$mentions] as mentions
+    """)
+
+# Both endpoints are single index seeks, so their cartesian product is one row. The
+# shortest-path search runs breadth-first from both ends and the label predicate is
+# checked during expansion, so hub nodes are never expanded.
+_PATH_NODE_FILTER = ' AND '.join(f'NOT n:{label}' for label in PATH_EXCLUDED_LABELS)
+for depth in range(1, MAX_PATH_DEPTH + 1):
+    register(f'relationship_paths:{depth}', f"""
+    MATCH (a:Entity {{name_key: $start_key}}), (b:Entity {{name_key: $end_key}})
+    WHERE a <> b
+    MATCH path = allShortestPaths((a)-[*..{depth}]-(b))
+    WHERE all(n IN nodes(path) WHERE {_PATH_NODE_FILTER})
+    RETURN path
+    LIMIT $limit
+    """, allow={'CartesianProduct'})
+
+# --- Smart-intent handlers ---------------------------------------------------
+
+register('find_node_exact', """
+    MATCH (n:Entity {name_key: $name_key})
+    WHERE n.name = $entity
+    RETURN """ + context_projection('n') + """ as n, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    """)
+
+register('product_nutrition', """
+    MATCH (p:Product {name: $product})-[:HAS_NUTRITION]->(n:Nutrition)
+    RETURN n
+    """)
+
+register('product_ingredients', """
+    MATCH (p:Product {name: $product})-[:CONTAINS]->(i:Ingredient)
+    RETURN i.name as ingredient
+    """)
+
+register('product', """
+    MATCH (p:Product {name: $product})
+    OPTIONAL MATCH (p)-[:BELONGS_TO]->(c:Category)
+    RETURN p, c.name as category
+    """)
+
+register('product_stores', """
+    MATCH (s:Store)
+    OPTIONAL MATCH (p:Product)-[:AVAILABLE_AT]->(s)
+    WHERE $product = 'Nestlé products' OR p.name = $product
+    RETURN DISTINCT s.name as store, s.type as type, s.locations as locations, s.website as website
+    ORDER BY s.name
+    """)
+
+# The fixed listings below are identical across requests, so they are served from the
+# result cache until a write touches what they read
+register('ceo:by_company', "MATCH (p:Person)-[:CEO_OF]->(c:Company) WHERE toLower(c.name) CONTAINS 'nestlé' RETURN p.name as name, p.role as role, c.name as company",
+         cached=True, depends_on={'Person', 'Company', 'CEO_OF'})
+register('ceo:by_name', "MATCH (p:Person) WHERE toLower(p.name) CONTAINS 'schneider' RETURN p.name as name, p.role as role",
+         cached=True, depends_on={'Person'})
+register('ceo:by_role', "MATCH (p:Person) WHERE toLower(p.role) CONTAINS 'ceo' RETURN p.name as name, p.role as role",
+         cached=True, depends_on={'Person'})
+
+register('nestle_companies', "MATCH (c:Company) WHERE c.name CONTAINS 'Nestlé' RETURN c ORDER BY c.name",
+         cached=True, depends_on={'Company'})
+
+register('sustainability_topics', """
+    MATCH (t:Topic)
+    WHERE toLower(t.name) CONTAINS 'sustainability'
+       OR toLower(t.name) CONTAINS 'cocoa'
+       OR toLower(t.name) CONTAINS 'environment'
+    RETURN t
+    """, cached=True, depends_on={'Topic'})
+
+register('recipes', """
+    MATCH (d:Document)
+    WHERE d.type = 'Recipe' OR toLower(d.title) CONTAINS 'recipe'
+    OPTIONAL MATCH (d)-[:USES_INGREDIENT]->(i:Ingredient)
+    RETURN d.title as title, d.url as url, collect(i.name) as ingredients
+    ORDER BY d.title
+    LIMIT $limit
+    """, cached=True, depends_on={'Document', 'Ingredient', 'USES_INGREDIENT'})
+
+register('campaigns', """
+    MATCH (c:Campaign)
+    OPTIONAL MATCH (p:Product)-[:FEATURED_IN]->(c)
+    RETURN c.name as campaign, c.theme as theme, c.start_date as start_date, c.end_date as end_date, collect(p.name) as products
+    ORDER BY c.start_date DESC
+    """, cached=True, depends_on={'Campaign', 'Product', 'FEATURED_IN'})
+
+# --- User graph edits and search --------------------------------------------
+
+for label in NODE_LABELS:
+    register(f'add_node:{label}', f"""
+    MERGE (n:{label} {{name: $name}})
+    ON CREATE SET n.created_at = datetime()
+    SET n += $properties
+    SET n:Entity, n.name_key = toLower(trim(n.name)), n.custom_added = true
+    RETURN n
+    """, write=True)
+
+    register(f'search_nodes:{label}', f"""
+    MATCH (n:{label}:Entity)
+    WHERE n.name_key CONTAINS $search_key
+    RETURN n.name as name, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 20
+    """)
+
+# Both endpoints are single index seeks, so their cartesian product is one row
+for rel_type in RELATIONSHIP_TYPES:
+    register(f'add_relationship:{rel_type}', f"""
+    MATCH (a:Entity {{name_key: $from_key}}), (b:Entity {{name_key: $to_key}})
+    WHERE a.name = $from_node AND b.name = $to_node
+    MERGE (a)-[r:{rel_type}]->(b)
+    ON CREATE SET r.created_at = datetime()
+    SET r += $properties
+    SET r.custom_added = true
+    RETURN r
+    """, write=True, allow={'CartesianProduct'})
+
+register('search_nodes', """
+    MATCH (n:Entity)
+    WHERE n.name_key CONTAINS $search_key
+    RETURN n.name as name, [label IN labels(n) WHERE label <> 'Entity'] as labels
+    LIMIT 20
+    """)
+
+# --- Seed data --------------------------------------------------------------------
+
+# Merge key of each label seed_data.json may contain
+SEED_NODE_KEYS = {
+    'Company': 'name', 'Category': 'name', 'Product': 'name', 'Topic': 'name', 'Person': 'name',
+    'Store': 'name', 'Nutrition': 'product', 'FAQ': 'question'
+}
+# (from label, to label) of each relationship type seed_data.json may contain
+SEED_RELATIONSHIPS = {
+    'SUBSIDIARY_OF': ('Company', 'Company'), 'CEO_OF': ('Person', 'Company'),
+    'BELONGS_TO': ('Product', 'Category'), 'PRODUCED_BY': ('Product', 'Company'),
+    'SUPPORTS': ('Product', 'Topic'), 'USES': ('Product', 'Topic'),
+    'COMMITTED_TO': ('Company', 'Topic'), 'PRACTICES': ('Company', 'Topic'),
+    'AVAILABLE_AT': ('Product', 'Store'), 'HAS_NUTRITION': ('Product', 'Nutrition'),
+    'ANSWERS_ABOUT': ('FAQ', 'Product')
+}
+
+# Seeded values never overwrite edits: `defaults` only fill properties that are missing
+# (existing values are re-applied over them), `properties` always win
+_SEED_SET_PROPERTIES = """
+        ON CREATE SET {var}.created_at = datetime()
+        WITH {var}, row, properties({var}) AS existing
+        SET {var} += row.defaults
+        SET {var} += existing
+        SET {var} += row.properties"""
+
+def _seed_node_merge(label: str, key: str) -> str:
+    entity = "\n        SET n:Entity, n.name_key = toLower(trim(n.name))" if key == 'name' else ""
+    return f"""
+    CALL {{
+        WITH row
+        WITH row WHERE row.label = '{label}'
+        MERGE (n:{label} {{{key}: row.key}})""" + _SEED_SET_PROPERTIES.format(var='n') + entity + "\n    }"
+
+def _seed_relationship_merge(rel_type: str, from_label: str, to_label: str) -> str:
+    return f"""
+    CALL {{
+        WITH row
+        WITH row WHERE row.type = '{rel_type}'
+        MATCH (a:{from_label} {{{SEED_NODE_KEYS[from_label]}: row.from}})
+        MATCH (b:{to_label} {{{SEED_NODE_KEYS[to_label]}: row.to}})
+        MERGE (a)-[r:{rel_type}]->(b)""" + _SEED_SET_PROPERTIES.format(var='r') + "\n    }"
+
+# Every seed node in one statement, every seed relationship in another; unit subqueries
+# keep one row per input row
+register('seed_nodes', "\n    UNWIND $nodes AS row" + ''.join(
+    _seed_node_merge(label, key) for label, key in SEED_NODE_KEYS.items()
+) + "\n    RETURN count(row) as nodes\n    ", write=True)
+
+# Both endpoints are single index seeks, so their cartesian product is one row
+register('seed_relationships', "\n    UNWIND $relationships AS row" + ''.join(
+    _seed_relationship_merge(rel_type, *labels) for rel_type, labels in SEED_RELATIONSHIPS.items()
+) + "\n    RETURN count(row) as relationships\n    ", write=True, allow={'CartesianProduct'})
+
+register('seed_version', """
+    MATCH (s:SeedVersion {dataset: $dataset})
+    RETURN s.checksum as checksum
+    """)
+
+register('record_seed_version', """
+    MERGE (s:SeedVersion {dataset: $dataset})
+    SET s.checksum = $checksum, s.version = $version, s.applied_at = datetime()
+    """, write=True)
+
+# --- Scraped documents ---------------------------------------------------------
+
+# A batch of documents with all their MENTIONS / CONTAINS edges in one statement. Each
+# document is matched once; the unit subqueries leave one row per document even when a
+# list is empty.
+register('upsert_documents', """
+    UNWIND $documents AS doc
+    MERGE (d:Document {url: doc.url})
+    SET d.title = doc.title,
+        d.content = doc.content,
+        d.embedding = doc.embedding,
+        d.created_at = datetime(),
+        d.word_count = doc.word_count
+    WITH d, doc
+    CALL {
+        WITH d, doc
+        UNWIND doc.products AS name
+        MERGE (p:Product {name: name})
+        SET p:Entity, p.name_key = toLower(trim(p.name))
+        MERGE (d)-[:MENTIONS]->(p)
+    }
+    CALL {
+        WITH d, doc
+        UNWIND doc.categories AS name
+        MERGE (c:Category {name: name})
+        SET c:Entity, c.name_key = toLower(trim(c.name))
+        MERGE (d)-[:MENTIONS]->(c)
+    }
+    CALL {
+        WITH d, doc
+        UNWIND doc.topics AS name
+        MERGE (t:Topic {name: name})
+        SET t:Entity, t.name_key = toLower(trim(t.name))
+        MERGE (d)-[:MENTIONS]->(t)
+    }
+    CALL {
+        WITH d, doc
+        UNWIND doc.keywords AS keyword
+        MERGE (k:Keyword {text: keyword})
+        MERGE (d)-[:CONTAINS]->(k)
+    }
+    RETURN count(d) AS documents
+    """, write=True)
+
+if __name__ == "__main__":
+    # Pre-deploy check: exits non-zero when any plan regressed or failed to compile
+    if not neo4j_conn.connect():
+        sys.exit(2)
+    report = cypher_registry.validate()
+    for name, operators in report['flagged'].items():
+        print(f"⚠️ {name}: {', '.join(operators)}")
+    for name, error in report['failed'].items():
+        print(f"❌ {name}: {error}")
+    print(f"📋 Checked {report['queries']} queries in {report['seconds']}s")
+    neo4j_conn.close()
+    sys.exit(1 if report['flagged'] or report['failed'] else 0)
@@ -0,0 +1,50 @@
+# backend/embeddings.py - Shared sentence embedder for document ingestion and retrieval
+
+import os
+import threading
+from typing import List, Optional
+
+# Document embeddings and query embeddings must come from the same model
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+class Embedder:
+    """sentence-transformers model, loaded on first use.
+
+    sentence-transformers is optional: when it is missing (or the model cannot be loaded)
+    encode() returns None and callers skip anything embedding-based.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.available: Optional[bool] = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self.available is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+                    self.available = True
+                    print(f"✅ Loaded embedding model {self.model_name}")
+                except Exception as e:
+                    print(f"⚠️ Embedding model unavailable, vector retrieval disabled: {e}")
+                    self.available = False
+        return self._model
+
+    def encode(self, text: str) -> Optional[List[float]]:
+        model = self._model or self._load()
+        if model is None:
+            return None
+        return model.encode(text).tolist()
+
+    def encode_many(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embeddings for several texts in one batched model call"""
+        model = self._model or self._load()
+        if model is None:
+            return None
+        return model.encode(texts).tolist()
+
+# Global embedder
+embedder = Embedder(EMBEDDING_MODEL)
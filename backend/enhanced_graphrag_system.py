@@ -6,6 +6,10 @@ import asyncio
 
 from .neo4j_connection import neo4j_conn
 from .graph_schema import schema_manager
+from .csr_graph_engine import graph_engine
+from .fact_card_store import fact_card_store
+from .lookup_filter import lookup_filter
+from .graph_stats import graph_stats
 from .intent_analyzer import IntentAnalyzer
 from .context_retriever import ContextRetriever
 from .ai_response_generator import AIResponseGenerator
@@ -40,6 +44,15 @@ class EnhancedGraphRAGSystem:
             # Phase 1: Enhance existing data safely
             await self._enhance_static_data()
             
+            # Snapshot the graph into the in-process traversal engine
+            graph_engine.load_from_neo4j()
+            
+            # Materialize per-entity fact cards
+            fact_card_store.build_all()
+            
+            # Index node names for the negative lookup cache (app.py builds its own at startup)
+            lookup_filter.build()
+            
             # Initialize components
             self.intent_analyzer = IntentAnalyzer()
             self.context_retriever = ContextRetriever()
@@ -236,59 +249,24 @@ class EnhancedGraphRAGSystem:
             return {"error": "Enhanced GraphRAG system not initialized"}
         
         try:
-            with neo4j_conn.get_session() as session:
-                # Get enhanced node counts
-                node_query = """
-                MATCH (n)
-                UNWIND labels(n) as label
-                WITH label, count(*) as count
-                RETURN label, count
-                ORDER BY count DESC
-                """
-                
-                node_results = session.run(node_query)
-                nodes = {}
-                total_nodes = 0
-                
-                for record in node_results:
-                    nodes[record['label']] = record['count']
-                    total_nodes += record['count']
-                
-                # Get relationship counts
-                rel_query = """
-                MATCH ()-[r]->()
-                RETURN type(r) as relationship_type, count(r) as count
-                ORDER BY count DESC
-                """
-                
-                rel_results = session.run(rel_query)
-                relationships = {}
-                total_relationships = 0
-                
-                for record in rel_results:
-                    relationships[record['relationship_type']] = record['count']
-                    total_relationships += record['count']
-                
-                return {
-                    'nodes': nodes,
-                    'relationships': relationships,
-                    'total_nodes': total_nodes,
-                    'total_relationships': total_relationships,
-                    'system_status': 'enhanced_operational',
-                    'data_enhanced': self.data_enhanced,
-                    'dynamic_scraping_enabled': True,
-                    'capabilities': [
-                        'Enhanced product information',
-                        'Store location data',
-                        'Nutritional information',
-                        'FAQ database',
-                        'Real-time news scraping',
-                        'Dynamic availability checking',
-                        'Sustainability updates'
-                    ],
-                    'last_updated': datetime.now().isoformat()
-                }
-                
+            # Counts per label and relationship type, cached and kept current by our writes
+            return {
+                **graph_stats.get(),
+                'system_status': 'enhanced_operational',
+                'data_enhanced': self.data_enhanced,
+                'dynamic_scraping_enabled': True,
+                'capabilities': [
+                    'Enhanced product information',
+                    'Store location data',
+                    'Nutritional information',
+                    'FAQ database',
+                    'Real-time news scraping',
+                    'Dynamic availability checking',
+                    'Sustainability updates'
+                ],
+                'last_updated': datetime.now().isoformat()
+            }
+            
         except Exception as e:
             return {
                 'error': f"Failed to get enhanced stats: {str(e)}",
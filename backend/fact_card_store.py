@@ -0,0 +1,200 @@
+# backend/fact_card_store.py - Materialized per-entity fact cards
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
+from .schema_migrations import name_key
+from .graph_change_tracker import graph_changes
+
+# Labels that are supporting data rather than entities people ask about
+NON_ENTITY_LABELS = ['Document', 'Keyword', 'Nutrition']
+
+# Properties that are bookkeeping or too large to belong on a card
+EXCLUDED_PROPERTIES = {'embedding', 'content', 'created_at', 'last_enhanced', 'custom_added'}
+
+# Names looked up without a card whose absence is remembered, so they are not re-read on
+# every lookup after a write of unknown scope
+MISSING_CARDS_SIZE = 1024
+
+class FactCardStore:
+    """Precomputes a compact fact card per entity so known entities are a single key lookup.
+
+    Writes with known names mark just those cards (and the cards that reference them)
+    stale. A write of unknown scope - which is how every write made by another worker
+    arrives - marks all cards stale at once; each is refreshed on its next lookup.
+    """
+
+    def __init__(self):
+        self.cards: Dict[str, Dict[str, Any]] = {}
+        self._dirty = set()
+        # Graph version each card was last refreshed at (kept and dropped with the card);
+        # build_all covers the rest
+        self._loaded_at: Dict[str, int] = {}
+        # Version at which a name was last found to have no card, least recently used first
+        self._missing: "OrderedDict[str, int]" = OrderedDict()
+        self._built_version = 0
+        # Cards loaded before this version predate a write of unknown scope
+        self._stale_before = 0
+        self._lock = threading.Lock()
+        self.is_built = False
+        graph_changes.subscribe(self._on_graph_change)
+
+    def build_all(self) -> bool:
+        """Materialize cards for every entity in the graph"""
+        version = graph_changes.version
+        try:
+            cards = self._load_cards(None)
+            with self._lock:
+                self.cards = cards
+                self._dirty.clear()
+                self._loaded_at = {}
+                self._missing.clear()
+                self._built_version = version
+            self.is_built = True
+            print(f"✅ Built {len(cards)} fact cards")
+            return True
+        except Exception as e:
+            print(f"⚠️ Fact card build failed: {e}")
+            return False
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Fact card for an entity name (matched by name_key), rebuilt first if it is stale"""
+        if not name or not self.is_built:
+            return None
+
+        key = name_key(name)
+        if key in self._dirty or self._loaded_version(key) < self._stale_before:
+            self.refresh([key])
+
+        return self.cards.get(key)
+
+    def _loaded_version(self, key: str) -> int:
+        """Graph version the card for key, or the knowledge that it has none, dates from"""
+        if key in self.cards:
+            return self._loaded_at.get(key, self._built_version)
+        return self._missing.get(key, self._built_version)
+
+    def refresh(self, keys: Iterable[str]):
+        """Rebuild the cards for the given name keys"""
+        keys = list(keys)
+        version = graph_changes.version
+        try:
+            cards = self._load_cards(keys)
+        except Exception as e:
+            print(f"⚠️ Fact card refresh failed: {e}")
+            return
+
+        with self._lock:
+            for key in keys:
+                self._dirty.discard(key)
+                if key in cards:
+                    self.cards[key] = cards[key]
+                    self._loaded_at[key] = version
+                    self._missing.pop(key, None)
+                else:
+                    # Entity no longer exists (or never did)
+                    self.cards.pop(key, None)
+                    self._loaded_at.pop(key, None)
+                    self._missing[key] = version
+                    self._missing.move_to_end(key)
+            while len(self._missing) > MISSING_CARDS_SIZE:
+                self._missing.popitem(last=False)
+
+    def _on_graph_change(self, change: Dict[str, Any]):
+        """Mark cards stale for the entities a write touched, plus the cards that reference them"""
+        names = change.get('names')
+        if names is None:
+            self._stale_before = change['version']
+            return
+
+        touched = {name_key(name) for name in names if name}
+        with self._lock:
+            affected = set(touched)
+            for key, card in self.cards.items():
+                if any(rel['name'] and name_key(rel['name']) in touched for rel in card['relationships']):
+                    affected.add(key)
+            self._dirty.update(affected)
+
+    def _load_cards(self, keys: Optional[List[str]]) -> Dict[str, Dict[str, Any]]:
+        cards = {}
+        if keys is None:
+            results = neo4j_conn.read(cypher_registry['fact_cards'], {
+                'excluded_labels': NON_ENTITY_LABELS
+            })
+        else:
+            # Stale cards are refreshed while a request waits on them
+            results = neo4j_conn.read(cypher_registry['fact_cards_by_key'], {
+                'name_keys': keys,
+                'excluded_labels': NON_ENTITY_LABELS
+            }, count_slow=True)
+        for record in results:
+            card = self._build_card(record)
+            cards.setdefault(name_key(card['name']), card)
+        return cards
+
+    def _build_card(self, record) -> Dict[str, Any]:
+        labels = record['labels']
+        properties = {
+            key: value for key, value in dict(record['properties']).items()
+            if key not in EXCLUDED_PROPERTIES and key != 'name'
+        }
+        nutrition = {
+            key: value for key, value in dict(record['nutrition'] or {}).items()
+            if key not in EXCLUDED_PROPERTIES
+        }
+
+        card = {
+            'name': record['name'],
+            'type': labels[0] if labels else 'Unknown',
+            'properties': properties,
+            'nutrition': nutrition,
+            'ingredients': [name for name in record['ingredients'] if name],
+            'categories': [name for name in record['categories'] if name],
+            'stores': [name for name in record['stores'] if name],
+            'relationships': [dict(rel) for rel in record['relationships']],
+            'sources': list(record['sources']),
+            'built_at': datetime.now().isoformat()
+        }
+        card['summary'] = self._format_summary(card)
+        return card
+
+    def _format_summary(self, card: Dict[str, Any]) -> str:
+        """Pre-rendered context line, same shape as AIResponseGenerator._format_node_info"""
+        properties = card['properties']
+        info_parts = []
+
+        if 'description' in properties:
+            info_parts.append(properties['description'])
+
+        type_keys = {
+            'Product': ['tagline', 'launched', 'varieties'],
+            'Company': ['founded', 'headquarters', 'mission', 'ceo'],
+            'Topic': ['goals', 'focus_areas', 'commitment']
+        }
+        for key in type_keys.get(card['type'], []):
+            if key in properties:
+                value = properties[key]
+                title = key.replace('_', ' ').title()
+                if isinstance(value, list):
+                    info_parts.append(f"{title}: {', '.join(map(str, value[:3]))}")
+                else:
+                    info_parts.append(f"{title}: {value}")
+
+        if card['nutrition'].get('calories') is not None:
+            serving = card['nutrition'].get('serving_size', 'serving')
+            info_parts.append(f"Calories: {card['nutrition']['calories']} per {serving}")
+        if card['categories']:
+            info_parts.append(f"Category: {', '.join(card['categories'][:2])}")
+
+        result = ". ".join(info_parts[:4])
+        if len(result) > 300:
+            result = result[:297] + "..."
+
+        return result
+
+# Global fact card store
+fact_card_store = FactCardStore()
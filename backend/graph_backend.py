@@ -0,0 +1,294 @@
+# backend/graph_backend.py - Pluggable graph backend for handlers and context retrieval
+
+import os
+import re
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry, MAX_PATH_DEPTH
+from .schema_migrations import name_key
+
+# (node, labels): node is a property mapping with an element_id attribute. Retrieval
+# lookups return only the context properties of each label (see CONTEXT_PROPERTIES)
+NodeRecord = Tuple[Any, List[str]]
+
+# (relationship type, relationship properties, target node, target labels)
+NeighbourRecord = Tuple[str, Dict[str, Any], Any, List[str]]
+
+# (the node, its neighbours)
+Neighbourhood = Tuple[NodeRecord, List[NeighbourRecord]]
+
+# (node, labels, relevance score); higher scores rank first
+ScoredNodeRecord = Tuple[Any, List[str], float]
+
+# (title, url, similarity score, [(node, labels)] of the entities the document mentions)
+DocumentMatch = Tuple[Optional[str], Optional[str], float, List[NodeRecord]]
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+def lucene_query(keywords: Iterable[str]) -> str:
+    """One Lucene query matching any keyword as a whole term or a prefix; whole terms score higher"""
+    terms = []
+    for keyword in keywords:
+        term = _LUCENE_SPECIAL.sub(r'\\\1', keyword.strip().lower())
+        if term:
+            terms.append(f"{term}^2 {term}*")
+    return ' '.join(terms)
+
+class ProjectedNode(dict):
+    """Projected node properties with the element_id attribute ContextNode.from_record expects"""
+
+    __slots__ = ('element_id',)
+
+    def __init__(self, projection: Dict[str, Any]):
+        # Map projections keep missing properties as nulls; drop them so `key in node` still works
+        super().__init__((key, value) for key, value in projection.items()
+                         if value is not None and key != 'element_id')
+        self.element_id = projection['element_id']
+
+class GraphBackend:
+    """Query shapes the smart-intent handlers and ContextRetriever need from a graph store"""
+
+    name = 'base'
+    supports_vector_search = False
+
+    def connect(self) -> bool:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def count_nodes(self) -> int:
+        raise NotImplementedError
+
+    def node_names(self) -> Iterable[str]:
+        """Name of every named node, for building lookup indexes"""
+        raise NotImplementedError
+
+    # --- ContextRetriever lookups -------------------------------------------
+
+    def find_node(self, name: str) -> Optional[NodeRecord]:
+        """Node whose name matches case-insensitively"""
+        raise NotImplementedError
+
+    def neighbours(self, name: str, limit: int = 10) -> List[NeighbourRecord]:
+        """Relationships (either direction) of the node with this name"""
+        raise NotImplementedError
+
+    def entity_neighbourhoods(self, names: List[str], limit: int = 10) -> Dict[str, Neighbourhood]:
+        """find_node and neighbours for several names at once, keyed by name; unknown names are left out"""
+        neighbourhoods = {}
+        for name in names:
+            record = self.find_node(name)
+            if record:
+                neighbourhoods[name] = (record, self.neighbours(name, limit=limit))
+        return neighbourhoods
+
+    def intent_nodes(self, intent: str) -> List[NodeRecord]:
+        """Nodes relevant to a broad intent (company_info, sustainability, product_info)"""
+        raise NotImplementedError
+
+    def text_search(self, keywords: List[str], limit: int = 9) -> List[ScoredNodeRecord]:
+        """Nodes ranked by full-text relevance to any of the keywords, best first"""
+        raise NotImplementedError
+
+    def similar_documents(self, embedding: List[float], k: int = 5, mentions: int = 5) -> List[DocumentMatch]:
+        """Documents nearest to an embedding, best first, with the Products/Topics each mentions"""
+        return []
+
+    def relationship_paths(self, start: str, end: str, max_depth: int = 3, limit: int = 3) -> List[Dict[str, Any]]:
+        """Paths between two named nodes as {'start', 'end', 'length', 'relationships'}"""
+        raise NotImplementedError
+
+    # --- Smart-intent handler lookups ---------------------------------------
+
+    def find_node_exact(self, name: str) -> Optional[NodeRecord]:
+        raise NotImplementedError
+
+    def get_nutrition(self, product: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_ingredients(self, product: str) -> List[str]:
+        raise NotImplementedError
+
+    def get_product(self, product: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_stores(self, product: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_ceo(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_companies(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_sustainability_topics(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_recipes(self, limit: int = 5) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_campaigns(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+class Neo4jGraphBackend(GraphBackend):
+    """Graph backend served by Neo4j through the shared connection"""
+
+    name = 'neo4j'
+    supports_vector_search = True
+
+    CEO_QUERIES = ['ceo:by_company', 'ceo:by_name', 'ceo:by_role']
+
+    def connect(self) -> bool:
+        return neo4j_conn.connect()
+
+    def close(self):
+        neo4j_conn.close()
+
+    def _run(self, name: str, params: Optional[Dict[str, Any]] = None) -> list:
+        return neo4j_conn.read_registered(name, params)
+
+    def count_nodes(self) -> int:
+        return self._run('count_nodes')[0]['count']
+
+    def node_names(self) -> Iterable[str]:
+        return [record['name'] for record in self._run('node_names')]
+
+    def find_node(self, name: str) -> Optional[NodeRecord]:
+        records = self._run('find_node', {'name_key': name_key(name)})
+        return (ProjectedNode(records[0]['n']), records[0]['labels']) if records else None
+
+    def neighbours(self, name: str, limit: int = 10) -> List[NeighbourRecord]:
+        records = self._run('neighbours', {'name_key': name_key(name), 'limit': limit})
+        return [(record['r'].type, record['r'], ProjectedNode(record['m']), record['target_labels']) for record in records]
+
+    def entity_neighbourhoods(self, names: List[str], limit: int = 10) -> Dict[str, Neighbourhood]:
+        names_by_key = {}
+        for name in names:
+            names_by_key.setdefault(name_key(name), name)
+        if not names_by_key:
+            return {}
+
+        records = self._run('entity_neighbourhoods', {'name_keys': list(names_by_key), 'limit': limit})
+        return {
+            names_by_key[record['name_key']]: (
+                (ProjectedNode(record['n']), record['labels']),
+                # OPTIONAL MATCH yields one all-null row for a node without relationships
+                [(rel_type, rel_properties, ProjectedNode(target), target_labels)
+                 for rel_type, rel_properties, target, target_labels in record['neighbours']
+                 if rel_type is not None]
+            )
+            for record in records
+        }
+
+    def intent_nodes(self, intent: str) -> List[NodeRecord]:
+        name = f'intent_nodes:{intent}'
+        if name not in cypher_registry:
+            return []
+        return [(ProjectedNode(record['n']), record['labels']) for record in self._run(name)]
+
+    def text_search(self, keywords: List[str], limit: int = 9) -> List[ScoredNodeRecord]:
+        query = lucene_query(keywords)
+        if not query:
+            return []
+        records = self._run('text_search', {'query': query, 'limit': limit})
+        return [(ProjectedNode(record['n']), record['labels'], record['score']) for record in records]
+
+    def similar_documents(self, embedding: List[float], k: int = 5, mentions: int = 5) -> List[DocumentMatch]:
+        records = self._run('similar_documents', {'embedding': embedding, 'k': k, 'mentions': mentions})
+        return [
+            (record['title'], record['url'], record['score'],
+             [(ProjectedNode(node), labels) for node, labels in record['mentions']])
+            for record in records
+        ]
+
+    def relationship_paths(self, start: str, end: str, max_depth: int = 3, limit: int = 3) -> List[Dict[str, Any]]:
+        depth = min(max(int(max_depth), 1), MAX_PATH_DEPTH)
+        records = self._run(f'relationship_paths:{depth}', {
+            'start_key': name_key(start),
+            'end_key': name_key(end),
+            'limit': limit
+        })
+        return [
+            {
+                'start': start,
+                'end': end,
+                'length': len(record['path'].relationships),
+                'relationships': [rel.type for rel in record['path'].relationships]
+            }
+            for record in records
+        ]
+
+    def find_node_exact(self, name: str) -> Optional[NodeRecord]:
+        records = self._run('find_node_exact', {'entity': name, 'name_key': name_key(name)})
+        return (ProjectedNode(records[0]['n']), records[0]['labels']) if records else None
+
+    def get_nutrition(self, product: str) -> Optional[Dict[str, Any]]:
+        records = self._run('product_nutrition', {'product': product})
+        return dict(records[0]['n']) if records and records[0]['n'] else None
+
+    def get_ingredients(self, product: str) -> List[str]:
+        records = self._run('product_ingredients', {'product': product})
+        return [record['ingredient'] for record in records]
+
+    def get_product(self, product: str) -> Optional[Dict[str, Any]]:
+        records = self._run('product', {'product': product})
+        return dict(records[0]['p']) if records and records[0]['p'] else None
+
+    def get_stores(self, product: str) -> List[Dict[str, Any]]:
+        records = self._run('product_stores', {'product': product})
+        return [dict(record) for record in records]
+
+    def get_ceo(self) -> Optional[Dict[str, Any]]:
+        for name in self.CEO_QUERIES:
+            records = self._run(name)
+            if records and records[0]['name']:
+                return dict(records[0])
+        return None
+
+    def get_companies(self) -> List[Dict[str, Any]]:
+        records = self._run('nestle_companies')
+        return [dict(record['c']) for record in records]
+
+    def get_sustainability_topics(self) -> List[Dict[str, Any]]:
+        records = self._run('sustainability_topics')
+        return [dict(record['t']) for record in records]
+
+    def get_recipes(self, limit: int = 5) -> List[Dict[str, Any]]:
+        records = self._run('recipes', {'limit': limit})
+        return [dict(record) for record in records]
+
+    def get_campaigns(self) -> List[Dict[str, Any]]:
+        records = self._run('campaigns')
+        return [dict(record) for record in records]
+
+def create_graph_backend(kind: Optional[str] = None) -> GraphBackend:
+    """Backend selected by GRAPH_BACKEND (neo4j | sqlite)"""
+    kind = (kind or os.getenv("GRAPH_BACKEND", "neo4j")).lower()
+    if kind == 'sqlite':
+        from .sqlite_graph_backend import SQLiteGraphBackend
+        return SQLiteGraphBackend(os.getenv("SQLITE_GRAPH_PATH", "graph/knowledge_graph.sqlite3"))
+    return Neo4jGraphBackend()
+
+# Global backend instance
+graph_backend = create_graph_backend()
+
+# None: not opened yet; False: no usable snapshot
+_snapshot_backend = None
+_snapshot_lock = threading.Lock()
+
+def snapshot_backend() -> Optional[GraphBackend]:
+    """Local SQLite snapshot to answer from while Neo4j is unreachable, if one has been imported"""
+    global _snapshot_backend
+    if graph_backend.name != 'neo4j':
+        return None
+    if _snapshot_backend is None:
+        with _snapshot_lock:
+            if _snapshot_backend is None:
+                path = os.getenv("SQLITE_GRAPH_PATH", "graph/knowledge_graph.sqlite3")
+                backend = create_graph_backend('sqlite') if os.path.exists(path) else None
+                usable = backend is not None and backend.connect() and backend.count_nodes() > 0
+                _snapshot_backend = backend if usable else False
+    return _snapshot_backend or None
@@ -0,0 +1,139 @@
+# backend/graph_change_tracker.py - Graph write notifications for derived data
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional, Iterable
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
+
+# Seconds between reads of the graph's shared version: writes made by other processes
+# reach this process's caches and filters within about this long
+GRAPH_VERSION_POLL_SECONDS = float(os.getenv("GRAPH_VERSION_POLL_SECONDS", 5))
+
+class GraphChangeTracker:
+    """Keeps a graph version and notifies listeners when the graph changes.
+
+    Our write paths call record_change with what they touched, and also bump a counter
+    stored in the graph (:GraphVersion). Once watch() is running, every process polls
+    that counter; a bump made elsewhere (another gunicorn worker, a crawl job) is replayed
+    here as a change of unknown scope, which invalidates everything derived from the graph.
+    """
+
+    def __init__(self, poll_seconds: float = GRAPH_VERSION_POLL_SECONDS):
+        self.version = 0
+        # Last value of the graph's shared counter this process has seen
+        self.shared_version: Optional[int] = None
+        self.poll_seconds = poll_seconds
+        self.remote_changes = 0
+        self._synced_at: Optional[float] = None
+        self._watching = False
+        self._sync_failing = False
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]):
+        """Register a callback that receives every change event"""
+        self._listeners.append(listener)
+
+    def record_change(self, labels: Optional[Iterable[str]] = None, names: Optional[Iterable[str]] = None,
+                      relationship_types: Optional[Iterable[str]] = None) -> int:
+        """Record a write. labels/names/relationship_types of None mean that part of the scope is unknown."""
+        version = self._notify(labels, names, relationship_types)
+        self._publish()
+        return version
+
+    @property
+    def is_synced(self) -> bool:
+        """Whether version reflects other processes' writes, to within about one poll interval.
+
+        Always true when not watching (nothing else writes to this graph); otherwise false
+        until the first poll and whenever polling has failed for two intervals in a row.
+        """
+        if not self._watching:
+            return True
+        synced_at = self._synced_at
+        return synced_at is not None and time.monotonic() - synced_at < 2 * self.poll_seconds
+
+    def watch(self):
+        """Follow the shared version in the background; call once the graph is reachable"""
+        with self._lock:
+            if self._watching:
+                return
+            self._watching = True
+        self.sync()
+        threading.Thread(target=self._watch_loop, daemon=True, name='graph-version').start()
+
+    def sync(self) -> bool:
+        """Read the shared version now; returns whether the read succeeded"""
+        try:
+            records = neo4j_conn.read(cypher_registry['graph_version'])
+        except Exception as e:
+            if not self._sync_failing:
+                print(f"⚠️ Could not read the shared graph version: {e}")
+            self._sync_failing = True
+            return False
+
+        self._sync_failing = False
+        self._advance(records[0]['version'] if records else 0, own=False)
+        self._synced_at = time.monotonic()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'shared_version': self.shared_version,
+            'remote_changes': self.remote_changes,
+            'synced': self.is_synced,
+            'poll_seconds': self.poll_seconds
+        }
+
+    def _watch_loop(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            self.sync()
+
+    def _publish(self):
+        """Bump the shared counter so other processes see this write"""
+        try:
+            records = neo4j_conn.write(cypher_registry['bump_graph_version'])
+        except Exception as e:
+            print(f"⚠️ Could not publish graph change to other workers: {e}")
+            return
+        self._advance(records[0]['version'], own=True)
+
+    def _advance(self, shared: int, own: bool):
+        """Move to a newer shared version; bumps we did not make become unknown-scope changes"""
+        with self._lock:
+            previous = self.shared_version
+            if previous is not None and shared <= previous:
+                return
+            self.shared_version = shared
+            # Our own bump accounts for exactly one step
+            remote = previous is not None and shared - previous > (1 if own else 0)
+            if remote:
+                self.remote_changes += 1
+        if remote:
+            self._notify(None, None, None)
+
+    def _notify(self, labels, names, relationship_types) -> int:
+        with self._lock:
+            self.version += 1
+            change = {
+                'version': self.version,
+                'labels': set(labels) if labels is not None else None,
+                'names': set(names) if names is not None else None,
+                'relationship_types': set(relationship_types) if relationship_types is not None else None
+            }
+
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"⚠️ Graph change listener failed: {e}")
+
+        return change['version']
+
+# Global tracker instance
+graph_changes = GraphChangeTracker()
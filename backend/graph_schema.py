@@ -41,6 +41,7 @@
 
 # schema_manager = GraphSchema()
 from .neo4j_connection import neo4j_conn
+from .schema_migrations import schema_migrator
 
 class GraphSchema:
     def __init__(self):
@@ -55,18 +56,18 @@ class GraphSchema:
         print("🏗️ Setting up Neo4j schema...")
         
         try:
-            with neo4j_conn.get_session() as session:
-                for constraint in self.constraints_and_indexes:
-                    try:
-                        session.run(constraint)
-                        print(f"✅ Applied: {constraint[:50]}...")
-                    except Exception as e:
-                        if "already exists" in str(e).lower():
-                            print(f"⚠️ Already exists: {constraint[:50]}...")
-                        else:
-                            print(f"❌ Failed: {constraint[:50]}... Error: {e}")
+            for constraint in self.constraints_and_indexes:
+                try:
+                    neo4j_conn.write(constraint)
+                    print(f"✅ Applied: {constraint[:50]}...")
+                except Exception as e:
+                    if "already exists" in str(e).lower():
+                        print(f"⚠️ Already exists: {constraint[:50]}...")
+                    else:
+                        print(f"❌ Failed: {constraint[:50]}... Error: {e}")
             
-            print("✅ Schema setup complete")
+            applied = schema_migrator.migrate()
+            print(f"✅ Schema setup complete ({len(applied)} migrations applied)")
         except Exception as e:
             print(f"❌ Schema setup failed: {e}")
 
@@ -0,0 +1,88 @@
+# backend/graph_stats.py - Node and relationship counts from the count store, kept current by our writes
+
+import hashlib
+import json
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry, NODE_LABELS, RELATIONSHIP_TYPES
+from .graph_change_tracker import graph_changes
+
+class GraphStats:
+    """Counts per label and per relationship type, served from a cache.
+
+    Every count is a constant-time count-store read, so a refresh is O(#labels) no matter how
+    large the graph is. Writes through our own paths mark only the labels and relationship
+    types they touched as stale, and only those are re-read on the next request. Writes by
+    other workers arrive with unknown scope and mark every count stale, so the ETag moves too.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, int] = {}
+        self.relationships: Dict[str, int] = {}
+        self.etag: Optional[str] = None
+        self._stale_labels = set(NODE_LABELS)
+        self._stale_types = set(RELATIONSHIP_TYPES)
+        # _lock serializes refreshes; _stale_lock only guards the stale sets, so writers
+        # recording a change never wait on a refresh in flight
+        self._lock = threading.Lock()
+        self._stale_lock = threading.Lock()
+        graph_changes.subscribe(self._on_graph_change)
+
+    def get(self) -> Dict[str, Any]:
+        """Current counts as {'nodes', 'relationships', 'total_nodes', 'total_relationships'}, largest first"""
+        with self._lock:
+            with self._stale_lock:
+                labels, types = self._stale_labels, self._stale_types
+                self._stale_labels, self._stale_types = set(), set()
+            if labels or types:
+                self._refresh(labels, types)
+            return {
+                'nodes': dict(sorted(self.nodes.items(), key=lambda item: -item[1])),
+                'relationships': dict(sorted(self.relationships.items(), key=lambda item: -item[1])),
+                'total_nodes': sum(self.nodes.values()),
+                'total_relationships': sum(self.relationships.values())
+            }
+
+    def _refresh(self, labels: set, types: set):
+        try:
+            self._read_counts(self.nodes, labels, 'label_counts', 'label_count', 'label')
+            self._read_counts(self.relationships, types, 'relationship_type_counts', 'relationship_type_count',
+                              'relationship_type')
+        except Exception:
+            # Re-read everything we did not get to next time
+            with self._stale_lock:
+                self._stale_labels |= labels
+                self._stale_types |= types
+            raise
+
+        payload = json.dumps([self.nodes, self.relationships], sort_keys=True).encode()
+        self.etag = '"' + hashlib.sha1(payload).hexdigest()[:16] + '"'
+
+    def _read_counts(self, counts: Dict[str, int], keys: Iterable[str], all_query: str, one_query: str, field: str):
+        keys = set(keys)
+        if not keys:
+            return
+        # One key: a single count-store read. Several: one round trip for all of them.
+        if len(keys) == 1:
+            key = next(iter(keys))
+            records = neo4j_conn.read(cypher_registry[f'{one_query}:{key}'])
+        else:
+            records = [record for record in neo4j_conn.read(cypher_registry[all_query]) if record[field] in keys]
+
+        for record in records:
+            if record['count']:
+                counts[record[field]] = record['count']
+            else:
+                counts.pop(record[field], None)
+
+    def _on_graph_change(self, change: Dict[str, Any]):
+        labels = change.get('labels')
+        types = change.get('relationship_types')
+        with self._stale_lock:
+            self._stale_labels |= set(NODE_LABELS) if labels is None else set(labels) & set(NODE_LABELS)
+            self._stale_types |= set(RELATIONSHIP_TYPES) if types is None else set(types) & set(RELATIONSHIP_TYPES)
+
+# Global stats service
+graph_stats = GraphStats()
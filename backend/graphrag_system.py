@@ -5,7 +5,12 @@ from datetime import datetime
 import asyncio
 
 from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
 from .graph_schema import schema_manager
+from .csr_graph_engine import graph_engine
+from .fact_card_store import fact_card_store
+from .lookup_filter import lookup_filter
+from .graph_stats import graph_stats
 from .intent_analyzer import IntentAnalyzer
 from .context_retriever import ContextRetriever
 from .ai_response_generator import AIResponseGenerator
@@ -38,6 +43,15 @@ class GraphRAGSystem:
             # Check if data exists, if not, initialize it
             await self._ensure_data_exists()
             
+            # Snapshot the graph into the in-process traversal engine
+            graph_engine.load_from_neo4j()
+            
+            # Materialize per-entity fact cards
+            fact_card_store.build_all()
+            
+            # Index node names for the negative lookup cache (app.py builds its own at startup)
+            lookup_filter.build()
+            
             # Initialize components
             self.intent_analyzer = IntentAnalyzer()
             self.context_retriever = ContextRetriever()
@@ -55,18 +69,17 @@ class GraphRAGSystem:
     async def _ensure_data_exists(self):
         """Ensure Neo4j has data, enhance if needed"""
         try:
-            with neo4j_conn.get_session() as session:
-                result = session.run("MATCH (n) RETURN count(n) as count")
-                count = result.single()['count']
-                
-                if count == 0:
-                    print("📊 No data found in Neo4j, initializing...")
-                    data_initializer.initialize_data()
-                elif count < 10:
-                    print(f"📊 Found {count} nodes, enhancing with core entities...")
-                    data_initializer.initialize_data()  # Will preserve existing data
-                else:
-                    print(f"✅ Found {count} nodes in Neo4j - using existing data")
+            result = neo4j_conn.read(cypher_registry['count_nodes'])
+            count = result[0]['count']
+            
+            if count == 0:
+                print("📊 No data found in Neo4j, initializing...")
+                data_initializer.initialize_data()
+            elif count < 10:
+                print(f"📊 Found {count} nodes, enhancing with core entities...")
+                data_initializer.initialize_data()  # Will preserve existing data
+            else:
+                print(f"✅ Found {count} nodes in Neo4j - using existing data")
         except Exception as e:
             print(f"⚠️ Error checking data: {e}")
     
@@ -139,48 +152,13 @@ class GraphRAGSystem:
             return {"error": "GraphRAG system not initialized"}
         
         try:
-            with neo4j_conn.get_session() as session:
-                # Get node counts by type
-                node_query = """
-                MATCH (n)
-                UNWIND labels(n) as label
-                WITH label, count(*) as count
-                RETURN label, count
-                ORDER BY count DESC
-                """
-                
-                node_results = session.run(node_query)
-                nodes = {}
-                total_nodes = 0
-                
-                for record in node_results:
-                    nodes[record['label']] = record['count']
-                    total_nodes += record['count']
-                
-                # Get relationship counts
-                rel_query = """
-                MATCH ()-[r]->()
-                RETURN type(r) as relationship_type, count(r) as count
-                ORDER BY count DESC
-                """
-                
-                rel_results = session.run(rel_query)
-                relationships = {}
-                total_relationships = 0
-                
-                for record in rel_results:
-                    relationships[record['relationship_type']] = record['count']
-                    total_relationships += record['count']
-                
-                return {
-                    'nodes': nodes,
-                    'relationships': relationships,
-                    'total_nodes': total_nodes,
-                    'total_relationships': total_relationships,
-                    'system_status': 'operational',
-                    'initialized': self.is_initialized
-                }
-                
+            # Counts per label and relationship type, cached and kept current by our writes
+            return {
+                **graph_stats.get(),
+                'system_status': 'operational',
+                'initialized': self.is_initialized
+            }
+            
         except Exception as e:
             return {
                 'error': f"Failed to get graph stats: {str(e)}",
@@ -0,0 +1,116 @@
+# backend/heavy_hitters.py - Streaming heavy-hitter tracking with a count-min sketch
+
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+def normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question, used as a tracking and cache key"""
+    return ' '.join(question.lower().split()).rstrip('?!. ')
+
+class HeavyHitters:
+    """Approximate per-key counts in bounded memory plus the current top-k keys.
+
+    record() only appends to a buffer, so the request path pays for a list append. The
+    buffer is folded into the sketch in vectorized batches. Counts are halved every
+    half_life seconds, so the ranking follows recent traffic.
+    """
+
+    def __init__(self, width: int = 4096, depth: int = 4, top_k: int = 50,
+                 half_life: float = 3600.0, batch_size: int = 1024):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.half_life = half_life
+        self.batch_size = batch_size
+        self._counts = np.zeros((depth, width), dtype=np.float32)
+        self._rows = np.arange(depth, dtype=np.uint64)[:, None]
+        self._row_offsets = np.arange(depth, dtype=np.intp)[:, None] * width
+        self._buffer: List[str] = []
+        self._top: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_decay = time.monotonic()
+        self.total = 0.0
+
+    def record(self, key: str):
+        """Count one occurrence of key"""
+        buffer = self._buffer
+        buffer.append(key)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Fold buffered keys into the sketch and the top-k candidates"""
+        with self._lock:
+            keys, self._buffer = self._buffer, []
+            if keys:
+                self._add(keys)
+            if time.monotonic() - self._last_decay >= self.half_life:
+                self._decay()
+
+    def estimate(self, key: str) -> float:
+        """Estimated (decayed) count of key; never an underestimate of its decayed count"""
+        if self._buffer:
+            self.flush()
+        return float(self._counts[np.arange(self.depth), self._positions([key])[:, 0]].min())
+
+    def top(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Heaviest keys first"""
+        if self._buffer:
+            self.flush()
+        with self._lock:
+            items = heapq.nlargest(n or self.top_k, self._top.items(), key=lambda item: item[1])
+        return [{'key': key, 'count': round(count, 2)} for key, count in items]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'total': round(self.total + len(self._buffer), 2),
+            'width': self.width,
+            'depth': self.depth,
+            'memory_bytes': int(self._counts.nbytes),
+            'half_life_seconds': self.half_life
+        }
+
+    def _positions(self, keys: List[str]) -> np.ndarray:
+        """(depth, len(keys)) column per key, by double hashing one 64-bit hash"""
+        hashes = np.fromiter(map(hash, keys), dtype=np.int64, count=len(keys)).view(np.uint64)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        return ((h1[None, :] + self._rows * h2[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def _add(self, keys: List[str]):
+        # Deduplicate first; the sketch is updated with per-key batch counts
+        counter = Counter(keys)
+        unique = list(counter)
+        batch_counts = np.fromiter(counter.values(), dtype=np.float64, count=len(unique))
+        positions = self._positions(unique)
+        flat = (positions + self._row_offsets).ravel()
+        self._counts.ravel()[:] += np.bincount(
+            flat, weights=np.tile(batch_counts, self.depth), minlength=self._counts.size
+        ).astype(np.float32)
+        self.total += len(keys)
+
+        # Refresh top-k candidates, only for keys that can enter the current top-k
+        estimates = self._counts[np.arange(self.depth)[:, None], positions].min(axis=0)
+        top = self._top
+        threshold = min(top.values()) if len(top) >= self.top_k else 0.0
+        for index in np.flatnonzero(estimates >= threshold).tolist():
+            top[unique[index]] = float(estimates[index])
+        if len(top) > 2 * self.top_k:
+            self._top = dict(heapq.nlargest(self.top_k, top.items(), key=lambda item: item[1]))
+
+    def _decay(self):
+        elapsed = time.monotonic() - self._last_decay
+        factor = 0.5 ** (elapsed / self.half_life)
+        self._counts *= factor
+        self._top = {key: count * factor for key, count in self._top.items()}
+        self.total *= factor
+        self._last_decay = time.monotonic()
+
+# Global trackers: normalized questions and (intent, entity) pairs
+question_hitters = HeavyHitters()
+intent_hitters = HeavyHitters(width=1024)
@@ -0,0 +1,418 @@
+# backend/ingestion_pipeline.py - Staged site crawl into the graph: fetch → parse → extract → embed → write
+
+import asyncio
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from .content_processor import processor, MAX_DOCUMENT_BATCH
+from .query_log import default_path as query_log_default_path
+
+logger = logging.getLogger(__name__)
+
+INGEST_START_URLS = os.getenv("INGEST_START_URLS", "https://www.madewithnestle.ca").split(',')
+INGEST_MAX_PAGES = int(os.getenv("INGEST_MAX_PAGES", 5000))
+# Concurrent page downloads, parser processes and embedding processes
+INGEST_FETCH_CONCURRENCY = int(os.getenv("INGEST_FETCH_CONCURRENCY", 16))
+INGEST_PARSE_WORKERS = int(os.getenv("INGEST_PARSE_WORKERS", os.cpu_count() or 2))
+INGEST_EMBED_WORKERS = int(os.getenv("INGEST_EMBED_WORKERS", 1))
+# Items a queue between two stages holds before the stage feeding it waits
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 64))
+# Politeness per crawled host: requests in flight, and minimum seconds between request starts
+INGEST_HOST_CONCURRENCY = int(os.getenv("INGEST_HOST_CONCURRENCY", 4))
+INGEST_HOST_DELAY_SECONDS = float(os.getenv("INGEST_HOST_DELAY_SECONDS", 0.25))
+# Where a run's stats are written for /metrics (the crawl runs in its own process);
+# beside the query log by default, so it survives deploys on Azure App Service
+INGEST_STATS_PATH = os.getenv("INGEST_STATS_PATH") or os.path.join(
+    os.path.dirname(query_log_default_path()), 'ingestion_stats.json'
+)
+
+# Documents embedded per model call
+EMBED_BATCH_SIZE = 32
+FETCH_TIMEOUT = 15
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+# Links to assets, not pages
+_SKIPPED_PATHS = re.compile(r'\.(jpe?g|png|gif|svg|webp|ico|pdf|zip|mp4|mp3|css|js|xml|json)$', re.IGNORECASE)
+
+# Most recent failures kept in stats()
+RECENT_ERRORS = 20
+
+class HostLimiter:
+    """Caps the requests in flight to each host and spaces out their start times"""
+
+    def __init__(self, concurrency: int = INGEST_HOST_CONCURRENCY, delay: float = INGEST_HOST_DELAY_SECONDS):
+        self.concurrency = max(1, concurrency)
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            if self.delay > 0:
+                async with self._locks.setdefault(host, asyncio.Lock()):
+                    wait = self._next_start.get(host, 0.0) - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._next_start[host] = time.monotonic() + self.delay
+            yield
+
+class StageMetrics:
+    """Throughput and lag of one stage; queued is the backlog waiting for it"""
+
+    def __init__(self, workers: int, queue: Optional[asyncio.Queue]):
+        self.workers = workers
+        self.queue = queue
+        self.processed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.busy_seconds = 0.0
+        self.started = time.monotonic()
+
+    @contextmanager
+    def track(self, items: int = 1):
+        self.in_flight += items
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.failed += items
+            raise
+        else:
+            self.processed += items
+        finally:
+            self.in_flight -= items
+            self.busy_seconds += time.perf_counter() - started
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        done = self.processed + self.failed
+        return {
+            'workers': self.workers,
+            'queued': self.queue.qsize() if self.queue is not None else 0,
+            'in_flight': self.in_flight,
+            'processed': self.processed,
+            'failed': self.failed,
+            'per_second': round(self.processed / elapsed, 2) if elapsed else 0.0,
+            'avg_ms': round(self.busy_seconds / done * 1000, 2) if done else None
+        }
+
+class IngestionPipeline:
+    """Crawls a site into the graph through concurrent stages joined by bounded queues.
+
+    fetch (threads) → parse (processes) → extract (processes) → embed (processes) → write (batched)
+
+    A slow stage fills the queue in front of it and stalls the stages before it, so page
+    bodies never pile up in memory; only URLs are held outside the queues. Pages are
+    written with ContentToGraphProcessor.write_document_rows, whose tuned batch size
+    decides how many documents go into each transaction.
+    """
+
+    def __init__(self, start_urls: Optional[List[str]] = None, max_pages: int = INGEST_MAX_PAGES,
+                 fetch_concurrency: int = INGEST_FETCH_CONCURRENCY, parse_workers: int = INGEST_PARSE_WORKERS,
+                 embed_workers: int = INGEST_EMBED_WORKERS, queue_size: int = INGEST_QUEUE_SIZE,
+                 host_limiter: Optional[HostLimiter] = None):
+        self.start_urls = [url.strip() for url in (start_urls or INGEST_START_URLS) if url.strip()]
+        self.domains = {urlparse(url).netloc for url in self.start_urls}
+        self.max_pages = max_pages
+        self.fetch_concurrency = fetch_concurrency
+        self.parse_workers = parse_workers
+        self.embed_workers = embed_workers
+        self.queue_size = queue_size
+        self.host_limiter = host_limiter or HostLimiter()
+        self.stages: Dict[str, StageMetrics] = {}
+        self.errors: deque = deque(maxlen=RECENT_ERRORS)
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._seen = set()
+        self._outstanding = 0
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and self.finished_at is None
+
+    async def run(self) -> Dict[str, Any]:
+        """Crawl until every reachable page (up to max_pages) is written; returns stats()"""
+        self.started_at = time.time()
+        # URLs only, so it is unbounded: parse workers must never wait on fetch workers
+        self._frontier: asyncio.Queue = asyncio.Queue()
+        self._crawled = asyncio.Event()
+        pages, documents, rows = (asyncio.Queue(maxsize=self.queue_size) for _ in range(3))
+        # Holds up to the largest write batch, so writes can batch up while the database is slow
+        embedded = asyncio.Queue(maxsize=max(self.queue_size, MAX_DOCUMENT_BATCH))
+
+        self.stages = {
+            'fetch': StageMetrics(self.fetch_concurrency, self._frontier),
+            'parse': StageMetrics(self.parse_workers, pages),
+            'extract': StageMetrics(self.parse_workers, documents),
+            'embed': StageMetrics(self.embed_workers, rows),
+            'write': StageMetrics(1, embedded)
+        }
+
+        for url in self.start_urls:
+            self._enqueue(url)
+        if not self._outstanding:
+            self._crawled.set()
+
+        # Spawned rather than forked, so children do not inherit the driver's connections and threads
+        context = multiprocessing.get_context('spawn')
+        fetch_pool = ThreadPoolExecutor(self.fetch_concurrency, thread_name_prefix='ingest-fetch')
+        parse_pool = ProcessPoolExecutor(self.parse_workers, mp_context=context)
+        embed_pool = ProcessPoolExecutor(self.embed_workers, mp_context=context) if _embeddings_installed() else None
+
+        workers = (
+            [self._fetch_worker(fetch_pool, pages) for _ in range(self.fetch_concurrency)]
+            + [self._parse_worker(parse_pool, pages, documents) for _ in range(self.parse_workers)]
+            # Entity extraction is CPU-bound too, so it shares the parser processes
+            + [self._extract_worker(parse_pool, documents, rows) for _ in range(self.parse_workers)]
+            + [self._embed_worker(embed_pool, rows, embedded) for _ in range(self.embed_workers)]
+            # One writer: concurrent batches would contend for locks on shared Keyword nodes
+            + [self._write_worker(embedded)]
+        )
+        tasks = [asyncio.create_task(worker) for worker in workers]
+
+        try:
+            # Every discovered page has been parsed; then drain the later stages in order
+            await self._crawled.wait()
+            for queue in (documents, rows, embedded):
+                await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+            if embed_pool is not None:
+                embed_pool.shutdown(wait=False, cancel_futures=True)
+            self.finished_at = time.time()
+
+        return self.stats()
+
+    def _enqueue(self, url: str):
+        url = urldefrag(url)[0]
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc not in self.domains:
+            return
+        if _SKIPPED_PATHS.search(parsed.path) or url in self._seen or len(self._seen) >= self.max_pages:
+            return
+        self._seen.add(url)
+        self._outstanding += 1
+        self._frontier.put_nowait(url)
+
+    def _page_done(self):
+        self._outstanding -= 1
+        if not self._outstanding:
+            self._crawled.set()
+
+    async def _fetch_worker(self, pool: ThreadPoolExecutor, pages: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            url = await self._frontier.get()
+            html = None
+            try:
+                async with self.host_limiter.slot(urlparse(url).netloc):
+                    with self.stages['fetch'].track():
+                        html = await loop.run_in_executor(pool, _fetch_page, url)
+            except Exception as e:
+                self._record_error('fetch', url, e)
+            finally:
+                self._frontier.task_done()
+
+            if html is None:
+                self._page_done()
+            else:
+                await pages.put((url, html))
+
+    async def _parse_worker(self, pool: ProcessPoolExecutor, pages: asyncio.Queue, documents: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            url, html = await pages.get()
+            try:
+                with self.stages['parse'].track():
+                    title, text, links = await loop.run_in_executor(pool, _parse_page, url, html)
+                for link in links:
+                    self._enqueue(link)
+                if text:
+                    await documents.put({'url': url, 'title': title, 'content': text})
+            except Exception as e:
+                self._record_error('parse', url, e)
+            finally:
+                pages.task_done()
+                self._page_done()
+
+    async def _extract_worker(self, pool: ProcessPoolExecutor, documents: asyncio.Queue, rows: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            document = await documents.get()
+            try:
+                with self.stages['extract'].track():
+                    row = await loop.run_in_executor(pool, _document_row, document)
+                await rows.put(row)
+            except Exception as e:
+                self._record_error('extract', document['url'], e)
+            finally:
+                documents.task_done()
+
+    async def _embed_worker(self, pool: Optional[ProcessPoolExecutor], rows: asyncio.Queue, embedded: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await _take_batch(rows, EMBED_BATCH_SIZE)
+            try:
+                with self.stages['embed'].track(len(batch)):
+                    embeddings = None
+                    if pool is not None:
+                        embeddings = await loop.run_in_executor(pool, _embed_texts, [row['content'][:500] for row in batch])
+                if embeddings:
+                    for row, embedding in zip(batch, embeddings):
+                        row['embedding'] = embedding
+            except Exception as e:
+                # Still write the documents, just without embeddings
+                self._record_error('embed', f"batch of {len(batch)}", e)
+            finally:
+                for _ in batch:
+                    rows.task_done()
+
+            for row in batch:
+                await embedded.put(row)
+
+    async def _write_worker(self, embedded: asyncio.Queue):
+        while True:
+            batch = await _take_batch(embedded, processor.batch_size)
+            try:
+                # Writes are not timed by the Neo4j circuit breaker, so a long batch does not open it
+                with self.stages['write'].track(len(batch)):
+                    await asyncio.to_thread(processor.write_document_rows, batch)
+            except Exception as e:
+                self._record_error('write', f"batch of {len(batch)}", e)
+            finally:
+                for _ in batch:
+                    embedded.task_done()
+
+    def _record_error(self, stage: str, item: str, error: Exception):
+        logger.warning("%s failed for %s: %s", stage, item, error)
+        self.errors.append({'stage': stage, 'item': item, 'error': str(error), 'at': round(time.time())})
+
+    def stats(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            'running': self.running,
+            'start_urls': self.start_urls,
+            'pages_discovered': len(self._seen),
+            'max_pages': self.max_pages,
+            'elapsed_seconds': round(end - self.started_at, 1) if self.started_at else None,
+            'stages': {name: stage.snapshot() for name, stage in self.stages.items()},
+            'recent_errors': list(self.errors)
+        }
+
+    def write_stats(self, path: str = INGEST_STATS_PATH) -> Dict[str, Any]:
+        """Save stats() where read_stats (and so /metrics) finds them; returns them"""
+        stats = {**self.stats(), 'updated_at': round(time.time())}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Replaced in one step, so a reader never sees a half-written file
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        os.replace(partial, path)
+        return stats
+
+def read_stats(path: str = INGEST_STATS_PATH) -> Optional[Dict[str, Any]]:
+    """Stats of the latest (or running) crawl, or None if none has been recorded"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+async def _take_batch(queue: asyncio.Queue, size: int) -> List[Any]:
+    """Wait for one item, then take whatever else is already queued, up to size"""
+    batch = [await queue.get()]
+    while len(batch) < size and not queue.empty():
+        batch.append(queue.get_nowait())
+    return batch
+
+def _embeddings_installed() -> bool:
+    return importlib.util.find_spec('sentence_transformers') is not None
+
+# --- Worker functions (run in pool threads and processes) ---------------------
+
+_http = threading.local()
+
+def _fetch_page(url: str) -> Optional[str]:
+    """HTML of a page, or None for non-HTML responses; one pooled session per thread.
+
+    Error statuses raise, so they are counted and logged as fetch failures.
+    """
+    session = getattr(_http, 'session', None)
+    if session is None:
+        session = _http.session = requests.Session()
+        session.headers.update(HEADERS)
+    response = session.get(url, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+        return None
+    return response.text
+
+def _parse_page(url: str, html: str) -> Tuple[str, str, List[str]]:
+    """(title, visible text, absolute link URLs) of a page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(['script', 'style', 'noscript', 'template']):
+        element.decompose()
+    title = soup.title.get_text(strip=True) if soup.title else ''
+    links = [urljoin(url, anchor['href']) for anchor in soup.find_all('a', href=True)]
+    text = ' '.join(soup.get_text(' ').split())
+    return title or url, text, links
+
+def _document_row(document: Dict[str, Any]) -> Dict[str, Any]:
+    return processor.document_row(document)
+
+def _embed_texts(texts: List[str]) -> Optional[List[List[float]]]:
+    # Each embedding process loads the model once, on its first batch
+    from .embeddings import embedder
+    return embedder.encode_many(texts)
+
+if __name__ == "__main__":
+    # Site-wide crawl: python -m backend.ingestion_pipeline [start_url ...]
+    from .neo4j_connection import neo4j_conn
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if not neo4j_conn.connect():
+        sys.exit(2)
+    pipeline = IngestionPipeline(start_urls=sys.argv[1:] or None)
+
+    async def crawl():
+        task = asyncio.create_task(pipeline.run())
+        while not task.done():
+            await asyncio.wait([task], timeout=5)
+            stats = pipeline.write_stats()
+            print(f"⏱️ {stats['elapsed_seconds']}s, {stats['pages_discovered']} pages discovered: " + ', '.join(
+                f"{name} {stage['processed']} done / {stage['queued']} queued"
+                for name, stage in stats['stages'].items()
+            ))
+        return task.result()
+
+    result = asyncio.run(crawl())
+    pipeline.write_stats()
+    print(f"✅ Crawl finished: {result['stages']['write']['processed']} documents written "
+          f"in {result['elapsed_seconds']}s")
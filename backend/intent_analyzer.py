@@ -2,7 +2,8 @@
 
 import re
 from typing import Dict, List, Any
-from .neo4j_connection import neo4j_conn
+from .graph_backend import graph_backend
+from .lookup_filter import lookup_filter
 
 class IntentAnalyzer:
     """Analyzes user queries to determine intent and extract entities"""
@@ -160,7 +161,7 @@ class IntentAnalyzer:
         return list(set(found_entities))  # Remove duplicates
     
     async def _get_graph_entities(self, entities: List[str]) -> List[Dict[str, Any]]:
-        """Get additional information about entities from Neo4j"""
+        """Get additional information about entities from the graph"""
         
         if not entities:
             return []
@@ -168,35 +169,26 @@ class IntentAnalyzer:
         graph_entities = []
         
         try:
-            with neo4j_conn.get_session() as session:
-                for entity in entities:
-                    # Search for entity in graph
-                    query = """
-                    MATCH (n)
-                    WHERE toLower(n.name) = toLower($entity_name)
-                    RETURN n, labels(n) as labels
-                    LIMIT 1
-                    """
+            for entity in entities:
+                # Search for entity in graph, unless no node can have this name
+                record = graph_backend.find_node(entity) if lookup_filter.might_have_name(entity) else None
+                
+                if record:
+                    node_data = dict(record[0])
+                    node_labels = record[1]
                     
-                    result = session.run(query, {'entity_name': entity})
-                    record = result.single()
-                    
-                    if record:
-                        node_data = dict(record['n'])
-                        node_labels = record['labels']
-                        
-                        graph_entities.append({
-                            'name': entity,
-                            'type': node_labels[0] if node_labels else 'Unknown',
-                            'properties': node_data,
-                            'found_in_graph': True
-                        })
-                    else:
-                        graph_entities.append({
-                            'name': entity,
-                            'type': 'Unknown',
-                            'found_in_graph': False
-                        })
+                    graph_entities.append({
+                        'name': entity,
+                        'type': node_labels[0] if node_labels else 'Unknown',
+                        'properties': node_data,
+                        'found_in_graph': True
+                    })
+                else:
+                    graph_entities.append({
+                        'name': entity,
+                        'type': 'Unknown',
+                        'found_in_graph': False
+                    })
         
         except Exception as e:
             print(f"Error getting graph entities: {e}")
@@ -0,0 +1,136 @@
+# backend/lookup_filter.py - Bloom-filter negative cache for graph lookups
+
+import math
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from .graph_backend import graph_backend
+from .schema_migrations import name_key
+from .graph_change_tracker import graph_changes
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, false positives at roughly error_rate"""
+
+    def __init__(self, items: Iterable[str], error_rate: float = 0.01):
+        items = list(items)
+        count = max(len(items), 1)
+        self.size = max(64, int(-count * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / count * math.log(2)))
+        self.item_count = len(items)
+
+        # Kirsch-Mitzenmacher double hashing from one 64-bit hash per item
+        hashes = np.fromiter((hash(item) & _MASK64 for item in items), dtype=np.uint64, count=len(items))
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        rounds = np.arange(self.hash_count, dtype=np.uint64)
+        positions = (h1[:, None] + rounds[None, :] * h2[:, None]) % np.uint64(self.size)
+
+        bits = np.zeros(self.size, dtype=bool)
+        bits[positions.ravel()] = True
+        self._bits = np.packbits(bits, bitorder='little').tobytes()
+
+    def __contains__(self, item: str) -> bool:
+        value = hash(item) & _MASK64
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        bits = self._bits
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % self.size
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+class GraphLookupFilter:
+    """Answers "can this lookup possibly match?" so guaranteed misses never reach the graph.
+
+    Names are indexed whole, since entity lookups are case-insensitive equality. Keyword
+    search is served by the full-text index, where a miss is already a cheap term lookup.
+    """
+
+    def __init__(self, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self._names: Optional[BloomFilter] = None
+        self._built_version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._pending = False
+        self.checked = 0
+        self.skipped = 0
+        graph_changes.subscribe(self._on_graph_change)
+
+    @property
+    def is_current(self) -> bool:
+        """Filters are only trusted while no write has happened since they were built.
+
+        Writes by other workers arrive through the shared graph version, so the filter is
+        also distrusted whenever that version cannot be confirmed as up to date.
+        """
+        return (self._built_version is not None and self._built_version == graph_changes.version
+                and graph_changes.is_synced)
+
+    def build(self) -> bool:
+        """Index every node name from the active graph backend"""
+        version = graph_changes.version
+        try:
+            names = {name_key(name) for name in graph_backend.node_names() if name}
+
+            self._names = BloomFilter(names, self.error_rate)
+            self._built_version = version
+            print(f"✅ Built lookup filter: {len(names)} names ({self._names.nbytes / 1024:.0f} KiB)")
+            return True
+        except Exception as e:
+            print(f"⚠️ Lookup filter build failed: {e}")
+            return False
+
+    def might_have_name(self, name: str) -> bool:
+        """False only when no node can have this name (compared by name_key, like the lookups)"""
+        if not name or not self.is_current:
+            return True
+        self.checked += 1
+        if name_key(name) in self._names:
+            return True
+        self.skipped += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'current': self.is_current,
+            'checked': self.checked,
+            'skipped': self.skipped,
+            'names': self._names.item_count if self._names else 0
+        }
+
+    def _on_graph_change(self, change: Dict[str, Any]):
+        """Rebuild in the background; until then every lookup goes to the graph"""
+        if self._built_version is None:
+            return
+
+        with self._lock:
+            if self._rebuilding:
+                # Coalesce bursts of writes into one more rebuild
+                self._pending = True
+                return
+            self._rebuilding = True
+
+        threading.Thread(target=self._rebuild_loop, daemon=True).start()
+
+    def _rebuild_loop(self):
+        while True:
+            with self._lock:
+                self._pending = False
+            self.build()
+            with self._lock:
+                if not self._pending:
+                    self._rebuilding = False
+                    return
+
+# Global lookup filter
+lookup_filter = GraphLookupFilter()
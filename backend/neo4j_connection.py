@@ -43,12 +43,40 @@
 
 # # Global connection instance
 # neo4j_conn = Neo4jConnection()
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, unit_of_work
+from neo4j.exceptions import ClientError
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from dotenv import load_dotenv
 
+from .circuit_breaker import neo4j_breaker, CircuitOpenError
+
 load_dotenv()
 
+# ClientErrors that mean Neo4j could not finish the work in time, not that the statement
+# was wrong: transaction timeouts (including the ones _run sets from observed latency),
+# and the transient Terminated / LockClientStopped errors, which the driver reclassifies
+# as client errors
+_SERVER_FAILURE_CODES = {
+    'Neo.ClientError.Transaction.TransactionTimedOut',
+    'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration',
+    'Neo.ClientError.Transaction.Terminated',
+    'Neo.ClientError.Transaction.LockClientStopped'
+}
+
+def _counts_against_neo4j(error: ClientError) -> bool:
+    code = error.code or ''
+    return code in _SERVER_FAILURE_CODES or code.startswith('Neo.TransientError.')
+
+# Estimated sizes of the results returned to the request being measured (see measure_payload).
+# Worker threads started with asyncio.to_thread inherit it, so concurrent retrieval counts too.
+_request_payload: ContextVar = ContextVar('neo4j_request_payload', default=None)
+
 class Neo4jConnection:
     def __init__(self):
         #self.uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -56,36 +84,334 @@ class Neo4jConnection:
         self.user = os.getenv("NEO4J_USER", "neo4j")
         self.password = os.getenv("NEO4J_PASSWORD")
         self.database = os.getenv("NEO4J_DATABASE", "neo4j")
+        
+        # Pool settings; connections are recycled well before Aura drops long-lived ones
+        self.max_pool_size = int(os.getenv("NEO4J_MAX_POOL_SIZE", 50))
+        self.acquisition_timeout = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", 30))
+        self.max_connection_lifetime = int(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", 1800))
+        self.liveness_interval = float(os.getenv("NEO4J_LIVENESS_INTERVAL", 60))
+        # Managed transactions retry transient failures with exponential backoff for at most this long
+        self.max_retry_time = float(os.getenv("NEO4J_MAX_RETRY_TIME", 15))
+        
         self.driver = None
+        # Shared across sessions so a read routed to a replica sees this process's earlier writes
+        self._bookmarks = GraphDatabase.bookmark_manager()
+        self._lock = threading.Lock()
+        self._last_verified = 0.0
+        # Time from asking for a transaction to our work starting in it (connection
+        # acquisition plus BEGIN), and transactions in flight; measured in _guarded
+        self._acquire_stats = {'count': 0, 'wait_total': 0.0, 'wait_max': 0.0, 'timeouts': 0,
+                               'in_use': 0, 'in_use_max': 0}
+        self._stats_lock = threading.Lock()
+        self._payload_stats = {'requests': 0, 'bytes_total': 0, 'bytes_max': 0, 'bytes_last': 0}
+        # Runs hedge-eligible reads, so the caller can wait on the first of two copies
+        self._read_executor = ThreadPoolExecutor(max_workers=self.max_pool_size, thread_name_prefix='neo4j-read')
         
     def connect(self):
-        """Establish connection to Neo4j database"""
-        try:
-            self.driver = GraphDatabase.driver(
-                self.uri, 
-                auth=(self.user, self.password)
-            )
-            # Test connection
-            with self.driver.session(database=self.database) as session:
-                result = session.run("RETURN 'Connection successful' as message")
-                print(f"✅ Neo4j connected: {result.single()['message']}")
-            return True
-        except Exception as e:
-            print(f"❌ Neo4j connection failed: {e}")
-            return False
+        """Create the process-wide driver once; later calls only re-check liveness"""
+        with self._lock:
+            if self.driver is not None:
+                if time.monotonic() - self._last_verified < self.liveness_interval:
+                    return True
+                try:
+                    self.driver.verify_connectivity()
+                    self._last_verified = time.monotonic()
+                    return True
+                except Exception as e:
+                    print(f"⚠️ Neo4j liveness check failed, reconnecting: {e}")
+                    self._close_driver()
+            
+            driver = None
+            try:
+                driver = GraphDatabase.driver(
+                    self.uri, 
+                    auth=(self.user, self.password),
+                    max_connection_pool_size=self.max_pool_size,
+                    connection_acquisition_timeout=self.acquisition_timeout,
+                    max_connection_lifetime=self.max_connection_lifetime,
+                    max_transaction_retry_time=self.max_retry_time,
+                    keep_alive=True
+                )
+                # Test connection
+                driver.verify_connectivity()
+                self.driver = driver
+                self._last_verified = time.monotonic()
+                print(f"✅ Neo4j connected (pool size {self.max_pool_size})")
+                return True
+            except Exception as e:
+                print(f"❌ Neo4j connection failed: {e}")
+                if driver is not None:
+                    driver.close()
+                return False
     
     def close(self):
         """Close the connection"""
-        if self.driver:
+        with self._lock:
+            if self.driver:
+                self._close_driver()
+                print("🔌 Neo4j connection closed")
+    
+    def _close_driver(self):
+        try:
             self.driver.close()
-            print("🔌 Neo4j connection closed")
+        except Exception as e:
+            print(f"⚠️ Error closing Neo4j driver: {e}")
+        self.driver = None
     
     def get_session(self):
         """Get a database session"""
         if not self.driver:
             if not self.connect():
                 raise Exception("Failed to connect to Neo4j")
-        return self.driver.session(database=self.database)
+        return self.driver.session(database=self.database, bookmark_manager=self._bookmarks)
+    
+    def execute_read(self, work, *args, **kwargs):
+        """Run work(tx, *args) in a managed read transaction.
+
+        Reads are routed to read replicas / followers on clustered deployments (neo4j://
+        URIs) and retried on transient errors, so work must be safe to run more than once.
+        """
+        return self._guarded('execute_read', work, args, kwargs)
+    
+    def execute_write(self, work, *args, **kwargs):
+        """Run work(tx, *args) in a managed write transaction on the leader, with retries.
+
+        A retried write may follow one that committed without the client hearing back, so
+        work must be idempotent (MERGE rather than CREATE).
+        """
+        return self._guarded('execute_write', work, args, kwargs)
+    
+    def _guarded(self, method, work, args, kwargs, count_slow=False):
+        """Run a managed transaction through the circuit breaker.
+
+        While the breaker is open this raises CircuitOpenError at once instead of waiting on
+        session acquisition and timeouts. Connection errors, transient errors and transaction
+        timeouts (which the driver raises as ClientError) count against Neo4j, and so do
+        calls slower than the breaker's slow_ms when count_slow is set; other client errors
+        (bad statements, constraint violations) do not.
+
+        A read that _run gives an adaptive timeout shorter than slow_ms is cut off by the
+        server before it can be slow, so for it the timeout is what counts: it fails at
+        the timeout and is recorded as a failure.
+        """
+        if not neo4j_breaker.allow():
+            raise CircuitOpenError("Neo4j circuit breaker is open")
+        
+        started = time.perf_counter()
+        opened_at = []
+        
+        # wraps keeps the timeout/metadata that unit_of_work attaches to work
+        @functools.wraps(work)
+        def timed_work(tx, *work_args, **work_kwargs):
+            if not opened_at:
+                opened_at.append(time.perf_counter())
+            return work(tx, *work_args, **work_kwargs)
+        
+        self._track_in_use(1)
+        try:
+            with self.get_session() as session:
+                result = getattr(session, method)(timed_work, *args, **kwargs)
+        except ClientError as e:
+            if _counts_against_neo4j(e):
+                neo4j_breaker.record_failure()
+            else:
+                neo4j_breaker.record_success()
+            raise
+        except BaseException:
+            neo4j_breaker.record_failure()
+            raise
+        finally:
+            self._track_in_use(-1)
+            self._record_acquire(started, opened_at[0] if opened_at else None)
+        neo4j_breaker.record_success(time.perf_counter() - started if count_slow else None)
+        return self._count_payload(result)
+    
+    def _count_payload(self, result):
+        """Add result's size to the request being measured, if any; returns result"""
+        sizes = _request_payload.get()
+        if sizes is not None:
+            from .result_cache import estimate_size
+            # list.append is atomic, so concurrent strategies can share one request's list
+            sizes.append(estimate_size(result))
+        return result
+    
+    def read(self, query, params=None, count_slow=False):
+        """All records of a single read query.
+
+        count_slow marks a read on the request path, where taking longer than the breaker's
+        slow threshold counts as a Neo4j failure. Maintenance reads leave it off.
+        """
+        return self._run('execute_read', query, params or {}, hedge=True, count_slow=count_slow)
+    
+    def write(self, query, params=None):
+        """All records of a single idempotent write query"""
+        return self._run('execute_write', query, params or {})
+    
+    def _run(self, method, query, params, hedge=False, count_slow=False):
+        """Run one statement, with PROFILE when the slow-query log picks this execution.
+
+        Reads of registered queries get a timeout from their observed latency and are
+        hedged when they outlast their p95 (see _hedged_read).
+        """
+        from .query_profiler import query_profiler
+        from .query_latency import query_latency
+        
+        def execute(work, *args):
+            return self._guarded(method, work, args, {}, count_slow)
+        
+        name = query_profiler.query_name(query)
+        if name is None:
+            return execute(_fetch_records, query, params)
+        
+        started = time.perf_counter()
+        reason = query_profiler.should_profile(name)
+        if reason:
+            records, profile = execute(_fetch_profiled, query, params)
+            query_profiler.record(name, reason, time.perf_counter() - started, len(records), profile)
+            return records
+        
+        delay, timeout = query_latency.plan(name) if hedge else (None, None)
+        work = unit_of_work(timeout=timeout)(_fetch_records) if timeout else _fetch_records
+        if delay is None:
+            records = execute(work, query, params)
+            query_latency.observe(name, time.perf_counter() - started)
+        else:
+            records = self._hedged_read(name, execute, work, query, params, delay)
+        query_profiler.observe(name, time.perf_counter() - started, len(records))
+        return records
+    
+    def _hedged_read(self, name, execute, work, query, params, delay):
+        """Run a read; if it is still running after delay seconds, send a duplicate on another
+        pooled connection (budget permitting) and return whichever finishes first"""
+        from .query_latency import query_latency
+        
+        started = time.perf_counter()
+        
+        # Each copy runs in a copy of this context, with payload counting off there: both
+        # copies may complete, but only the result returned is counted (in this context)
+        def attempt():
+            _request_payload.set(None)
+            return execute(work, query, params)
+        
+        primary = self._read_executor.submit(copy_context().run, attempt)
+        # The primary's own latency feeds the percentiles, even when a hedge answers first
+        primary.add_done_callback(lambda future: query_latency.observe(name, time.perf_counter() - started))
+        
+        done, _ = wait([primary], timeout=delay)
+        if done or not query_latency.try_hedge():
+            return self._count_payload(primary.result())
+        
+        hedge = self._read_executor.submit(copy_context().run, attempt)
+        hedge.add_done_callback(lambda future: query_latency.release_hedge(
+            won=future.exception() is None and (not primary.done() or primary.exception() is not None)
+        ))
+        
+        error = None
+        for future in as_completed([primary, hedge]):
+            # The slower copy is left to finish in the background and release its connection
+            try:
+                return self._count_payload(future.result())
+            except Exception as e:
+                error = e
+        raise error
+    
+    def read_registered(self, name, params=None):
+        """Records of a registered request-path read, from the result cache when the query opts in"""
+        from .cypher_registry import cypher_registry
+        from .result_cache import result_cache
+        
+        depends_on = cypher_registry.cache_dependencies(name)
+        if depends_on is None:
+            return self.read(cypher_registry[name], params, count_slow=True)
+        return result_cache.get_or_load(
+            name, params or {}, depends_on, lambda: self.read(cypher_registry[name], params, count_slow=True)
+        )
+    
+    def _track_in_use(self, delta):
+        with self._stats_lock:
+            stats = self._acquire_stats
+            stats['in_use'] += delta
+            if stats['in_use'] > stats['in_use_max']:
+                stats['in_use_max'] = stats['in_use']
+    
+    def _record_acquire(self, started, opened_at):
+        """Account one transaction start; the driver does not expose pool wait times itself.
+
+        A call that failed before its work ever ran never got a connection (acquisition
+        timeout, unreachable server) and counts as a failure with its full wait.
+        """
+        wait = (opened_at if opened_at is not None else time.perf_counter()) - started
+        with self._stats_lock:
+            stats = self._acquire_stats
+            stats['count'] += 1
+            stats['wait_total'] += wait
+            if wait > stats['wait_max']:
+                stats['wait_max'] = wait
+            if opened_at is None:
+                stats['timeouts'] += 1
+    
+    @contextmanager
+    def measure_payload(self):
+        """Add up the size of the results Neo4j returns while the block runs, as one request.
+
+        Sizes are estimated from the returned records (see result_cache.estimate_size), so
+        they track what a request pulls from the graph rather than exact bytes on the wire.
+        """
+        sizes = []
+        token = _request_payload.set(sizes)
+        try:
+            yield sizes
+        finally:
+            _request_payload.reset(token)
+            received = sum(sizes)
+            with self._stats_lock:
+                stats = self._payload_stats
+                stats['requests'] += 1
+                stats['bytes_total'] += received
+                stats['bytes_last'] = received
+                if received > stats['bytes_max']:
+                    stats['bytes_max'] = received
+    
+    def payload_metrics(self):
+        """Estimated bytes of results received from Neo4j per measured request"""
+        with self._stats_lock:
+            stats = dict(self._payload_stats)
+        return {
+            **stats,
+            'bytes_avg': round(stats['bytes_total'] / stats['requests']) if stats['requests'] else 0
+        }
+    
+    def pool_metrics(self):
+        """Connection pool usage and acquisition wait times, as seen by our transactions.
+
+        in_use counts transactions this process has in flight, each holding one pooled
+        connection; the driver's own pool internals are not read. idle_estimate is the
+        headroom left in the pool (max_pool_size - in_use): the driver opens connections
+        lazily, so fewer than that may actually be open and idle.
+        """
+        stats = self._acquire_stats
+        in_use = stats['in_use']
+        return {
+            'connected': self.driver is not None,
+            'max_pool_size': self.max_pool_size,
+            'in_use': in_use,
+            'in_use_max': stats['in_use_max'],
+            'idle_estimate': max(self.max_pool_size - in_use, 0),
+            'acquisitions': stats['count'],
+            'acquire_wait_ms_avg': round(stats['wait_total'] / stats['count'] * 1000, 3) if stats['count'] else 0.0,
+            'acquire_wait_ms_max': round(stats['wait_max'] * 1000, 3),
+            'acquire_failures': stats['timeouts']
+        }
+
+def _fetch_records(tx, query, params):
+    # Results must be consumed inside the transaction function
+    return list(tx.run(query, params))
+
+def _fetch_profiled(tx, query, params):
+    # PROFILE executes the statement as usual and attaches the plan with per-operator db hits
+    result = tx.run("PROFILE " + query, params)
+    records = list(result)
+    return records, result.consume().profile
 
 # Global connection instance
 neo4j_conn = Neo4jConnection()
@@ -0,0 +1,78 @@
+# backend/path_finder.py - Bounded, cached relationship-path search between two entities
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any
+
+from .graph_backend import graph_backend
+from .csr_graph_engine import graph_engine
+from .cypher_registry import PATH_EXCLUDED_LABELS
+from .graph_change_tracker import graph_changes
+from .schema_migrations import name_key
+
+# Node expansions one in-process path search may make before returning what it has
+MAX_PATH_EXPANSIONS = 2000
+
+# Entity pairs whose paths are kept
+PATH_CACHE_SIZE = 1024
+
+class PathFinder:
+    """Relationship paths between two entities for retrieval context.
+
+    Served from the CSR snapshot while it is current (no write since it was read),
+    otherwise by the graph backend's index-anchored shortest-path query. Paths never pass through PATH_EXCLUDED_LABELS
+    hubs. Results are cached per entity pair until the graph version changes.
+    """
+
+    def __init__(self, capacity: int = PATH_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def find_paths(self, start: str, end: str, max_depth: int = 3, limit: int = 3) -> List[Dict[str, Any]]:
+        """Up to limit paths of at most max_depth relationships, shortest first"""
+        if not start or not end or name_key(start) == name_key(end):
+            return []
+
+        key = (name_key(start), name_key(end), max_depth, limit)
+        version = graph_changes.version
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['version'] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['paths']
+            self.misses += 1
+
+        paths = self._search(start, end, max_depth, limit)
+
+        with self._lock:
+            self._entries[key] = {'paths': paths, 'version': version}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+        return paths
+
+    def _search(self, start: str, end: str, max_depth: int, limit: int) -> List[Dict[str, Any]]:
+        if graph_engine.is_current:
+            return graph_engine.find_paths(
+                start, end, max_depth=max_depth, limit=limit,
+                blocked_labels=PATH_EXCLUDED_LABELS, max_expansions=MAX_PATH_EXPANSIONS
+            )
+        return graph_backend.relationship_paths(start, end, max_depth=max_depth, limit=limit)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+# Global path finder for context retrieval
+path_finder = PathFinder()
@@ -0,0 +1,108 @@
+# backend/query_latency.py - Per-query latency percentiles for adaptive timeouts and hedged reads
+
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+# Recent executions per query the percentiles are taken over
+LATENCY_WINDOW = 200
+# Executions needed before a query gets a timeout or is hedged
+LATENCY_MIN_SAMPLES = int(os.getenv("NEO4J_LATENCY_MIN_SAMPLES", 20))
+# Percentiles are recomputed after this many new executions
+PERCENTILE_REFRESH = 20
+
+# Reads still running at their p95 are hedged, by at most this many hedges in flight...
+NEO4J_MAX_HEDGES = int(os.getenv("NEO4J_MAX_HEDGES", 4))
+# ...and for at most this fraction of hedge-eligible reads
+NEO4J_HEDGE_BUDGET = float(os.getenv("NEO4J_HEDGE_BUDGET", 0.05))
+
+# Read transaction timeout: p99 times this, but never under NEO4J_MIN_TIMEOUT seconds
+NEO4J_TIMEOUT_MULTIPLIER = float(os.getenv("NEO4J_TIMEOUT_MULTIPLIER", 5))
+NEO4J_MIN_TIMEOUT = float(os.getenv("NEO4J_MIN_TIMEOUT", 2))
+
+class QueryLatency:
+    """Observed latency per registered query, and the hedging budget derived from it.
+
+    A read hedges once it has run longer than its query's p95: the same read is sent on
+    another pooled connection and the first result wins. Hedges are capped both in
+    flight and as a share of reads, so a slow database is not handed extra load.
+    """
+
+    def __init__(self, max_hedges: int = NEO4J_MAX_HEDGES, budget: float = NEO4J_HEDGE_BUDGET):
+        self.max_hedges = max_hedges
+        self.budget = budget
+        self._queries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.eligible = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            entry = self._queries.get(name)
+            if entry is None:
+                entry = self._queries[name] = {
+                    'samples': deque(maxlen=LATENCY_WINDOW), 'new': 0, 'p50': None, 'p95': None, 'p99': None
+                }
+            entry['samples'].append(seconds)
+            entry['new'] += 1
+            if entry['new'] >= PERCENTILE_REFRESH and len(entry['samples']) >= LATENCY_MIN_SAMPLES:
+                ordered = sorted(entry['samples'])
+                for key, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+                    entry[key] = ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+                entry['new'] = 0
+
+    def plan(self, name: str) -> Tuple[Optional[float], Optional[float]]:
+        """(hedge delay, transaction timeout) in seconds for a read of this query.
+
+        Both are None until the query has enough samples; a None timeout leaves the
+        server default. The delay is None when hedging is off (max_hedges = 0).
+        """
+        entry = self._queries.get(name)
+        if not entry or entry['p95'] is None:
+            return None, None
+        timeout = max(NEO4J_MIN_TIMEOUT, entry['p99'] * NEO4J_TIMEOUT_MULTIPLIER)
+        if self.max_hedges <= 0:
+            return None, timeout
+        with self._lock:
+            self.eligible += 1
+        return entry['p95'], timeout
+
+    def try_hedge(self) -> bool:
+        """Reserve a hedge if both caps allow it; release_hedge() when it finishes"""
+        with self._lock:
+            if self._in_flight >= self.max_hedges or self.hedges >= self.budget * self.eligible:
+                self.hedges_denied += 1
+                return False
+            self._in_flight += 1
+            self.hedges += 1
+            return True
+
+    def release_hedge(self, won: bool = False):
+        with self._lock:
+            self._in_flight -= 1
+            if won:
+                self.hedges_won += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queries = {
+                name: {key: round(entry[key] * 1000, 2) for key in ('p50', 'p95', 'p99') if entry[key] is not None}
+                for name, entry in self._queries.items()
+            }
+        return {
+            'eligible_reads': self.eligible,
+            'hedges': self.hedges,
+            'hedges_won': self.hedges_won,
+            'hedges_denied': self.hedges_denied,
+            'hedges_in_flight': self._in_flight,
+            'max_hedges': self.max_hedges,
+            'budget': self.budget,
+            'latency_ms': queries
+        }
+
+# Global latency tracker for registered Neo4j queries
+query_latency = QueryLatency()
@@ -0,0 +1,113 @@
+# backend/query_log.py - Persisted log of asked questions, for warm-up replay
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single dev server, nothing to coordinate with
+    fcntl = None
+
+from .heavy_hitters import normalize_question
+
+def default_path() -> str:
+    """Under /home on Azure App Service, which survives zip deploys and restarts; logs/ elsewhere"""
+    if os.getenv("WEBSITE_SITE_NAME"):
+        return "/home/data/query_log.jsonl"
+    return "logs/query_log.jsonl"
+
+class QueryLog:
+    """Append-only JSONL log of questions, rotated to a single .1 file when it grows too big.
+
+    Every gunicorn worker appends to the same file. Appends and rotation hold an exclusive
+    lock on a .lock file beside it, and a worker whose file was rotated away by another
+    reopens the path before writing.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._file = None
+        self._lock_file = None
+        self._lock = threading.Lock()
+
+    def record(self, question: str):
+        line = json.dumps({'t': round(time.time()), 'q': question}, ensure_ascii=False) + "\n"
+        try:
+            with self._lock, self._exclusive():
+                self._open()
+                self._file.write(line)
+                if os.fstat(self._file.fileno()).st_size > self.max_bytes:
+                    self._rotate()
+        except OSError as e:
+            print(f"⚠️ Query log write failed: {e}")
+
+    def top_questions(self, limit: int, max_age: Optional[float] = None) -> List[str]:
+        """Most frequent recent questions, most frequent first, as last asked"""
+        cutoff = time.time() - max_age if max_age else 0
+        counts: Counter = Counter()
+        latest: Dict[str, str] = {}
+
+        for path in (self.path + '.1', self.path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if entry.get('t', 0) < cutoff or not entry.get('q'):
+                            continue
+                        key = normalize_question(entry['q'])
+                        counts[key] += 1
+                        latest[key] = entry['q']
+            except FileNotFoundError:
+                continue
+
+        return [latest[key] for key, _ in counts.most_common(limit)]
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the cross-process lock; callers already hold self._lock"""
+        if fcntl is None:
+            yield
+            return
+
+        if self._lock_file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._lock_file = open(self.path + '.lock', 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open(self):
+        """(Re)open the log unless the handle still refers to the file at self.path"""
+        if self._file is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._file.fileno()).st_ino:
+                    return
+            except FileNotFoundError:
+                pass
+            self._file.close()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+
+    def _rotate(self):
+        self._file.close()
+        os.replace(self.path, self.path + '.1')
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+
+# Global query log
+query_log = QueryLog(os.getenv("QUERY_LOG_PATH") or default_path())
@@ -0,0 +1,137 @@
+# backend/query_profiler.py - Sampled PROFILE slow-query log for registered Cypher
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+# Fraction of executions run with PROFILE
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.01))
+# Executions at or over this wall time are always logged, and the query's next execution is profiled
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 500))
+# Entries kept in the ring buffer
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", 500))
+
+class QueryProfiler:
+    """Decides which executions of registered queries to PROFILE and keeps the results.
+
+    A query that ran slowly is logged with its wall time straight away; its plan comes
+    from profiling its next execution, so nothing is ever run twice.
+    """
+
+    def __init__(self, sample_rate: float = PROFILE_SAMPLE_RATE, slow_ms: float = SLOW_QUERY_MS,
+                 size: int = SLOW_QUERY_LOG_SIZE):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._entries: deque = deque(maxlen=size)
+        self._profile_next = set()
+        self._lock = threading.Lock()
+
+    def query_name(self, query: str) -> Optional[str]:
+        """Registered name of a query text; unregistered statements (schema changes) are not profiled"""
+        from .cypher_registry import cypher_registry
+        return cypher_registry.name_of(query)
+
+    def should_profile(self, name: str) -> Optional[str]:
+        """Why this execution should run with PROFILE ('after_slow' / 'sampled'), or None"""
+        if name in self._profile_next:
+            with self._lock:
+                if name in self._profile_next:
+                    self._profile_next.discard(name)
+                    return 'after_slow'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    def record(self, name: str, reason: str, seconds: float, rows: int, profile: Optional[Dict[str, Any]]):
+        """Log a profiled execution"""
+        db_hits, operators = _profile_totals(profile) if profile else (None, [])
+        self._append({
+            'query': name,
+            'reason': reason,
+            'ms': round(seconds * 1000, 2),
+            'rows': rows,
+            'db_hits': db_hits,
+            'operators': operators,
+            'at': time.time()
+        })
+
+    def observe(self, name: str, seconds: float, rows: int):
+        """Log an unprofiled execution if it was slow, and profile the query's next run"""
+        if not self.slow_ms or seconds * 1000 < self.slow_ms:
+            return
+        self._append({
+            'query': name,
+            'reason': 'slow',
+            'ms': round(seconds * 1000, 2),
+            'rows': rows,
+            'db_hits': None,
+            'operators': [],
+            'at': time.time()
+        })
+        with self._lock:
+            self._profile_next.add(name)
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries.append(entry)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._entries)
+        return entries[::-1][:limit]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-query totals over the buffer, heaviest database work first"""
+        with self._lock:
+            entries = list(self._entries)
+
+        by_query: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            stats = by_query.setdefault(entry['query'], {
+                'query': entry['query'], 'logged': 0, 'slow': 0, 'profiled': 0,
+                'ms_max': 0.0, 'ms_total': 0.0, 'db_hits_max': 0, 'db_hits_total': 0, 'operators': set()
+            })
+            stats['logged'] += 1
+            stats['ms_total'] += entry['ms']
+            stats['ms_max'] = max(stats['ms_max'], entry['ms'])
+            if entry['reason'] == 'slow':
+                stats['slow'] += 1
+            if entry['db_hits'] is not None:
+                stats['profiled'] += 1
+                stats['db_hits_total'] += entry['db_hits']
+                stats['db_hits_max'] = max(stats['db_hits_max'], entry['db_hits'])
+                stats['operators'].update(entry['operators'])
+
+        queries = []
+        for stats in by_query.values():
+            stats['ms_avg'] = round(stats.pop('ms_total') / stats['logged'], 2)
+            stats['db_hits_avg'] = round(stats['db_hits_total'] / stats['profiled']) if stats['profiled'] else None
+            stats['operators'] = sorted(stats['operators'])
+            queries.append(stats)
+        return sorted(queries, key=lambda stats: (stats['db_hits_total'], stats['ms_max']), reverse=True)
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            'sample_rate': self.sample_rate,
+            'slow_ms': self.slow_ms,
+            'buffer_size': self._entries.maxlen
+        }
+
+def _profile_totals(profile: Dict[str, Any]):
+    """Total db hits and distinct operator names of a PROFILE plan tree"""
+    db_hits = 0
+    operators = set()
+    stack = [profile]
+    while stack:
+        step = stack.pop()
+        db_hits += step.get('dbHits', 0)
+        # Operator names carry a runtime suffix, e.g. NodeIndexSeek@neo4j
+        operators.add(step.get('operatorType', '').split('@')[0])
+        stack.extend(step.get('children', []))
+    return db_hits, sorted(operators)
+
+# Global profiler for the Neo4j access layer
+query_profiler = QueryProfiler()
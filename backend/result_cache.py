@@ -0,0 +1,110 @@
+# backend/result_cache.py - Byte-bounded read-through cache for registered Cypher queries
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Tuple
+
+from .graph_change_tracker import graph_changes
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+
+class ResultCache:
+    """LRU cache of query results keyed by (query name, params).
+
+    Each entry is stamped with the versions of the labels and relationship types its query
+    reads, taken before the query ran; a write touching any of them (or a write of unknown
+    scope, which is how other workers' writes arrive) makes it stale. The total estimated
+    size of cached records is bounded.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        # Bumped per label / relationship type written, and globally for writes of unknown scope
+        self._versions: Dict[str, int] = {}
+        self._global_version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        graph_changes.subscribe(self._on_graph_change)
+
+    def get_or_load(self, name: str, params: Dict[str, Any], depends_on: Tuple[str, ...], load: Callable[[], list]) -> list:
+        """Cached records for (name, params), or load() them and cache the result.
+
+        depends_on lists the labels and relationship types the query reads; empty means
+        any write invalidates it. Callers must not mutate the returned records.
+        """
+        key = (name, json.dumps(params, sort_keys=True, default=str))
+        stamp = self._stamp(depends_on)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['stamp'] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['records']
+            self.misses += 1
+
+        records = load()
+        size = estimate_size(records)
+        if size > self.max_bytes:
+            return records
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous['size']
+            self._entries[key] = {'records': records, 'stamp': stamp, 'size': size}
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted['size']
+                self.evictions += 1
+
+        return records
+
+    def _stamp(self, depends_on: Tuple[str, ...]):
+        if not depends_on:
+            return graph_changes.version
+        return (self._global_version,) + tuple(self._versions.get(key, 0) for key in depends_on)
+
+    def _on_graph_change(self, change: Dict[str, Any]):
+        labels, types = change.get('labels'), change.get('relationship_types')
+        with self._lock:
+            if labels is None or types is None:
+                self._global_version += 1
+                return
+            for key in labels | types:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+def estimate_size(value) -> int:
+    """Rough in-memory size of records, nodes and the values inside them"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if hasattr(value, 'items'):
+        # dicts, Records, Nodes and Relationships
+        return size + sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return size + sum(estimate_size(item) for item in value)
+    return size
+
+# Global result cache for registered read queries
+result_cache = ResultCache()
@@ -0,0 +1,119 @@
+# backend/schema_migrations.py - Ordered, recorded Neo4j schema migrations
+
+from typing import Dict, List, Any
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry
+
+# Every node with a name also carries this label and a normalized name_key, so
+# label-less, case-insensitive lookups become a seek on one range index
+ENTITY_LABEL = 'Entity'
+
+# Nodes updated per write transaction while backfilling name_key
+BACKFILL_BATCH_SIZE = 5000
+
+# How long a migration waits for the indexes it created to finish populating
+INDEX_POPULATION_TIMEOUT = 300
+
+def name_key(name: str) -> str:
+    """Normalized lookup key; must match toLower(trim(n.name)) on the Cypher side"""
+    return str(name).strip().lower()
+
+# Applied in order, once each; applied ids are recorded as (:SchemaMigration) nodes.
+# Never edit a migration that has shipped - append a new one.
+MIGRATIONS: List[Dict[str, Any]] = [
+    {
+        'id': '0001_lookup_indexes',
+        'description': 'Range indexes for label-scoped property lookups',
+        'statements': [
+            "CREATE INDEX person_name IF NOT EXISTS FOR (n:Person) ON (n.name)",
+            "CREATE INDEX store_name IF NOT EXISTS FOR (n:Store) ON (n.name)",
+            "CREATE INDEX company_name IF NOT EXISTS FOR (n:Company) ON (n.name)",
+            "CREATE INDEX nutrition_product IF NOT EXISTS FOR (n:Nutrition) ON (n.product)",
+            "CREATE INDEX faq_question IF NOT EXISTS FOR (n:FAQ) ON (n.question)",
+            "CREATE INDEX document_url IF NOT EXISTS FOR (n:Document) ON (n.url)",
+            "CREATE INDEX keyword_text IF NOT EXISTS FOR (n:Keyword) ON (n.text)",
+        ]
+    },
+    {
+        'id': '0002_entity_name_key',
+        'description': 'Entity label and normalized name_key on every named node',
+        'statements': [
+            "CREATE INDEX entity_name_key IF NOT EXISTS FOR (n:Entity) ON (n.name_key)",
+        ],
+        'backfill_name_keys': True
+    },
+    {
+        'id': '0003_entity_fulltext',
+        'description': 'Full-text index for ranked keyword retrieval',
+        'statements': [
+            "CREATE FULLTEXT INDEX entity_text IF NOT EXISTS "
+            "FOR (n:Product|Category|Topic|Company|Brand|Person|Store|Ingredient|Campaign|Document) "
+            "ON EACH [n.name, n.description, n.title, n.content]",
+        ]
+    },
+    {
+        'id': '0004_document_embedding_vector',
+        'description': 'Vector index for kNN search over Document embeddings',
+        'statements': [
+            "CREATE VECTOR INDEX document_embedding IF NOT EXISTS "
+            "FOR (d:Document) ON (d.embedding) "
+            "OPTIONS {indexConfig: {`vector.dimensions`: 384, `vector.similarity_function`: 'cosine'}}",
+        ]
+    },
+    {
+        'id': '0005_graph_version',
+        'description': 'Single shared graph version node, bumped by every worker',
+        'statements': [
+            "CREATE CONSTRAINT graph_version_scope IF NOT EXISTS FOR (v:GraphVersion) REQUIRE v.scope IS UNIQUE",
+        ]
+    },
+]
+
+class SchemaMigrator:
+    """Brings the database schema up to date with MIGRATIONS"""
+
+    def applied(self) -> set:
+        return {record['id'] for record in neo4j_conn.read(cypher_registry['applied_migrations'])}
+
+    def migrate(self) -> List[str]:
+        """Apply pending migrations in order; returns the ids applied in this call"""
+        applied_now = []
+        done = self.applied()
+
+        for migration in MIGRATIONS:
+            if migration['id'] in done:
+                continue
+
+            print(f"🏗️ Applying schema migration {migration['id']}: {migration['description']}")
+            for statement in migration['statements']:
+                neo4j_conn.write(statement)
+            # Queries fail against an index that is still populating
+            neo4j_conn.read(cypher_registry['await_indexes'], {'timeout_seconds': INDEX_POPULATION_TIMEOUT})
+            if migration.get('backfill_name_keys'):
+                print(f"✅ Backfilled name_key on {self.refresh_name_keys()} nodes")
+
+            neo4j_conn.write(cypher_registry['record_migration'], {
+                'id': migration['id'],
+                'description': migration['description']
+            })
+            applied_now.append(migration['id'])
+
+        return applied_now
+
+    def refresh_name_keys(self) -> int:
+        """Set Entity/name_key on named nodes that lack them or whose name changed.
+
+        Writes that bypass the registry (seed scripts) call this afterwards. The graph is
+        scanned once; the updates seek their batch of nodes by element id.
+        """
+        ids = [record['id'] for record in neo4j_conn.read(cypher_registry['stale_name_key_ids'])]
+        total = 0
+        for start in range(0, len(ids), BACKFILL_BATCH_SIZE):
+            total += neo4j_conn.write(cypher_registry['refresh_name_keys'], {
+                'ids': ids[start:start + BACKFILL_BATCH_SIZE]
+            })[0]['updated']
+        return total
+
+# Global migrator
+schema_migrator = SchemaMigrator()
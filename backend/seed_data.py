@@ -0,0 +1,82 @@
+# backend/seed_data.py - Declarative seed dataset, written in one transaction when it changes
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Tuple
+
+from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry, SEED_NODE_KEYS, SEED_RELATIONSHIPS
+from .graph_change_tracker import graph_changes
+
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_data.json')
+
+# Identifies this dataset's :SeedVersion node
+SEED_DATASET = 'core'
+
+class SeedData:
+    """The core nodes and relationships every graph starts from, kept in seed_data.json.
+
+    The file's checksum is stored on a :SeedVersion node in the transaction that writes
+    the data, so a boot with unchanged seed data costs a single read. Nodes are merged on
+    their label's key (SEED_NODE_KEYS) and relationships between their endpoints' keys.
+    """
+
+    def __init__(self, path: str = SEED_DATA_PATH, dataset: str = SEED_DATASET):
+        self.path = path
+        self.dataset = dataset
+
+    def load(self) -> Tuple[Dict[str, Any], str]:
+        """(validated dataset, checksum of its canonical JSON)"""
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        for node in data['nodes']:
+            if node['label'] not in SEED_NODE_KEYS:
+                raise ValueError(f"Seed node label '{node['label']}' has no key in SEED_NODE_KEYS")
+        for relationship in data['relationships']:
+            if relationship['type'] not in SEED_RELATIONSHIPS:
+                raise ValueError(f"Seed relationship type '{relationship['type']}' has no endpoints in SEED_RELATIONSHIPS")
+
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return data, hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def apply(self, force: bool = False) -> bool:
+        """Write the dataset unless the graph already has this checksum; returns whether it wrote"""
+        data, checksum = self.load()
+
+        if not force:
+            records = neo4j_conn.read(cypher_registry['seed_version'], {'dataset': self.dataset})
+            if records and records[0]['checksum'] == checksum:
+                print(f"✅ Seed data v{data['version']} already applied, skipping")
+                return False
+
+        nodes = [_row(node, label=node['label'], key=node['key']) for node in data['nodes']]
+        relationships = [
+            _row(relationship, type=relationship['type'], **{'from': relationship['from'], 'to': relationship['to']})
+            for relationship in data['relationships']
+        ]
+        neo4j_conn.execute_write(_write_seed, nodes, relationships, {
+            'dataset': self.dataset, 'checksum': checksum, 'version': data['version']
+        })
+
+        graph_changes.record_change(
+            labels=sorted({node['label'] for node in nodes}),
+            names=[node['key'] for node in nodes if SEED_NODE_KEYS[node['label']] == 'name'],
+            relationship_types=sorted({relationship['type'] for relationship in relationships})
+        )
+        print(f"✅ Applied seed data v{data['version']}: {len(nodes)} nodes, {len(relationships)} relationships")
+        return True
+
+def _row(entry: Dict[str, Any], **fields) -> Dict[str, Any]:
+    return {**fields, 'defaults': entry.get('defaults', {}), 'properties': entry.get('properties', {})}
+
+def _write_seed(tx, nodes: List[Dict[str, Any]], relationships: List[Dict[str, Any]], version: Dict[str, Any]):
+    # Nodes first, so the relationship statement finds both endpoints in this transaction.
+    # Every statement MERGEs, so retries are safe.
+    tx.run(cypher_registry['seed_nodes'], {'nodes': nodes}).consume()
+    tx.run(cypher_registry['seed_relationships'], {'relationships': relationships}).consume()
+    tx.run(cypher_registry['record_seed_version'], version).consume()
+
+# Global seed dataset
+seed_data = SeedData()
@@ -0,0 +1,501 @@
+# backend/sqlite_graph_backend.py - Embedded SQLite graph backend
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .graph_backend import GraphBackend, NodeRecord, NeighbourRecord, ScoredNodeRecord
+from .cypher_registry import PATH_EXCLUDED_LABELS, MAX_PATH_DEPTH
+from .schema_migrations import name_key
+
+# name_lower holds name_key(name) (trimmed and lower-cased), the same key Neo4j lookups use
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    element_id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    name_lower TEXT,
+    labels TEXT NOT NULL,
+    properties TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_name_lower ON nodes(name_lower, id);
+
+-- One row per (label, node): the primary key is the covering (label, name_lower) index
+CREATE TABLE IF NOT EXISTS node_labels (
+    label TEXT NOT NULL,
+    name_lower TEXT NOT NULL DEFAULT '',
+    node_id INTEGER NOT NULL REFERENCES nodes(id),
+    PRIMARY KEY (label, name_lower, node_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_node_labels_node ON node_labels(node_id, label);
+
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL REFERENCES nodes(id),
+    target INTEGER NOT NULL REFERENCES nodes(id),
+    type TEXT NOT NULL,
+    properties TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_edges_out ON edges(source, type, target);
+CREATE INDEX IF NOT EXISTS idx_edges_in ON edges(target, type, source);
+"""
+
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS node_text USING fts5(name, description)"
+
+_EXCLUDED_PLACEHOLDERS = ', '.join('?' for _ in PATH_EXCLUDED_LABELS)
+
+# Properties stored as JSON; neo4j temporal values are kept as their ISO string
+def _dumps(properties) -> str:
+    return json.dumps(dict(properties), default=str, ensure_ascii=False)
+
+def _read_neo4j_graph(tx):
+    # Nodes and relationships are read in one transaction, so the snapshot is consistent
+    from .cypher_registry import cypher_registry
+
+    node_records = list(tx.run(cypher_registry['snapshot_nodes']))
+    relationship_records = list(tx.run(cypher_registry['snapshot_relationships']))
+    return node_records, relationship_records
+
+# Retrieval lookups leave embeddings and document bodies out, like the Cypher context projection
+def _context_properties(alias: str = '') -> str:
+    return f"json_remove({alias}properties, '$.embedding', '$.content')"
+
+def _walk_back(parents: Dict[int, List[Tuple[int, str]]], node_id: int):
+    """Relationship types of every shortest path to node_id, from the search's start"""
+    if not parents[node_id]:
+        yield []
+        return
+    for previous, rel_type in parents[node_id]:
+        for types in _walk_back(parents, previous):
+            yield types + [rel_type]
+
+class SQLiteNode(dict):
+    """Node properties with the element_id attribute ContextNode.from_record expects"""
+
+    __slots__ = ('element_id',)
+
+    def __init__(self, element_id: str, properties: Dict[str, Any]):
+        super().__init__(properties)
+        self.element_id = element_id
+
+class SQLiteGraphBackend(GraphBackend):
+    """Graph backend served from a local SQLite snapshot of the knowledge graph"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.has_fts = False
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets them read while a snapshot is written"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def connect(self) -> bool:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = self._conn()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.execute(FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                print("⚠️ SQLite build has no FTS5, keyword search falls back to LIKE")
+                self.has_fts = False
+            conn.commit()
+
+            count = self.count_nodes()
+            print(f"✅ Opened SQLite graph {self.path} ({count} nodes)")
+            if count == 0:
+                print("   Empty snapshot - run: python -m backend.sqlite_graph_backend")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to open SQLite graph: {e}")
+            return False
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Snapshot import ----------------------------------------------------
+
+    def replace_graph(self, nodes: Iterable[Tuple[str, List[str], Dict[str, Any]]],
+                      relationships: Iterable[Tuple[str, str, str, Dict[str, Any]]]) -> Tuple[int, int]:
+        """Replace the stored graph with (element_id, labels, properties) nodes and
+        (source element_id, target element_id, type, properties) relationships"""
+        conn = self._conn()
+        node_ids: Dict[str, int] = {}
+        edge_count = 0
+
+        with conn:
+            conn.execute("DELETE FROM edges")
+            conn.execute("DELETE FROM node_labels")
+            conn.execute("DELETE FROM nodes")
+            if self.has_fts:
+                conn.execute("DELETE FROM node_text")
+
+            for element_id, labels, properties in nodes:
+                name = properties.get('name')
+                name_lower = name_key(name) if isinstance(name, str) else None
+                cursor = conn.execute(
+                    "INSERT INTO nodes (element_id, name, name_lower, labels, properties) VALUES (?, ?, ?, ?, ?)",
+                    (element_id, name, name_lower, json.dumps(list(labels)), _dumps(properties))
+                )
+                node_id = cursor.lastrowid
+                node_ids[element_id] = node_id
+                conn.executemany(
+                    "INSERT INTO node_labels (label, name_lower, node_id) VALUES (?, ?, ?)",
+                    [(label, name_lower or '', node_id) for label in labels]
+                )
+                if self.has_fts:
+                    conn.execute(
+                        "INSERT INTO node_text (rowid, name, description) VALUES (?, ?, ?)",
+                        (node_id, name or '', str(properties.get('description') or ''))
+                    )
+
+            for source, target, rel_type, properties in relationships:
+                if source in node_ids and target in node_ids:
+                    conn.execute(
+                        "INSERT INTO edges (source, target, type, properties) VALUES (?, ?, ?, ?)",
+                        (node_ids[source], node_ids[target], rel_type, _dumps(properties))
+                    )
+                    edge_count += 1
+
+        conn.execute("PRAGMA optimize")
+        return len(node_ids), edge_count
+
+    def import_from_neo4j(self) -> bool:
+        """Snapshot the Neo4j graph into this database"""
+        from .neo4j_connection import neo4j_conn
+
+        try:
+            node_records, relationship_records = neo4j_conn.execute_read(_read_neo4j_graph)
+            nodes = [
+                (record['id'], record['labels'], dict(record['properties']))
+                for record in node_records
+            ]
+            relationships = [
+                (record['source'], record['target'], record['type'], dict(record['properties']))
+                for record in relationship_records
+            ]
+
+            node_count, edge_count = self.replace_graph(nodes, relationships)
+            print(f"✅ Imported {node_count} nodes and {edge_count} relationships into {self.path}")
+            return True
+        except Exception as e:
+            print(f"❌ SQLite snapshot import failed: {e}")
+            return False
+
+    # --- Helpers ------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        return self._conn().execute(sql, params).fetchall()
+
+    def _node(self, element_id: str, labels_json: str, properties_json: str) -> NodeRecord:
+        return SQLiteNode(element_id, json.loads(properties_json)), json.loads(labels_json)
+
+    def _labelled(self, label: str, where: str = '', params: tuple = (), order: str = '') -> List[Dict[str, Any]]:
+        """Properties of every node with a label, optionally filtered"""
+        rows = self._query(f"""
+            SELECT n.properties FROM node_labels l JOIN nodes n ON n.id = l.node_id
+            WHERE l.label = ? {('AND ' + where) if where else ''}
+            {order}
+            """, (label,) + params)
+        return [json.loads(row[0]) for row in rows]
+
+    def _related_names(self, node_id: int, rel_type: str, target_label: str, outgoing: bool = True) -> List[str]:
+        near, far = ('source', 'target') if outgoing else ('target', 'source')
+        rows = self._query(f"""
+            SELECT t.name FROM edges e
+            JOIN node_labels l ON l.node_id = e.{far} AND l.label = ?
+            JOIN nodes t ON t.id = e.{far}
+            WHERE e.{near} = ? AND e.type = ?
+            """, (target_label, node_id, rel_type))
+        return [row[0] for row in rows]
+
+    def _product_id(self, product: str) -> Optional[int]:
+        row = self._query("""
+            SELECT n.id FROM node_labels l JOIN nodes n ON n.id = l.node_id
+            WHERE l.label = 'Product' AND l.name_lower = ? AND n.name = ?
+            LIMIT 1
+            """, (name_key(product), product))
+        return row[0][0] if row else None
+
+    def _path_nodes(self, name: str) -> List[int]:
+        """Nodes with this name that a relationship path may start or end at"""
+        return [row[0] for row in self._query(f"""
+            SELECT n.id FROM nodes n
+            WHERE n.name_lower = ? AND NOT EXISTS (
+                SELECT 1 FROM node_labels l WHERE l.node_id = n.id AND l.label IN ({_EXCLUDED_PLACEHOLDERS}))
+            """, (name_key(name),) + PATH_EXCLUDED_LABELS)]
+
+    def _adjacent(self, node_id: int) -> List[Tuple[int, int, str]]:
+        """(edge id, other node id, type) for both directions, leaving out PATH_EXCLUDED_LABELS hubs"""
+        return self._query(f"""
+            SELECT e.id, e.target, e.type FROM edges e WHERE e.source = ? AND NOT EXISTS (
+                SELECT 1 FROM node_labels l WHERE l.node_id = e.target AND l.label IN ({_EXCLUDED_PLACEHOLDERS}))
+            UNION ALL
+            SELECT e.id, e.source, e.type FROM edges e WHERE e.target = ? AND NOT EXISTS (
+                SELECT 1 FROM node_labels l WHERE l.node_id = e.source AND l.label IN ({_EXCLUDED_PLACEHOLDERS}))
+            """, (node_id,) + PATH_EXCLUDED_LABELS + (node_id,) + PATH_EXCLUDED_LABELS)
+
+    # --- ContextRetriever lookups -------------------------------------------
+
+    def count_nodes(self) -> int:
+        return self._query("SELECT count(*) FROM nodes")[0][0]
+
+    def node_names(self) -> Iterable[str]:
+        return [row[0] for row in self._query("SELECT name FROM nodes WHERE name IS NOT NULL")]
+
+    def find_node(self, name: str) -> Optional[NodeRecord]:
+        row = self._query(
+            f"SELECT element_id, labels, {_context_properties()} FROM nodes WHERE name_lower = ? LIMIT 1",
+            (name_key(name),)
+        )
+        return self._node(*row[0]) if row else None
+
+    def neighbours(self, name: str, limit: int = 10) -> List[NeighbourRecord]:
+        rows = self._query(f"""
+            WITH start AS (SELECT id FROM nodes WHERE name_lower = ?)
+            SELECT e.type, e.properties, m.element_id, m.labels, {_context_properties('m.')}
+            FROM start JOIN edges e ON e.source = start.id JOIN nodes m ON m.id = e.target
+            UNION ALL
+            SELECT e.type, e.properties, m.element_id, m.labels, {_context_properties('m.')}
+            FROM start JOIN edges e ON e.target = start.id JOIN nodes m ON m.id = e.source
+            LIMIT ?
+            """, (name_key(name), limit))
+        neighbours = []
+        for rel_type, rel_properties, element_id, labels, properties in rows:
+            node, node_labels = self._node(element_id, labels, properties)
+            neighbours.append((rel_type, json.loads(rel_properties), node, node_labels))
+        return neighbours
+
+    def intent_nodes(self, intent: str) -> List[NodeRecord]:
+        if intent == 'company_info':
+            where = """instr(n.name, 'Nestlé') > 0 OR instr(n.name, 'Nestle') > 0
+                       OR EXISTS (SELECT 1 FROM node_labels l WHERE l.node_id = n.id AND l.label IN ('Company', 'Brand'))"""
+            limit = 5
+        elif intent == 'sustainability':
+            where = """instr(n.name_lower, 'sustainability') > 0
+                       OR instr(n.name_lower, 'cocoa') > 0
+                       OR instr(n.name_lower, 'environment') > 0
+                       OR EXISTS (SELECT 1 FROM node_labels l WHERE l.node_id = n.id AND l.label = 'Topic')"""
+            limit = 5
+        elif intent == 'product_info':
+            where = "EXISTS (SELECT 1 FROM node_labels l WHERE l.node_id = n.id AND l.label IN ('Product', 'Category'))"
+            limit = 8
+        else:
+            return []
+
+        rows = self._query(f"SELECT n.element_id, n.labels, {_context_properties('n.')} FROM nodes n WHERE {where} LIMIT ?",
+                           (limit,))
+        return [self._node(*row) for row in rows]
+
+    def text_search(self, keywords: List[str], limit: int = 9) -> List[ScoredNodeRecord]:
+        keywords = [keyword.lower() for keyword in keywords if keyword.strip()]
+        if not keywords:
+            return []
+
+        if self.has_fts:
+            # Prefix match on any quoted term; bm25 is lower-is-better, so negate it as the score
+            match = ' OR '.join('"' + keyword.replace('"', '""') + '"*' for keyword in keywords)
+            rows = self._query(f"""
+                SELECT n.element_id, n.labels, {_context_properties('n.')}, -bm25(node_text) as score
+                FROM node_text JOIN nodes n ON n.id = node_text.rowid
+                WHERE node_text MATCH ?
+                ORDER BY score DESC
+                LIMIT ?
+                """, (match, limit))
+            return [self._node(*row[:3]) + (row[3],) for row in rows]
+
+        # Without FTS5: score by how many keywords the name or description contains
+        text = "coalesce(name_lower, '') || ' ' || lower(coalesce(json_extract(properties, '$.description'), ''))"
+        score = ' + '.join([f"(instr({text}, ?) > 0)"] * len(keywords))
+        rows = self._query(f"""
+            SELECT element_id, labels, {_context_properties()}, {score} as score FROM nodes
+            WHERE score > 0
+            ORDER BY score DESC
+            LIMIT ?
+            """, (*keywords, limit))
+        return [self._node(*row[:3]) + (float(row[3]),) for row in rows]
+
+    def relationship_paths(self, start: str, end: str, max_depth: int = 3, limit: int = 3) -> List[Dict[str, Any]]:
+        start_ids = self._path_nodes(start)
+        end_ids = set(self._path_nodes(end)) - set(start_ids)
+        if not start_ids or not end_ids:
+            return []
+
+        # allShortestPaths, as in the Cypher query: a layered breadth-first search from each
+        # start node that stops at the first layer reaching an end node, so every path is a
+        # shortest one and visits no node twice. _adjacent leaves out PATH_EXCLUDED_LABELS hubs.
+        depth = min(max(int(max_depth), 1), MAX_PATH_DEPTH)
+        adjacency: Dict[int, List[Tuple[int, int, str]]] = {}
+        paths = []
+
+        for start_id in start_ids:
+            # node -> (previous node, relationship type) for every edge reaching it from the layer before
+            parents: Dict[int, List[Tuple[int, str]]] = {start_id: []}
+            frontier = [start_id]
+            reached = []
+            for _ in range(depth):
+                layer: Dict[int, List[Tuple[int, str]]] = {}
+                for node_id in frontier:
+                    if node_id not in adjacency:
+                        adjacency[node_id] = self._adjacent(node_id)
+                    for _, other, rel_type in adjacency[node_id]:
+                        if other not in parents:
+                            layer.setdefault(other, []).append((node_id, rel_type))
+                parents.update(layer)
+                reached = [node_id for node_id in layer if node_id in end_ids]
+                if reached or not layer:
+                    break
+                frontier = list(layer)
+
+            for end_id in reached:
+                for types in _walk_back(parents, end_id):
+                    paths.append({'start': start, 'end': end, 'length': len(types), 'relationships': types})
+                    if len(paths) >= limit:
+                        return paths
+
+        return paths
+
+    # --- Smart-intent handler lookups ---------------------------------------
+
+    def find_node_exact(self, name: str) -> Optional[NodeRecord]:
+        row = self._query(
+            f"SELECT element_id, labels, {_context_properties()} FROM nodes WHERE name_lower = ? AND name = ? LIMIT 1",
+            (name_key(name), name)
+        )
+        return self._node(*row[0]) if row else None
+
+    def get_nutrition(self, product: str) -> Optional[Dict[str, Any]]:
+        product_id = self._product_id(product)
+        if product_id is None:
+            return None
+        row = self._query("""
+            SELECT t.properties FROM edges e
+            JOIN node_labels l ON l.node_id = e.target AND l.label = 'Nutrition'
+            JOIN nodes t ON t.id = e.target
+            WHERE e.source = ? AND e.type = 'HAS_NUTRITION'
+            LIMIT 1
+            """, (product_id,))
+        return json.loads(row[0][0]) if row else None
+
+    def get_ingredients(self, product: str) -> List[str]:
+        product_id = self._product_id(product)
+        if product_id is None:
+            return []
+        return self._related_names(product_id, 'CONTAINS', 'Ingredient')
+
+    def get_product(self, product: str) -> Optional[Dict[str, Any]]:
+        row = self._query("""
+            SELECT n.properties FROM node_labels l JOIN nodes n ON n.id = l.node_id
+            WHERE l.label = 'Product' AND l.name_lower = ? AND n.name = ?
+            LIMIT 1
+            """, (name_key(product), product))
+        return json.loads(row[0][0]) if row else None
+
+    def get_stores(self, product: str) -> List[Dict[str, Any]]:
+        stores = []
+        seen = set()
+        for properties in self._labelled('Store', order='ORDER BY n.name'):
+            store = {
+                'store': properties.get('name'),
+                'type': properties.get('type'),
+                'locations': properties.get('locations'),
+                'website': properties.get('website')
+            }
+            key = json.dumps(store, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                stores.append(store)
+        return stores
+
+    def get_ceo(self) -> Optional[Dict[str, Any]]:
+        row = self._query("""
+            SELECT p.name, json_extract(p.properties, '$.role'), c.name
+            FROM node_labels pl JOIN nodes p ON p.id = pl.node_id
+            JOIN edges e ON e.source = p.id AND e.type = 'CEO_OF'
+            JOIN node_labels cl ON cl.node_id = e.target AND cl.label = 'Company'
+            JOIN nodes c ON c.id = e.target
+            WHERE pl.label = 'Person' AND instr(c.name_lower, 'nestlé') > 0
+            LIMIT 1
+            """)
+        if row and row[0][0]:
+            return {'name': row[0][0], 'role': row[0][1], 'company': row[0][2]}
+
+        for where in ["instr(l.name_lower, 'schneider') > 0",
+                      "instr(lower(json_extract(n.properties, '$.role')), 'ceo') > 0"]:
+            row = self._query(f"""
+                SELECT n.name, json_extract(n.properties, '$.role')
+                FROM node_labels l JOIN nodes n ON n.id = l.node_id
+                WHERE l.label = 'Person' AND {where}
+                LIMIT 1
+                """)
+            if row and row[0][0]:
+                return {'name': row[0][0], 'role': row[0][1]}
+
+        return None
+
+    def get_companies(self) -> List[Dict[str, Any]]:
+        return self._labelled('Company', "instr(n.name, 'Nestlé') > 0", order='ORDER BY n.name')
+
+    def get_sustainability_topics(self) -> List[Dict[str, Any]]:
+        return self._labelled('Topic', """(instr(l.name_lower, 'sustainability') > 0
+                                           OR instr(l.name_lower, 'cocoa') > 0
+                                           OR instr(l.name_lower, 'environment') > 0)""")
+
+    def get_recipes(self, limit: int = 5) -> List[Dict[str, Any]]:
+        rows = self._query("""
+            SELECT n.id, json_extract(n.properties, '$.title') as title, json_extract(n.properties, '$.url')
+            FROM node_labels l JOIN nodes n ON n.id = l.node_id
+            WHERE l.label = 'Document'
+              AND (json_extract(n.properties, '$.type') = 'Recipe'
+                   OR instr(lower(json_extract(n.properties, '$.title')), 'recipe') > 0)
+            ORDER BY title
+            LIMIT ?
+            """, (limit,))
+        return [
+            {'title': title, 'url': url, 'ingredients': self._related_names(node_id, 'USES_INGREDIENT', 'Ingredient')}
+            for node_id, title, url in rows
+        ]
+
+    def get_campaigns(self) -> List[Dict[str, Any]]:
+        rows = self._query("""
+            SELECT n.id, n.properties FROM node_labels l JOIN nodes n ON n.id = l.node_id
+            WHERE l.label = 'Campaign'
+            ORDER BY json_extract(n.properties, '$.start_date') DESC
+            """)
+        campaigns = []
+        for node_id, properties_json in rows:
+            properties = json.loads(properties_json)
+            campaigns.append({
+                'campaign': properties.get('name'),
+                'theme': properties.get('theme'),
+                'start_date': properties.get('start_date'),
+                'end_date': properties.get('end_date'),
+                'products': self._related_names(node_id, 'FEATURED_IN', 'Product', outgoing=False)
+            })
+        return campaigns
+
+if __name__ == "__main__":
+    import sys
+
+    backend = SQLiteGraphBackend(sys.argv[1] if len(sys.argv) > 1 else os.getenv("SQLITE_GRAPH_PATH", "graph/knowledge_graph.sqlite3"))
+    if backend.connect():
+        backend.import_from_neo4j()
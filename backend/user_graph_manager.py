@@ -113,6 +113,10 @@
 # user_graph_manager = UserGraphManager()
 
 from .neo4j_connection import neo4j_conn
+from .cypher_registry import cypher_registry, node_label, relationship_type as whitelisted_relationship_type
+from .schema_migrations import name_key
+from .graph_change_tracker import graph_changes
+from .graph_stats import graph_stats
 
 class UserGraphManager:
     """Manage user interactions with the knowledge graph"""
@@ -122,20 +126,16 @@ class UserGraphManager:
             properties = {}
         
         try:
-            with neo4j_conn.get_session() as session:
-                query = f"""
-                CREATE (n:{node_type} {{name: $name}})
-                SET n += $properties
-                SET n.custom_added = true
-                SET n.created_at = datetime()
-                RETURN n
-                """
-                
-                session.run(query, {
-                    'name': name, 
-                    'properties': properties
-                })
-                return {"success": True, "message": f"Added {node_type} node: {name}"}
+            # Labels come from the whitelist, so the query text (and its cached plan) is fixed
+            node_type = node_label(node_type)
+            
+            # MERGE keeps the write idempotent when a transient failure triggers a retry
+            neo4j_conn.write(cypher_registry[f'add_node:{node_type}'], {
+                'name': name, 
+                'properties': properties
+            })
+            graph_changes.record_change(labels=[node_type], names=[name], relationship_types=[])
+            return {"success": True, "message": f"Added {node_type} node: {name}"}
         except Exception as e:
             return {"success": False, "message": f"Error: {str(e)}"}
     
@@ -144,59 +144,23 @@ class UserGraphManager:
             properties = {}
         
         try:
-            with neo4j_conn.get_session() as session:
-                query = f"""
-                MATCH (a), (b)
-                WHERE a.name = $from_node AND b.name = $to_node
-                CREATE (a)-[r:{relationship_type}]->(b)
-                SET r += $properties
-                SET r.custom_added = true
-                SET r.created_at = datetime()
-                RETURN r
-                """
-                
-                session.run(query, {
-                    'from_node': from_node,
-                    'to_node': to_node,
-                    'properties': properties
-                })
-                return {"success": True, "message": f"Added relationship: {from_node} -{relationship_type}-> {to_node}"}
+            relationship_type = whitelisted_relationship_type(relationship_type)
+            
+            neo4j_conn.write(cypher_registry[f'add_relationship:{relationship_type}'], {
+                'from_node': from_node,
+                'to_node': to_node,
+                'from_key': name_key(from_node),
+                'to_key': name_key(to_node),
+                'properties': properties
+            })
+            graph_changes.record_change(labels=[], names=[from_node, to_node], relationship_types=[relationship_type])
+            return {"success": True, "message": f"Added relationship: {from_node} -{relationship_type}-> {to_node}"}
         except Exception as e:
             return {"success": False, "message": f"Error: {str(e)}"}
     
     def get_graph_stats(self):
         try:
-            with neo4j_conn.get_session() as session:
-                node_query = """
-                MATCH (n)
-                UNWIND labels(n) as label
-                WITH label, count(*) as count
-                RETURN label, count
-                ORDER BY count DESC
-                """
-                
-                node_results = session.run(node_query)
-                nodes = {}
-                for record in node_results:
-                    nodes[record['label']] = record['count']
-                
-                rel_query = """
-                MATCH ()-[r]->()
-                RETURN type(r) as relationship_type, count(r) as count
-                ORDER BY count DESC
-                """
-                
-                rel_results = session.run(rel_query)
-                relationships = {}
-                for record in rel_results:
-                    relationships[record['relationship_type']] = record['count']
-                
-                return {
-                    'nodes': nodes,
-                    'relationships': relationships,
-                    'total_nodes': sum(nodes.values()),
-                    'total_relationships': sum(relationships.values())
-                }
+            return graph_stats.get()
         except Exception as e:
             return {
                 'error': f"Failed to get stats: {str(e)}",
@@ -208,24 +172,9 @@ class UserGraphManager:
     
     def search_nodes(self, search_term, node_type=None):
         try:
-            with neo4j_conn.get_session() as session:
-                if node_type:
-                    query = f"""
-                    MATCH (n:{node_type})
-                    WHERE toLower(n.name) CONTAINS toLower($search_term)
-                    RETURN n.name as name, labels(n) as labels
-                    LIMIT 20
-                    """
-                else:
-                    query = """
-                    MATCH (n)
-                    WHERE toLower(n.name) CONTAINS toLower($search_term)
-                    RETURN n.name as name, labels(n) as labels
-                    LIMIT 20
-                    """
-                
-                results = session.run(query, {'search_term': search_term})
-                return [{'name': record['name'], 'type': record['labels'][0]} for record in results]
+            name = f'search_nodes:{node_label(node_type)}' if node_type else 'search_nodes'
+            results = neo4j_conn.read(cypher_registry[name], {'search_key': name_key(search_term)}, count_slow=True)
+            return [{'name': record['name'], 'type': record['labels'][0]} for record in results]
         except Exception as e:
             return []
 
@@ -0,0 +1,217 @@
+# benchmark_context_model.py - Memory/latency per request: typed context model vs dict-of-dicts
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from neo4j.graph import Graph, Node
+
+from backend.neo4j_connection import neo4j_conn
+from backend.cypher_registry import CONTEXT_PROPERTIES, CONTEXT_PROPERTIES_BY_LABEL
+from backend.query_profiler import query_profiler
+from backend.query_latency import query_latency
+from backend.context_retriever import ContextRetriever
+from backend.ai_response_generator import AIResponseGenerator
+
+GRAPH = Graph()
+MENTIONS = GRAPH.relationship_type('MENTIONS')
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+def project(node):
+    """What context_projection returns for a node"""
+    keys = CONTEXT_PROPERTIES + CONTEXT_PROPERTIES_BY_LABEL.get(node['label'], [])
+    return {'element_id': node.element_id, **{key: node.get(key) for key in keys}}
+
+class FakeSession:
+    """Answers the ContextRetriever query shapes with real neo4j.graph objects"""
+
+    def __init__(self, nodes, seed):
+        self.nodes = nodes
+        self.random = random.Random(seed)
+
+    def _pick(self, count):
+        return [self.nodes[self.random.randrange(len(self.nodes))] for _ in range(count)]
+
+    def run(self, query, params=None):
+        # Registry queries return projections; the legacy shapes return whole nodes
+        shape = project if 'elementId(' in query else (lambda node: node)
+        if 'path' in query:
+            return FakeResult()
+        if 'UNWIND $name_keys' in query:
+            result = FakeResult()
+            for key in params['name_keys']:
+                node = self._pick(1)[0]
+                neighbours = [
+                    [MENTIONS.__name__, {'created_at': '2024-01-01'}, shape(target), [target['label']]]
+                    for target in self._pick(10)
+                ]
+                result.append({'name_key': key, 'n': shape(node), 'labels': [node['label']], 'neighbours': neighbours})
+            return result
+        if '-[r]-' in query:
+            return FakeResult([
+                {'n': None, 'r': MENTIONS(GRAPH, f"5:bench:{i}", i, {'created_at': '2024-01-01'}), 'm': shape(node), 'target_labels': [node['label']]}
+                for i, node in enumerate(self._pick(10))
+            ])
+        if 'LIMIT 1' in query:
+            node = self._pick(1)[0]
+            return FakeResult([{'n': shape(node), 'labels': [node['label']]}])
+        if 'fulltext' in query:
+            return FakeResult([
+                {'n': shape(node), 'labels': [node['label']], 'score': 1.0 / (rank + 1)}
+                for rank, node in enumerate(self._pick(9))
+            ])
+        limit = 3 if '$keyword' in query else 8
+        return FakeResult([{'n': shape(node), 'labels': [node['label']]} for node in self._pick(limit)])
+
+    def execute_read(self, work, *args, **kwargs):
+        # The session doubles as the transaction handed to the unit of work
+        return work(self, *args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+def build_graph(node_count, seed):
+    rnd = random.Random(seed)
+    labels = ['Product', 'Topic', 'Company', 'Document', 'Category']
+    nodes = []
+    for i in range(node_count):
+        label = labels[i % len(labels)]
+        properties = {
+            'name': f"{label} {i}",
+            'label': label,
+            'description': f"Description of {label.lower()} {i} " * 4,
+            'tagline': "Have a break",
+            'varieties': ["Original", "Dark", "Mint"]
+        }
+        if label == 'Document':
+            properties['content'] = "lorem ipsum " * 200
+            properties['embedding'] = [rnd.random() for _ in range(384)]
+        nodes.append(Node(GRAPH, f"4:bench:{i}", i, [label], properties))
+    return nodes
+
+# --- Previous dict-of-dicts pipeline, kept here as the baseline ---------------
+
+def legacy_retrieve(session, entities, keywords):
+    nodes, relationships = [], []
+    for entity in entities:
+        record = session.run("MATCH (n) ... LIMIT 1").single()
+        node_data = dict(record['n'])
+        nodes.append({'name': node_data.get('name', entity), 'type': record['labels'][0],
+                      'properties': node_data, 'relevance': 'direct_match'})
+        for rel_record in session.run("MATCH (n)-[r]-(m) ..."):
+            target_data = dict(rel_record['m'])
+            relationships.append({'from': node_data.get('name', entity), 'to': target_data.get('name', 'Unknown'),
+                                  'type': rel_record['r'].type, 'properties': dict(rel_record['r'])})
+            target_node = {'name': target_data.get('name', 'Unknown'), 'type': rel_record['target_labels'][0],
+                           'properties': target_data, 'relevance': 'connected_to_entity'}
+            if target_node not in nodes:
+                nodes.append(target_node)
+    for record in session.run("MATCH (n) ... LIMIT 8"):
+        node_data = dict(record['n'])
+        nodes.append({'name': node_data.get('name'), 'type': record['labels'][0],
+                      'properties': node_data, 'relevance': 'intent_product'})
+    for keyword in keywords:
+        for record in session.run("MATCH (n) WHERE ... $keyword"):
+            node_data = dict(record['n'])
+            nodes.append({'name': node_data.get('name'), 'type': record['labels'][0],
+                          'properties': node_data, 'relevance': f'keyword_{keyword}'})
+
+    seen, unique_nodes = set(), []
+    for node in nodes:
+        key = (node.get('name', ''), node.get('type', ''))
+        if key not in seen:
+            seen.add(key)
+            unique_nodes.append(node)
+    seen, unique_rels = set(), []
+    for rel in relationships:
+        key = (rel.get('from', ''), rel.get('to', ''), rel.get('type', ''))
+        if key not in seen:
+            seen.add(key)
+            unique_rels.append(rel)
+    return {'nodes': unique_nodes, 'relationships': unique_rels}
+
+def legacy_format(context):
+    nodes = context['nodes']
+    direct = [n for n in nodes if n.get('relevance') == 'direct_match']
+    related = [n for n in nodes if n.get('relevance') != 'direct_match']
+    parts = []
+    for node in direct[:3] + related[:3]:
+        properties = node.get('properties', {})
+        info = [properties['description']] if 'description' in properties else []
+        for key in ['tagline', 'launched', 'varieties']:
+            if key in properties:
+                value = properties[key]
+                info.append(f"{key.title()}: {', '.join(map(str, value[:3])) if isinstance(value, list) else value}")
+        parts.append(f"**{node['name']}**: {'. '.join(info[:3])[:300]}")
+    return "\n".join(parts)
+
+# -----------------------------------------------------------------------------
+
+def measure(label, func, iterations):
+    func()  # warm up
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - start) / iterations
+
+    print(f"  {label:<24} {elapsed * 1e6:10.1f} µs/request   peak {peak / 1024:8.1f} KiB   new blocks {blocks}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Context model per-request benchmark")
+    parser.add_argument('--nodes', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    graph = build_graph(args.nodes, seed=11)
+    entities = ['KitKat', 'Aero', 'Smarties']
+    question = "Tell me about KitKat Aero and Smarties chocolate sustainability"
+
+    retriever = ContextRetriever()
+    generator = AIResponseGenerator()
+
+    # One fake session for every backend call, like a pooled connection
+    shared_session = FakeSession(graph, seed=3)
+    
+    @contextmanager
+    def fake_session():
+        yield shared_session
+
+    neo4j_conn.get_session = fake_session
+    # The fake session returns plain lists, with no PROFILE summaries to sample
+    query_profiler.sample_rate = 0
+    # Measures retrieval CPU cost; hedging only pays against real network latency
+    query_latency.max_hedges = 0
+
+    loop = asyncio.new_event_loop()
+
+    def typed_request():
+        context = loop.run_until_complete(retriever.get_relevant_context(question, 'product_info', entities))
+        generator._format_graph_context(context, 'product_info', entities)
+
+    def legacy_request():
+        with fake_session() as session:
+            context = legacy_retrieve(session, entities, retriever._extract_keywords(question)[:3])
+        legacy_format(context)
+
+    print(f"🧪 Retrieval -> prompt path, {len(entities)} entities, {args.nodes} node graph")
+    print("="*60)
+    measure("dict-of-dicts (before)", legacy_request, args.iterations)
+    measure("typed context (after)", typed_request, args.iterations)
@@ -0,0 +1,129 @@
+# benchmark_graph_engine.py - Compare the CSR graph engine with the Cypher traversal queries
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from backend.csr_graph_engine import CSRGraphEngine
+from backend.neo4j_connection import neo4j_conn
+
+def build_synthetic_graph(node_count: int, avg_degree: int, seed: int):
+    """Random graph with a few hub nodes, roughly like Keyword/Document fan-out"""
+    rng = np.random.default_rng(seed)
+    edge_count = node_count * avg_degree // 2
+
+    # Skew sources towards low ids so a handful of nodes become hubs
+    sources = (rng.pareto(1.5, edge_count) * node_count / 50).astype(np.int64) % node_count
+    targets = rng.integers(0, node_count, edge_count)
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+    rel_types = rng.integers(0, 4, len(sources))
+
+    names = [f"bench-node-{i}" for i in range(node_count)]
+    return names, sources.astype(np.int32), targets.astype(np.int32), rel_types.astype(np.int16)
+
+def timed(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"  {label:<32} {elapsed * 1000:10.3f} ms/op")
+    return elapsed
+
+def benchmark_csr(names, sources, targets, rel_types, pairs, seeds):
+    print("⚡ CSR engine")
+    engine = CSRGraphEngine()
+
+    start = time.perf_counter()
+    # The low ids are the hubs; label them like the Keyword fan-out the path finder blocks
+    hub_count = len(names) // 100
+    labels = ['Keyword'] * hub_count + ['BenchNode'] * (len(names) - hub_count)
+    engine.build(names, labels, sources, targets, rel_types, ['A', 'B', 'C', 'D'])
+    print(f"  {'build':<32} {(time.perf_counter() - start) * 1000:10.3f} ms")
+
+    timed("degree (all nodes)", lambda i: engine.degree(), 10)
+    timed("degree (single node)", lambda i: engine.degree([seeds[i]]), len(seeds))
+    for k in (1, 2, 3):
+        timed(f"k-hop k={k}", lambda i: engine.k_hop(seeds[i], k), len(seeds))
+    timed("bounded paths (depth 3, limit 3)", lambda i: engine.bounded_paths(*pairs[i], max_depth=3, limit=3), len(pairs))
+    hubs = engine.label_mask(('Keyword',))
+    timed("paths, hubs blocked, capped", lambda i: engine.bounded_paths(
+        *pairs[i], max_depth=3, limit=3, blocked=hubs, max_expansions=2000), len(pairs))
+
+def load_into_neo4j(names, sources, targets, rel_types, batch_size=10000):
+    with neo4j_conn.get_session() as session:
+        session.run("CREATE INDEX bench_node_name IF NOT EXISTS FOR (n:BenchNode) ON (n.name)")
+        for start in range(0, len(names), batch_size):
+            session.run(
+                "UNWIND $rows AS row CREATE (:BenchNode {bid: row.bid, name: row.name})",
+                {'rows': [{'bid': i, 'name': names[i]} for i in range(start, min(start + batch_size, len(names)))]}
+            )
+        type_names = ['A', 'B', 'C', 'D']
+        for rel_type, type_name in enumerate(type_names):
+            mask = rel_types == rel_type
+            rows = [{'s': int(s), 't': int(t)} for s, t in zip(sources[mask], targets[mask])]
+            for start in range(0, len(rows), batch_size):
+                session.run(
+                    f"UNWIND $rows AS row "
+                    f"MATCH (a:BenchNode {{bid: row.s}}), (b:BenchNode {{bid: row.t}}) "
+                    f"CREATE (a)-[:BENCH_{type_name}]->(b)",
+                    {'rows': rows[start:start + batch_size]}
+                )
+
+def cleanup_neo4j():
+    with neo4j_conn.get_session() as session:
+        session.run("MATCH (n:BenchNode) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS")
+        session.run("DROP INDEX bench_node_name IF EXISTS")
+
+def benchmark_cypher(names, pairs, seeds):
+    print("🔌 Cypher (ContextRetriever query shapes)")
+    with neo4j_conn.get_session() as session:
+        timed("degree (single node)", lambda i: session.run(
+            "MATCH (n) WHERE toLower(n.name) = toLower($name) RETURN COUNT { (n)--() } as degree",
+            {'name': names[seeds[i]]}).consume(), len(seeds))
+        for k in (1, 2, 3):
+            timed(f"k-hop k={k}", lambda i: session.run(
+                f"MATCH (n)-[*1..{k}]-(m) WHERE toLower(n.name) = toLower($name) RETURN count(DISTINCT m)",
+                {'name': names[seeds[i]]}).consume(), len(seeds))
+        timed("bounded paths (depth 3, limit 3)", lambda i: session.run(
+            """
+            MATCH path = (a)-[*1..3]-(b)
+            WHERE toLower(a.name) = toLower($node1)
+              AND toLower(b.name) = toLower($node2)
+            RETURN path
+            LIMIT 3
+            """,
+            {'node1': names[pairs[i][0]], 'node2': names[pairs[i][1]]}).consume(), len(pairs))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSR engine vs Cypher traversal benchmark")
+    parser.add_argument('--nodes', type=int, default=100_000)
+    parser.add_argument('--avg-degree', type=int, default=8)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--neo4j', action='store_true', help="Also load the graph into Neo4j and time the Cypher queries")
+    args = parser.parse_args()
+
+    print(f"🧪 Synthetic graph: {args.nodes} nodes, average degree {args.avg_degree}")
+    print("="*60)
+
+    names, sources, targets, rel_types = build_synthetic_graph(args.nodes, args.avg_degree, args.seed)
+    rnd = random.Random(args.seed)
+    seeds = [rnd.randrange(args.nodes) for _ in range(args.queries)]
+    pairs = [(rnd.randrange(args.nodes), rnd.randrange(args.nodes)) for _ in range(args.queries)]
+
+    benchmark_csr(names, sources, targets, rel_types, pairs, seeds)
+
+    if args.neo4j:
+        if neo4j_conn.connect():
+            try:
+                print("📊 Loading synthetic graph into Neo4j...")
+                load_into_neo4j(names, sources, targets, rel_types)
+                benchmark_cypher(names, pairs[:10], seeds[:10])
+            finally:
+                cleanup_neo4j()
+                neo4j_conn.close()
+        else:
+            print("❌ Neo4j connection failed, skipping Cypher benchmark")
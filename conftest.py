@@ -0,0 +1 @@
+# conftest.py - Puts the repository root on sys.path so tests import `backend` as the app does
@@ -1,32 +1,19 @@
-# quick_test.py - Test your Neo4j data directly
+# quick_test.py - Test your graph data directly (GRAPH_BACKEND=neo4j|sqlite)
 
-from backend.neo4j_connection import neo4j_conn
+from backend.graph_backend import graph_backend
 
 def test_ceo_query():
     """Test CEO query directly"""
     print("🔍 Testing CEO query...")
     
     try:
-        with neo4j_conn.get_session() as session:
-            # Test CEO query
-            query = """
-            MATCH (p:Person)
-            WHERE toLower(p.name) CONTAINS 'schneider' 
-               OR toLower(p.role) CONTAINS 'ceo'
-            RETURN p.name as name, p.role as role
-            """
-            
-            result = session.run(query)
-            records = list(result)
-            
-            print(f"Found {len(records)} CEO records:")
-            for record in records:
-                print(f"  • {record['name']}: {record.get('role', 'N/A')}")
-            
-            if records:
-                return f"**{records[0]['name']}** is the CEO of Nestlé globally."
-            else:
-                return "CEO information not found in database."
+        record = graph_backend.get_ceo()
+        
+        if record:
+            print(f"  • {record['name']}: {record.get('role') or 'N/A'}")
+            return f"**{record['name']}** is the CEO of Nestlé globally."
+        else:
+            return "CEO information not found in database."
                 
     except Exception as e:
         return f"Error: {e}"
@@ -36,22 +23,15 @@ def test_product_query():
     print("\n🔍 Testing product query...")
     
     try:
-        with neo4j_conn.get_session() as session:
-            query = """
-            MATCH (p:Product {name: 'KitKat'})
-            RETURN p.name as name, p.description as description, p.tagline as tagline
-            """
-            
-            result = session.run(query)
-            record = result.single()
-            
-            if record:
-                print(f"  • Product: {record['name']}")
-                print(f"  • Description: {record.get('description', 'N/A')}")
-                print(f"  • Tagline: {record.get('tagline', 'N/A')}")
-                return f"**{record['name']}** - {record.get('tagline', 'Chocolate wafer bar')}"
-            else:
-                return "KitKat product not found in database."
+        product = graph_backend.get_product('KitKat')
+        
+        if product:
+            print(f"  • Product: {product['name']}")
+            print(f"  • Description: {product.get('description', 'N/A')}")
+            print(f"  • Tagline: {product.get('tagline', 'N/A')}")
+            return f"**{product['name']}** - {product.get('tagline', 'Chocolate wafer bar')}"
+        else:
+            return "KitKat product not found in database."
                 
     except Exception as e:
         return f"Error: {e}"
@@ -61,35 +41,49 @@ def test_store_query():
     print("\n🔍 Testing store query...")
     
     try:
-        with neo4j_conn.get_session() as session:
-            query = """
-            MATCH (s:Store)
-            RETURN s.name as name, s.type as type, s.locations as locations
-            LIMIT 5
-            """
-            
-            result = session.run(query)
-            records = list(result)
-            
-            print(f"Found {len(records)} stores:")
-            for record in records:
-                print(f"  • {record['name']}: {record.get('type', 'Store')} - {record.get('locations', 'Various locations')}")
-            
-            if records:
-                stores = [f"**{r['name']}** - {r.get('locations', 'Various locations')}" for r in records]
-                return f"Available at: {', '.join(stores[:3])}"
-            else:
-                return "Store information not found in database."
+        records = graph_backend.get_stores('Nestlé products')[:5]
+        
+        print(f"Found {len(records)} stores:")
+        for record in records:
+            print(f"  • {record['store']}: {record.get('type') or 'Store'} - {record.get('locations') or 'Various locations'}")
+        
+        if records:
+            stores = [f"**{r['store']}** - {r.get('locations') or 'Various locations'}" for r in records]
+            return f"Available at: {', '.join(stores[:3])}"
+        else:
+            return "Store information not found in database."
+                
+    except Exception as e:
+        return f"Error: {e}"
+
+def test_context_query():
+    """Test entity lookup, neighbours and keyword search used by the context retriever"""
+    print("\n🔍 Testing context lookups...")
+    
+    try:
+        record = graph_backend.find_node('KitKat')
+        if not record:
+            return "KitKat node not found in database."
+        
+        neighbours = graph_backend.neighbours('KitKat')
+        print(f"  • KitKat ({record[1][0] if record[1] else 'Unknown'}) has {len(neighbours)} neighbours")
+        for rel_type, _, target, _ in neighbours[:3]:
+            print(f"    - {rel_type} {target.get('name', 'Unknown')}")
+        
+        matches = graph_backend.text_search(['chocolate'])
+        print(f"  • Keyword 'chocolate' matched {len(matches)} nodes"
+              + (f" (best: {matches[0][0].get('name')}, score {matches[0][2]:.2f})" if matches else ""))
+        return f"{len(neighbours)} neighbours, {len(matches)} keyword matches"
                 
     except Exception as e:
         return f"Error: {e}"
 
 if __name__ == "__main__":
-    print("🧪 Testing Neo4j Queries Directly")
+    print(f"🧪 Testing {graph_backend.name} Queries Directly")
     print("="*50)
     
-    if neo4j_conn.connect():
-        print("✅ Neo4j connection successful")
+    if graph_backend.connect():
+        print(f"✅ {graph_backend.name} connection successful")
         
         # Test CEO query
         ceo_result = test_ceo_query()
@@ -103,8 +97,12 @@ if __name__ == "__main__":
         store_result = test_store_query()
         print(f"Store Query Result: {store_result}")
         
+        # Test context lookups
+        context_result = test_context_query()
+        print(f"Context Query Result: {context_result}")
+        
         print("\n✅ All tests completed!")
         print("\nIf these work, your chatbot should work perfectly!")
         
     else:
-        print("❌ Neo4j connection failed")
\ No newline at end of file
+        print(f"❌ {graph_backend.name} connection failed")
\ No newline at end of file
@@ -21,6 +21,7 @@ python -c "
 from backend.neo4j_connection import neo4j_conn
 if neo4j_conn.connect():
     print('✅ Neo4j connection successful')
+    neo4j_conn.close()
 else:
     print('❌ Neo4j connection failed')
     exit(1)
@@ -46,18 +47,17 @@ else:
 echo "📊 Checking Neo4j data initialization..."
 python -c "
 from backend.neo4j_connection import neo4j_conn
+from backend.cypher_registry import cypher_registry
 from backend.neo4j_data_initializer import data_initializer
 
 try:
-    with neo4j_conn.get_session() as session:
-        result = session.run('MATCH (n) RETURN count(n) as count')
-        count = result.single()['count']
-        
-        if count == 0:
-            print('📊 No data found, initializing...')
-            data_initializer.initialize_data()
-        else:
-            print(f'✅ Found {count} nodes in Neo4j')
+    count = neo4j_conn.read(cypher_registry['count_nodes'])[0]['count']
+    
+    if count == 0:
+        print('📊 No data found, initializing...')
+        data_initializer.initialize_data()
+    else:
+        print(f'✅ Found {count} nodes in Neo4j')
 except Exception as e:
     print(f'❌ Data initialization error: {e}')
 "
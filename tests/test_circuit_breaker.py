@@ -0,0 +1,154 @@
+# tests/test_circuit_breaker.py - State transitions of the circuit breaker (no database needed)
+
+import pytest
+from neo4j.exceptions import ClientError, Neo4jError
+
+from backend.circuit_breaker import CircuitBreaker
+
+def make_breaker(**overrides):
+    settings = {'failure_threshold': 3, 'slow_ms': 100, 'reset_seconds': 30}
+    settings.update(overrides)
+    return CircuitBreaker('test', **settings)
+
+def expire(breaker):
+    """Pretend reset_seconds have passed since the breaker opened"""
+    breaker._opened_at -= breaker.reset_seconds
+
+def test_stays_closed_below_threshold():
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_success_resets_consecutive_failures():
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.01)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_opens_after_threshold_and_rejects():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.is_open
+    assert not breaker.allow()
+    assert breaker.stats()['trips'] == 1
+    assert breaker.stats()['rejected'] == 1
+
+def test_half_open_lets_one_probe_through():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    expire(breaker)
+    assert not breaker.is_open
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # The probe is in flight, so everyone else is still refused
+    assert breaker.is_open
+    assert not breaker.allow()
+
+def test_successful_probe_closes():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert breaker.stats()['consecutive_failures'] == 0
+
+def test_failed_probe_reopens():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    # Reopening from half-open is the same outage, not a new trip
+    assert breaker.stats()['trips'] == 1
+
+def test_slow_timed_calls_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_success(0.2)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_slow_probe_reopens():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_success(0.2)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_untimed_calls_never_count_as_slow():
+    breaker = make_breaker()
+    for _ in range(10):
+        breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['consecutive_failures'] == 0
+
+def test_slow_rule_can_be_disabled():
+    breaker = make_breaker(slow_ms=0)
+    for _ in range(10):
+        breaker.record_success(60.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+class FailingSession:
+    """Session whose transactions all end with the given error"""
+
+    def __init__(self, error):
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute_read(self, work, *args, **kwargs):
+        raise self.error
+
+@pytest.fixture
+def guarded(monkeypatch):
+    """neo4j_conn with a fresh breaker, returning a function that runs one failing read"""
+    from backend import neo4j_connection
+
+    breaker = make_breaker()
+    monkeypatch.setattr(neo4j_connection, 'neo4j_breaker', breaker)
+
+    def run(code):
+        error = Neo4jError.hydrate(code=code, message='test')
+        monkeypatch.setattr(neo4j_connection.neo4j_conn, 'get_session', lambda: FailingSession(error))
+        with pytest.raises(ClientError):
+            neo4j_connection.neo4j_conn.execute_read(lambda tx: [])
+
+    return breaker, run
+
+@pytest.mark.parametrize('code', [
+    'Neo.ClientError.Transaction.TransactionTimedOut',
+    'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration',
+    'Neo.TransientError.Transaction.Terminated'
+])
+def test_server_timeouts_open_breaker(guarded, code):
+    breaker, run = guarded
+    for _ in range(3):
+        run(code)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_statement_errors_leave_breaker_closed(guarded):
+    breaker, run = guarded
+    breaker.record_failure()
+    for _ in range(5):
+        run('Neo.ClientError.Statement.SyntaxError')
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['consecutive_failures'] == 0
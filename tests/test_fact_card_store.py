@@ -0,0 +1,60 @@
+# tests/test_fact_card_store.py - Fact card staleness bookkeeping stays bounded (no database needed)
+
+import pytest
+
+from backend import fact_card_store as fact_card_module
+from backend.fact_card_store import FactCardStore, MISSING_CARDS_SIZE
+from backend.graph_change_tracker import GraphChangeTracker
+
+def card(name):
+    return {'name': name, 'relationships': []}
+
+@pytest.fixture
+def store(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    # Writes to the real graph are out of scope here
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(fact_card_module, 'graph_changes', tracker)
+
+    store = FactCardStore()
+    store.loads = []
+    known = {'kitkat': card('KitKat'), 'smarties': card('Smarties')}
+
+    def load_cards(keys):
+        store.loads.append(keys)
+        return dict(known) if keys is None else {key: known[key] for key in keys if key in known}
+
+    monkeypatch.setattr(store, '_load_cards', load_cards)
+    assert store.build_all()
+    store.tracker = tracker
+    return store
+
+def test_unknown_scope_write_refreshes_each_card_once(store):
+    store.tracker.record_change()
+
+    assert store.get(' KitKat ')['name'] == 'KitKat'
+    assert store.get('kitkat')['name'] == 'KitKat'
+    assert store.loads[1:] == [['kitkat']]
+
+def test_missing_names_are_remembered_but_bounded(store):
+    store.tracker.record_change()
+
+    for i in range(MISSING_CARDS_SIZE + 100):
+        assert store.get(f"unknown {i}") is None
+    assert store.get('unknown 500') is None
+
+    # One read per name, none repeated for a remembered miss
+    assert len(store.loads) == 1 + MISSING_CARDS_SIZE + 100
+    assert len(store._missing) == MISSING_CARDS_SIZE
+    assert store._loaded_at == {}
+
+def test_deleted_entity_drops_its_bookkeeping(store):
+    store.tracker.record_change()
+    store.get('KitKat')
+    assert 'kitkat' in store._loaded_at
+
+    store._load_cards = lambda keys: {}
+    store.tracker.record_change(names=['KitKat'])
+    assert store.get('KitKat') is None
+    assert 'kitkat' not in store._loaded_at
+    assert 'kitkat' in store._missing
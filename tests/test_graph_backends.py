@@ -0,0 +1,104 @@
+# tests/test_graph_backends.py - Both graph backends agree on name lookups and relationship paths
+#
+# The SQLite case runs on a small fixture graph; the Neo4j case runs against the configured
+# database (read-only) and is skipped when NEO4J_URI is not set.
+
+import os
+
+import pytest
+
+from backend.graph_backend import Neo4jGraphBackend
+from backend.sqlite_graph_backend import SQLiteGraphBackend
+
+# KitKat and Smarties share a brand, a keyword and a document; only the brand is a real link
+NODES = [
+    ('n1', ['Product'], {'name': 'KitKat', 'tagline': 'Have a break'}),
+    ('n2', ['Product'], {'name': 'Smarties'}),
+    ('n3', ['Brand'], {'name': 'Nestlé'}),
+    ('n4', ['Keyword'], {'name': 'chocolate', 'text': 'chocolate'}),
+    ('n5', ['Document'], {'name': 'Our chocolate bars', 'url': 'https://example.com/bars'}),
+    ('n6', ['Ingredient'], {'name': 'Cocoa'}),
+]
+RELATIONSHIPS = [
+    ('n1', 'n3', 'PRODUCED_BY', {}),
+    ('n2', 'n3', 'PRODUCED_BY', {}),
+    ('n1', 'n4', 'HAS_KEYWORD', {}),
+    ('n2', 'n4', 'HAS_KEYWORD', {}),
+    ('n5', 'n1', 'MENTIONS', {}),
+    ('n5', 'n2', 'MENTIONS', {}),
+    ('n1', 'n6', 'CONTAINS', {}),
+]
+
+# Relationships that only ever lead into PATH_EXCLUDED_LABELS hubs
+HUB_RELATIONSHIPS = {'HAS_KEYWORD', 'MENTIONS'}
+
+@pytest.fixture(params=['sqlite', 'neo4j'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        backend = SQLiteGraphBackend(str(tmp_path / 'graph.sqlite3'))
+        assert backend.connect()
+        backend.replace_graph(NODES, RELATIONSHIPS)
+        yield backend
+        backend.close()
+        return
+
+    if not os.getenv('NEO4J_URI'):
+        pytest.skip('NEO4J_URI not set')
+    backend = Neo4jGraphBackend()
+    if not backend.connect():
+        pytest.skip('Neo4j database unreachable')
+    if backend.find_node('KitKat') is None or backend.find_node('Smarties') is None:
+        pytest.skip('Neo4j graph has no KitKat and Smarties nodes')
+    yield backend
+
+@pytest.mark.parametrize('name', ['KitKat', 'kitkat', ' KitKat ', 'KITKAT\t'])
+def test_find_node_normalises_names(backend, name):
+    record = backend.find_node(name)
+    assert record is not None
+    node, labels = record
+    assert node['name'] == 'KitKat'
+    assert 'Product' in labels
+
+def test_neighbours_normalise_names(backend):
+    assert len(backend.neighbours(' kitkat ')) == len(backend.neighbours('KitKat')) > 0
+
+def test_relationship_paths_avoid_hubs(backend):
+    paths = backend.relationship_paths(' KitKat ', 'smarties', max_depth=3, limit=10)
+    assert paths
+    for path in paths:
+        assert path['length'] == len(path['relationships']) <= 3
+        assert not HUB_RELATIONSHIPS & set(path['relationships'])
+    # allShortestPaths: every path has the shortest length
+    assert len({path['length'] for path in paths}) == 1
+
+def test_relationship_paths_to_self_are_empty(backend):
+    assert backend.relationship_paths('KitKat', ' kitkat ') == []
+
+def test_sqlite_fixture_paths():
+    backend = SQLiteGraphBackend(':memory:')
+    assert backend.connect()
+    backend.replace_graph(NODES, RELATIONSHIPS)
+
+    assert backend.relationship_paths('KitKat', 'Smarties') == [
+        {'start': 'KitKat', 'end': 'Smarties', 'length': 2, 'relationships': ['PRODUCED_BY', 'PRODUCED_BY']}
+    ]
+    # A hub is never a path endpoint either
+    assert backend.relationship_paths('KitKat', 'chocolate') == []
+    assert backend.relationship_paths('Cocoa', 'Smarties', max_depth=2) == []
+
+def test_sqlite_paths_are_shortest_and_never_revisit_nodes():
+    backend = SQLiteGraphBackend(':memory:')
+    assert backend.connect()
+    backend.replace_graph(
+        [('a', ['Product'], {'name': 'A'}), ('b', ['Product'], {'name': 'B'}),
+         ('c', ['Product'], {'name': 'C'}), ('d', ['Product'], {'name': 'D'})],
+        [('a', 'b', 'RELATED_TO', {}), ('b', 'a', 'SUPPORTS', {}), ('a', 'c', 'USES', {}),
+         ('a', 'd', 'CONTAINS', {}), ('d', 'c', 'CONTAINS', {})]
+    )
+
+    # Neither A-B-A-C (A twice) nor the longer A-D-C
+    assert [path['relationships'] for path in backend.relationship_paths('A', 'C', limit=10)] == [['USES']]
+    # Both parallel relationships give a shortest path
+    assert sorted(path['relationships'] for path in backend.relationship_paths('B', 'C', limit=10)) == [
+        ['RELATED_TO', 'USES'], ['SUPPORTS', 'USES']
+    ]
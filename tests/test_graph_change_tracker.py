@@ -0,0 +1,79 @@
+# tests/test_graph_change_tracker.py - Sharing graph versions between processes (no database needed)
+
+import pytest
+
+from backend import graph_change_tracker as tracker_module
+from backend.graph_change_tracker import GraphChangeTracker
+
+class SharedCounter:
+    """Stands in for the :GraphVersion node every process reads and bumps"""
+
+    def __init__(self):
+        self.version = 0
+
+    def read(self, query, params=None, count_slow=False):
+        return [{'version': self.version}] if self.version else []
+
+    def write(self, query, params=None):
+        self.version += 1
+        return [{'version': self.version}]
+
+@pytest.fixture
+def counter(monkeypatch):
+    counter = SharedCounter()
+    monkeypatch.setattr(tracker_module, 'neo4j_conn', counter)
+    return counter
+
+def make_tracker():
+    tracker = GraphChangeTracker(poll_seconds=60)
+    tracker.events = []
+    tracker.subscribe(tracker.events.append)
+    return tracker
+
+def test_own_writes_are_not_replayed(counter):
+    worker = make_tracker()
+    worker.sync()
+    worker.record_change(names=['KitKat'])
+    worker.sync()
+    assert [event['names'] for event in worker.events] == [{'KitKat'}]
+    assert worker.remote_changes == 0
+
+def test_other_workers_writes_arrive_as_unknown_scope(counter):
+    worker_a, worker_b = make_tracker(), make_tracker()
+    worker_a.sync()
+    worker_b.sync()
+
+    worker_a.record_change(names=['KitKat'])
+    assert worker_b.events == []
+
+    worker_b.sync()
+    assert worker_b.remote_changes == 1
+    assert worker_b.events[-1]['names'] is None
+    assert worker_b.events[-1]['labels'] is None
+
+def test_interleaved_bump_counts_as_remote(counter):
+    worker_a, worker_b = make_tracker(), make_tracker()
+    worker_a.sync()
+    worker_b.sync()
+
+    worker_b.record_change(names=['Aero'])
+    # A's bump skips B's, so A also learns about B's write
+    worker_a.record_change(names=['KitKat'])
+    assert worker_a.remote_changes == 1
+    assert [event['names'] for event in worker_a.events] == [{'KitKat'}, None]
+
+def test_synced_only_while_polls_succeed(counter, monkeypatch):
+    worker = make_tracker()
+    assert worker.is_synced
+
+    worker._watching = True
+    assert not worker.is_synced
+    assert worker.sync()
+    assert worker.is_synced
+
+    def unreachable(*args, **kwargs):
+        raise ConnectionError('down')
+    monkeypatch.setattr(counter, 'read', unreachable)
+    assert not worker.sync()
+    worker._synced_at -= 2 * worker.poll_seconds
+    assert not worker.is_synced
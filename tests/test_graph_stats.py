@@ -0,0 +1,51 @@
+# tests/test_graph_stats.py - Cached graph counts and ETags, including other workers' writes
+
+import pytest
+
+from backend import graph_stats as graph_stats_module
+from backend.graph_change_tracker import GraphChangeTracker
+from backend.graph_stats import GraphStats
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(graph_stats_module, 'graph_changes', tracker)
+    tracker._advance(1, own=False)
+    return tracker
+
+class CountStore:
+    """Stands in for Neo4j's count store behind the label/relationship count queries"""
+
+    def __init__(self):
+        self.nodes = {'Product': 6, 'Store': 4}
+        self.relationships = {'AVAILABLE_AT': 4}
+        self.reads = 0
+
+    def read(self, query, params=None, count_slow=False):
+        self.reads += 1
+        rows = [{'label': label, 'count': count} for label, count in self.nodes.items()]
+        rows += [{'relationship_type': rel_type, 'count': count} for rel_type, count in self.relationships.items()]
+        return [row for row in rows if all(row.get(field) is None or row[field] in query
+                                           for field in ('label', 'relationship_type'))]
+
+@pytest.fixture
+def count_store(monkeypatch):
+    count_store = CountStore()
+    monkeypatch.setattr(graph_stats_module, 'neo4j_conn', count_store)
+    return count_store
+
+def test_graph_stats_follow_another_workers_write(tracker, count_store):
+    stats = GraphStats()
+    assert stats.get()['nodes'] == {'Product': 6, 'Store': 4}
+    etag = stats.etag
+
+    # Unchanged graph: no reads, same ETag for pollers
+    reads = count_store.reads
+    stats.get()
+    assert count_store.reads == reads and stats.etag == etag
+
+    count_store.nodes['Product'] = 7
+    tracker._advance(2, own=False)
+    assert stats.get()['nodes']['Product'] == 7
+    assert stats.etag != etag
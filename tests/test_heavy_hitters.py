@@ -0,0 +1,75 @@
+# tests/test_heavy_hitters.py - Count-min sketch estimates and answer cache admission (no database needed)
+
+import random
+from collections import Counter
+
+import pytest
+
+from backend import answer_cache as answer_cache_module
+from backend.answer_cache import AnswerCache
+from backend.graph_change_tracker import GraphChangeTracker
+from backend.heavy_hitters import HeavyHitters, normalize_question
+
+@pytest.fixture
+def stream():
+    rng = random.Random(7)
+    # Skewed traffic over far more keys than the sketch has columns, so buckets collide
+    return [f"question {int(rng.paretovariate(1.2))}" for _ in range(20000)] + \
+           [f"rare {i}" for i in range(3000)]
+
+def test_estimates_never_undercount(stream):
+    sketch = HeavyHitters(width=256, depth=4, batch_size=500)
+    for key in stream:
+        sketch.record(key)
+    for key, count in Counter(stream).items():
+        assert sketch.estimate(key) >= count
+
+def test_top_keys_are_the_heaviest(stream):
+    sketch = HeavyHitters(width=4096, depth=4, top_k=5, batch_size=500)
+    for key in stream:
+        sketch.record(key)
+    expected = [key for key, _ in Counter(stream).most_common(3)]
+    assert [entry['key'] for entry in sketch.top(3)] == expected
+
+def test_counts_halve_every_half_life():
+    sketch = HeavyHitters(width=1024, half_life=3600)
+    for _ in range(100):
+        sketch.record('kitkat')
+    assert sketch.estimate('kitkat') == pytest.approx(100)
+
+    # One half-life has passed by the next flush
+    sketch._last_decay -= sketch.half_life
+    sketch.flush()
+    assert sketch.estimate('kitkat') == pytest.approx(50, rel=0.01)
+    assert sketch.top(1)[0]['count'] == pytest.approx(50, rel=0.01)
+    assert sketch.stats()['total'] == pytest.approx(50, rel=0.01)
+
+def test_normalize_question():
+    assert normalize_question('  What is   KitKat?? ') == 'what is kitkat'
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(answer_cache_module, 'graph_changes', tracker)
+    return tracker
+
+def test_admission_keeps_hot_answers(tracker):
+    hitters = HeavyHitters(width=1024)
+    cache = AnswerCache(capacity=1, tracker=hitters)
+    for _ in range(10):
+        hitters.record('hot')
+    assert cache.put('hot', {'answer': 'hot'})
+    hitters.record('cold')
+    assert not cache.put('cold', {'answer': 'cold'})
+    assert cache.get('hot') == {'answer': 'hot'}
+
+def test_other_workers_writes_invalidate_answers(tracker):
+    cache = AnswerCache(capacity=8, tracker=HeavyHitters(width=1024))
+    tracker._advance(1, own=False)
+    cache.put('what is kitkat', {'answer': 'a wafer bar'})
+    assert cache.get('what is kitkat') is not None
+
+    # The shared counter moved without a write from this process
+    tracker._advance(2, own=False)
+    assert cache.get('what is kitkat') is None
@@ -0,0 +1,44 @@
+# tests/test_ingestion_pipeline.py - Crawl politeness and exported stats (no network or database needed)
+
+import asyncio
+import time
+
+from backend.ingestion_pipeline import HostLimiter, IngestionPipeline, read_stats
+
+def test_host_limiter_caps_concurrency_and_spaces_starts():
+    limiter = HostLimiter(concurrency=2, delay=0.02)
+    starts = {'a.test': [], 'b.test': []}
+    active = {'a.test': 0, 'b.test': 0}
+    peak = {'a.test': 0, 'b.test': 0}
+
+    async def fetch(host):
+        async with limiter.slot(host):
+            starts[host].append(time.monotonic())
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.05)
+            active[host] -= 1
+
+    async def crawl():
+        await asyncio.gather(*(fetch(host) for host in ['a.test', 'b.test'] * 5))
+
+    asyncio.run(crawl())
+
+    for host in starts:
+        assert peak[host] == 2
+        gaps = [later - earlier for earlier, later in zip(starts[host], starts[host][1:])]
+        # Allow for timer resolution
+        assert min(gaps) >= 0.015
+
+def test_stats_round_trip_with_recent_errors(tmp_path):
+    pipeline = IngestionPipeline(start_urls=['https://www.madewithnestle.ca'])
+    pipeline._record_error('fetch', 'https://www.madewithnestle.ca/missing', RuntimeError('404 Client Error'))
+
+    path = str(tmp_path / 'data' / 'ingestion_stats.json')
+    assert read_stats(path) is None
+    pipeline.write_stats(path)
+
+    stats = read_stats(path)
+    assert stats['start_urls'] == ['https://www.madewithnestle.ca']
+    assert stats['recent_errors'][0]['stage'] == 'fetch'
+    assert stats['recent_errors'][0]['error'] == '404 Client Error'
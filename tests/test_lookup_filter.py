@@ -0,0 +1,57 @@
+# tests/test_lookup_filter.py - Bloom filter guarantees and when the lookup filter is trusted
+
+import pytest
+
+from backend import lookup_filter as lookup_filter_module
+from backend.lookup_filter import BloomFilter, GraphLookupFilter
+from backend.graph_change_tracker import GraphChangeTracker
+
+NAMES = [f"product {i}" for i in range(5000)]
+
+def test_no_false_negatives():
+    bloom = BloomFilter(NAMES, error_rate=0.01)
+    assert all(name in bloom for name in NAMES)
+
+@pytest.mark.parametrize('error_rate', [0.01, 0.05])
+def test_false_positive_rate_within_bounds(error_rate):
+    bloom = BloomFilter(NAMES, error_rate=error_rate)
+    probes = [f"unknown {i}" for i in range(20000)]
+    false_positives = sum(probe in bloom for probe in probes)
+    # Twice the target leaves room for sampling noise
+    assert false_positives / len(probes) <= error_rate * 2
+
+def test_empty_filter_rejects_everything():
+    bloom = BloomFilter([], error_rate=0.01)
+    assert 'kitkat' not in bloom
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    # Writes to the real graph are out of scope here
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(lookup_filter_module, 'graph_changes', tracker)
+    return tracker
+
+@pytest.fixture
+def names_filter(monkeypatch, tracker):
+    monkeypatch.setattr(lookup_filter_module.graph_backend, 'node_names', lambda: ['KitKat', 'Smarties'])
+    names_filter = GraphLookupFilter()
+    assert names_filter.build()
+    return names_filter
+
+def test_skips_only_absent_names(names_filter):
+    assert names_filter.might_have_name('KitKat')
+    assert names_filter.might_have_name('  kitkat ')
+    assert not names_filter.might_have_name('Definitely Not A Product')
+
+def test_local_write_distrusts_filter(names_filter, tracker):
+    # Pretend a rebuild is already running, so none starts behind the assertions
+    names_filter._rebuilding = True
+    tracker.record_change(names=['Aero'])
+    assert not names_filter.is_current
+    assert names_filter.might_have_name('Aero')
+
+def test_unsynced_shared_version_distrusts_filter(names_filter, tracker):
+    tracker._watching = True
+    assert not names_filter.is_current
+    assert names_filter.might_have_name('Definitely Not A Product')
@@ -0,0 +1,129 @@
+# tests/test_path_finder.py - Path searches only use the CSR snapshot while it is current
+
+import pytest
+
+from backend import csr_graph_engine as csr_module
+from backend import path_finder as path_finder_module
+from backend.csr_graph_engine import CSRGraphEngine
+from backend.path_finder import PathFinder, MAX_PATH_EXPANSIONS
+from backend.graph_change_tracker import GraphChangeTracker
+from backend.cypher_registry import PATH_EXCLUDED_LABELS
+from backend.sqlite_graph_backend import SQLiteGraphBackend
+
+NODES = [
+    {'id': 'n1', 'name': 'KitKat', 'labels': ['Product']},
+    {'id': 'n2', 'name': 'Nestlé', 'labels': ['Brand']},
+    {'id': 'n3', 'name': 'Smarties', 'labels': ['Product']},
+    {'id': 'n4', 'name': 'chocolate', 'labels': ['Keyword']},
+]
+EDGES = [
+    {'source': 'n1', 'target': 'n2', 'type': 'MADE_BY'},
+    {'source': 'n3', 'target': 'n2', 'type': 'MADE_BY'},
+    {'source': 'n1', 'target': 'n4', 'type': 'HAS_KEYWORD'},
+    {'source': 'n3', 'target': 'n4', 'type': 'HAS_KEYWORD'},
+]
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    # Writes to the real graph are out of scope here
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(csr_module, 'graph_changes', tracker)
+    monkeypatch.setattr(path_finder_module, 'graph_changes', tracker)
+    return tracker
+
+@pytest.fixture
+def engine(monkeypatch, tracker):
+    monkeypatch.setattr(csr_module.neo4j_conn, 'execute_read', lambda work: (NODES, EDGES))
+    engine = CSRGraphEngine()
+    assert engine.load_from_neo4j()
+    monkeypatch.setattr(path_finder_module, 'graph_engine', engine)
+    return engine
+
+@pytest.fixture
+def backend_calls(monkeypatch):
+    calls = []
+
+    def relationship_paths(start, end, max_depth=3, limit=3):
+        calls.append((start, end))
+        return [{'start': start, 'end': end, 'length': 1, 'relationships': ['SIMILAR_TO']}]
+
+    monkeypatch.setattr(path_finder_module.graph_backend, 'relationship_paths', relationship_paths)
+    return calls
+
+def test_current_snapshot_serves_paths_around_excluded_hubs(engine, backend_calls):
+    paths = PathFinder().find_paths(' kitkat ', 'Smarties')
+
+    assert [path['relationships'] for path in paths] == [['MADE_BY', 'MADE_BY']]
+    assert backend_calls == []
+
+def test_write_sends_searches_to_backend_until_reload(engine, tracker, backend_calls):
+    finder = PathFinder()
+    finder.find_paths('KitKat', 'Smarties')
+
+    # Keep the background reload out of the test; it is triggered explicitly below
+    engine._reloading = True
+    tracker.record_change(labels={'Product'}, names={'After Eight'})
+    assert not engine.is_current
+
+    paths = finder.find_paths('KitKat', 'Smarties')
+    assert paths[0]['relationships'] == ['SIMILAR_TO']
+    assert backend_calls == [('KitKat', 'Smarties')]
+
+    assert engine.load_from_neo4j()
+    assert engine.is_current
+    finder.find_paths('KitKat', 'Smarties', max_depth=2)
+    assert len(backend_calls) == 1
+
+def test_synthetic_build_is_never_current(tracker):
+    engine = CSRGraphEngine()
+    engine.build(['a', 'b'], ['Product', 'Product'], [0], [1], [0], ['SIMILAR_TO'])
+
+    assert engine.is_loaded
+    assert not engine.is_current
+
+# Several shortest routes, a longer detour, parallel relationships, a cycle and two hubs
+PARITY_NODES = [
+    ('p1', ['Product'], {'name': 'KitKat'}),
+    ('p2', ['Product'], {'name': 'Smarties'}),
+    ('p3', ['Product'], {'name': 'Aero'}),
+    ('b1', ['Brand'], {'name': 'Nestlé'}),
+    ('c1', ['Category'], {'name': 'Chocolate bars'}),
+    ('i1', ['Ingredient'], {'name': 'Cocoa'}),
+    ('i2', ['Ingredient'], {'name': 'Sugar'}),
+    ('t1', ['Topic'], {'name': 'Cocoa Plan'}),
+    ('k1', ['Keyword'], {'name': 'chocolate'}),
+    ('d1', ['Document'], {'name': 'Our bars'}),
+]
+PARITY_RELATIONSHIPS = [
+    ('p1', 'b1', 'PRODUCED_BY'), ('p2', 'b1', 'PRODUCED_BY'), ('p3', 'b1', 'PRODUCED_BY'),
+    ('p1', 'c1', 'BELONGS_TO'), ('p2', 'c1', 'BELONGS_TO'),
+    ('p1', 'i1', 'CONTAINS'), ('p3', 'i1', 'CONTAINS'), ('p1', 'i2', 'CONTAINS'), ('p2', 'i2', 'CONTAINS'),
+    ('i1', 't1', 'RELATED_TO'), ('b1', 't1', 'COMMITTED_TO'), ('b1', 't1', 'SUPPORTS'),
+    ('p1', 'k1', 'HAS_KEYWORD'), ('p3', 'k1', 'HAS_KEYWORD'), ('t1', 'k1', 'HAS_KEYWORD'),
+    ('d1', 'p2', 'MENTIONS'), ('d1', 't1', 'MENTIONS'),
+]
+
+def test_csr_engine_matches_sqlite_backend(monkeypatch, tracker):
+    backend = SQLiteGraphBackend(':memory:')
+    assert backend.connect()
+    backend.replace_graph(PARITY_NODES, [(s, t, rel_type, {}) for s, t, rel_type in PARITY_RELATIONSHIPS])
+
+    nodes = [{'id': node_id, 'name': properties['name'], 'labels': labels} for node_id, labels, properties in PARITY_NODES]
+    edges = [{'source': s, 'target': t, 'type': rel_type} for s, t, rel_type in PARITY_RELATIONSHIPS]
+    monkeypatch.setattr(csr_module.neo4j_conn, 'execute_read', lambda work: (nodes, edges))
+    engine = CSRGraphEngine()
+    assert engine.load_from_neo4j()
+
+    names = [properties['name'] for _, _, properties in PARITY_NODES]
+    compared = 0
+    for start in names:
+        for end in names:
+            for depth in (1, 2, 3, 4):
+                expected = backend.relationship_paths(start, end, max_depth=depth, limit=50)
+                actual = engine.find_paths(start, end, max_depth=depth, limit=50, blocked_labels=PATH_EXCLUDED_LABELS,
+                                           max_expansions=MAX_PATH_EXPANSIONS)
+                assert sorted(path['relationships'] for path in actual) == \
+                    sorted(path['relationships'] for path in expected), (start, end, depth)
+                compared += bool(expected)
+    assert compared > 40
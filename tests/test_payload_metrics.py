@@ -0,0 +1,53 @@
+# tests/test_payload_metrics.py - Request payload accounting, including hedged reads (no database needed)
+
+import threading
+import time
+
+import pytest
+
+from backend import query_latency as query_latency_module
+from backend.neo4j_connection import Neo4jConnection
+from backend.result_cache import estimate_size
+
+RECORDS = [{'name': 'KitKat', 'description': 'Chocolate wafer bar ' * 20}]
+
+@pytest.fixture
+def conn(monkeypatch):
+    conn = Neo4jConnection()
+    # Every hedge is allowed, and nothing is left reserved afterwards
+    monkeypatch.setattr(query_latency_module.query_latency, 'try_hedge', lambda: True)
+    monkeypatch.setattr(query_latency_module.query_latency, 'release_hedge', lambda won: None)
+    return conn
+
+def test_hedged_read_counts_only_the_returned_result(conn):
+    both_done = threading.Barrier(2)
+
+    def execute(work, query, params):
+        # Direct results count through _count_payload, as they do in _guarded
+        conn._count_payload(RECORDS)
+        # The primary outlasts the delay, so the hedge starts; then both complete
+        if threading.current_thread().name.endswith('_0'):
+            time.sleep(0.05)
+        both_done.wait(timeout=1)
+        return RECORDS
+
+    with conn.measure_payload():
+        assert conn._hedged_read('q', execute, None, 'RETURN 1', {}, delay=0.01) == RECORDS
+
+    assert conn.payload_metrics()['bytes_last'] == estimate_size(RECORDS)
+
+def test_concurrent_requests_are_all_counted(conn):
+    def request():
+        for _ in range(200):
+            with conn.measure_payload():
+                conn._count_payload(RECORDS)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = conn.payload_metrics()
+    assert metrics['requests'] == 1600
+    assert metrics['bytes_total'] == 1600 * estimate_size(RECORDS)
@@ -0,0 +1,38 @@
+# tests/test_query_log.py - Workers sharing one query log keep every question across rotation
+
+import json
+
+from backend.query_log import QueryLog
+
+def read_questions(path):
+    questions = []
+    for name in (path + '.1', path):
+        with open(name, encoding='utf-8') as f:
+            questions += [json.loads(line)['q'] for line in f]
+    return questions
+
+def test_writers_follow_rotation_by_another_writer(tmp_path):
+    path = str(tmp_path / 'logs' / 'query_log.jsonl')
+    first = QueryLog(path, max_bytes=400)
+    second = QueryLog(path, max_bytes=400)
+
+    # Both handles open the same file; first rotates it partway through
+    asked = []
+    for n in range(12):
+        writer = first if n % 2 else second
+        question = f"question {n}"
+        writer.record(question)
+        asked.append(question)
+
+    # Only the last rotation survives as .1; nothing written since it may be lost
+    with open(path + '.1', encoding='utf-8') as f:
+        rotated = [json.loads(line)['q'] for line in f]
+    assert read_questions(path) == asked[asked.index(rotated[0]):]
+
+def test_top_questions_counts_both_files(tmp_path):
+    path = str(tmp_path / 'query_log.jsonl')
+    log = QueryLog(path, max_bytes=200)
+    for question in ['Who is the CEO?'] * 3 + ['KitKat ingredients'] * 2:
+        log.record(question)
+
+    assert log.top_questions(2) == ['Who is the CEO?', 'KitKat ingredients']
@@ -0,0 +1,42 @@
+# tests/test_result_cache.py - Result cache invalidation, including other workers' writes
+
+import pytest
+
+from backend import result_cache as result_cache_module
+from backend.graph_change_tracker import GraphChangeTracker
+from backend.result_cache import ResultCache
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = GraphChangeTracker(poll_seconds=60)
+    monkeypatch.setattr(tracker, '_publish', lambda: None)
+    monkeypatch.setattr(result_cache_module, 'graph_changes', tracker)
+    tracker._advance(1, own=False)
+    return tracker
+
+def cached_load(cache, loads, depends_on=('Product',)):
+    def load():
+        loads.append(1)
+        return [{'name': 'KitKat'}]
+    return cache.get_or_load('product', {'product': 'KitKat'}, depends_on, load)
+
+def test_result_cache_hits_until_a_dependency_is_written(tracker):
+    cache, loads = ResultCache(), []
+    cached_load(cache, loads)
+    cached_load(cache, loads)
+    assert len(loads) == 1
+
+    tracker.record_change(labels=['Store'], names=['Walmart'], relationship_types=[])
+    cached_load(cache, loads)
+    assert len(loads) == 1
+
+    tracker.record_change(labels=['Product'], names=['KitKat'], relationship_types=[])
+    cached_load(cache, loads)
+    assert len(loads) == 2
+
+def test_result_cache_drops_everything_on_another_workers_write(tracker):
+    cache, loads = ResultCache(), []
+    cached_load(cache, loads)
+    tracker._advance(2, own=False)
+    cached_load(cache, loads)
+    assert len(loads) == 2